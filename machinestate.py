@@ -20,6 +20,8 @@ Provided functions:
 - totitle: call string's totitle function and removes all spaces and underscores
 - masktolist: parse bitmask to list of integers
 - fopen: opens a file if it exists and is readable and returns file pointer
+- fread: reads a small file like sysfs entries and returns its stripped content
+- run_cmd: executes a command (without shell if possible) and returns its stripped output
 
 Provided classes:
 - HostInfo
@@ -99,7 +101,7 @@ import sys
 import re
 import json
 import platform
-from subprocess import check_output, DEVNULL
+from subprocess import check_output, CalledProcessError, DEVNULL, STDOUT
 from glob import glob
 from os.path import join as pjoin
 from os.path import exists as pexists
@@ -116,6 +118,14 @@ from grp import getgrgid
 import inspect
 import logging
 import uuid
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
+import ctypes
+import resource
+import stat
 
 ################################################################################
 # Configuration
@@ -139,6 +149,13 @@ VEOS_BASE = "/opt/nec/ve/bin"
 NVIDIA_PATH = "/opt/nvidia/bin"
 # The OpenCLInfo class requires this path if clinfo is not in $PATH
 CLINFO_PATH = "/usr/bin"
+# Some sensor files (coretemp, thermal zones) take milliseconds to read. If a read of
+# a throttled file takes longer than SLOW_READ_NS nanoseconds, the previous value is
+# reused for the next SLOW_READ_SKIP updates.
+SLOW_READ_NS = 5000000
+SLOW_READ_SKIP = 16
+# The PowercapInfo class reads the RAPL domains of X86 systems from this path
+POWERCAP_BASE = "/sys/devices/virtual/powercap/intel-rapl"
 
 ################################################################################
 # Version information
@@ -154,29 +171,207 @@ ENCODING = getpreferredencoding()
 
 DEFAULT_LOGLEVEL = "info"
 NEWLINE_REGEX = re.compile(r"\n")
+# Maximal number of bytes read from 'readelf -wi' by ExecutableInfo
+READELF_MAX_BYTES = 262144
+# Commonly used regexes for addf() and addc()
+INT_REGEX = re.compile(r"(\d+)")
+FLOAT_REGEX = re.compile(r"([\d\.]+)")
+LINE_REGEX = re.compile(r"(.+)")
+# Separators of the sub-strings split by tostrlist(), mapped to spaces for str.split()
+STRLIST_SEPARATORS = str.maketrans(",|", "  ")
+# Regexes of the value parsers like tointlist() and tobool()
+FLOAT_INT_REGEX = re.compile(r"(\d+)\.\d+")
+DIGITS_REGEX = re.compile(r"\d+")
+HEX_REGEX = re.compile(r"0x[0-9a-fA-F]+")
+# Strings (lower case) that tobool() accepts as True, all others are False
+TRUE_STRINGS = frozenset(("on", "true"))
+# Characters removed by totitle() after title-casing
+TITLE_DELETE_CHARS = str.maketrans("", "", "_ ")
+# Unit tokens (lower case) of tobytes() and tohertz() with their multipliers. Only the
+# leading token of the unit is used, so 'kBytes' counts as 'kb'. The 'i' selects
+# base 1000 only together with 'b'. Frequencies without unit are in kHz.
+NUMBER_CHARS = frozenset("0123456789.")
+BYTES_UNIT_REGEX = re.compile(r"[kmg]?i?b?")
+BYTES_UNITS = {"" : 1, "b" : 1, "i" : 1, "ib" : 1,
+               "k" : 1024, "kb" : 1024, "ki" : 1024, "kib" : 1000,
+               "m" : 1024**2, "mb" : 1024**2, "mi" : 1024**2, "mib" : 1000**2,
+               "g" : 1024**3, "gb" : 1024**3, "gi" : 1024**3, "gib" : 1000**3}
+HERTZ_UNITS = {"" : 1000, "hz" : 1,
+               "k" : 1000, "khz" : 1000,
+               "m" : 1000**2, "mhz" : 1000**2,
+               "g" : 1000**3, "ghz" : 1000**3}
+# Frequencies with optional unit in the lists parsed by tohertzlist()
+HERTZ_LIST_REGEX = re.compile(r"[\d\.]+\s*(?:[kKmMgG]?[Hh][Zz])?")
+# Command arguments containing one of these characters are executed in a shell
+SHELL_REGEX = re.compile(r"[|&;<>()$`\\\"'*?\[\]{}#~\n]")
+# Plain characters at the start of a regex (after '^', '\s+', '\s*' or '.*')
+LITERAL_REGEX = re.compile(r"(?:\^|\\s[+*]|\.\*)*([\w :=#-]+)(.?)")
+IPADDR_REGEX = re.compile(r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}")
+# Options of all clinfo calls. The OpenCL classes share the output of a single call,
+# so they have to use the same options
+CLINFO_OPTS = "--raw --offline"
+# OpenCL platform and ICD loader names in the output of 'clinfo --raw'
+CL_PLATFORM_REGEX = re.compile(r"CL_PLATFORM_NAME[^\S\n]+(.*)")
+CL_ICDL_REGEX = re.compile(r"CL_ICDL_NAME[^\S\n]+(.*)")
+# Turbo frequencies and error messages in the output of 'likwid-powermeter -i'
+TURBO_CORES_REGEX = re.compile(r"^C\d+\s+([\d\.]+ MHz)", re.MULTILINE)
+TURBO_ERROR_REGEX = re.compile(r"Cannot gather values|Cannot get access|"
+                               r"Query Turbo Mode only supported|^Failed|^ERROR ", re.MULTILINE)
+# Total and free memory in the FB memory section of 'nvidia-smi -q'
+NVSMI_FB_TOTAL_REGEX = re.compile(r"FB Memory Usage\s*\n\s+Total\s+:\s+(\d+\sMiB)")
+NVSMI_FB_FREE_REGEX = re.compile(r"FB Memory Usage\s*\n(?:[^\S\n]+\w+[^\S\n]+:[^\S\n]+\d+\sMiB\s*\n)*?"
+                                 r"\s+Free\s+:\s+(\d+\sMiB)")
+# Regexes of the static output parsers of the InfoGroup classes
+OBJDUMP_NEEDED_REGEX = re.compile(r"^\s+NEEDED\s+(.*)$")
+READELF_NEEDED_REGEX = re.compile(r"^\s*\S+\s+\(NEEDED\)\s+Shared library:\s+\[(.*)\]$")
+MODULES_HEADER_REGEX = re.compile(r"^Currently Loaded.+$")
+VECMD_TEMP_REGEX = re.compile(r"(.+):\s+[\d\.]+\sC$")
+# Leading number of string values compared by InfoGroup.__eq__()
+NUMBER_PREFIX_REGEX = re.compile(r"^([\d\.]+).*")
 
 ################################################################################
 # Helper functions
 ################################################################################
 
 def fopen(filename):
-    if filename is not None and pexists(filename) and os.path.isfile(filename):
-        try:
-            filefp = open(filename, "rb")
-        except PermissionError:
-            logging.debug("Not enough permissions to read file %s", filename)
-            return None
-        except Exception as e:
-            logging.error("File %s open: %s", filename, e)
-            return None
-        return filefp
-    elif filename is None:
+    '''Returns a binary file object for a regular file or None. The file is opened
+    directly and checked with fstat() on the open descriptor instead of testing its
+    existence and type by path before opening it. It is opened non-blocking, so a
+    FIFO does not block the open, and set back to blocking once it is a file.'''
+    if filename is None:
         logging.debug("Filename is None")
-    elif not pexists(filename):
+        return None
+    try:
+        fd = os.open(filename, os.O_RDONLY | os.O_NONBLOCK | getattr(os, "O_CLOEXEC", 0))
+    except FileNotFoundError:
         logging.debug("Target of filename (%s) does not exist", filename)
-    elif not os.path.isfile(filename):
-        logging.debug("Target of filename (%s) is no file", filename)
-    return None
+        return None
+    except PermissionError:
+        logging.debug("Not enough permissions to read file %s", filename)
+        return None
+    except Exception as e:
+        logging.error("File %s open: %s", filename, e)
+        return None
+    try:
+        if not stat.S_ISREG(os.fstat(fd).st_mode):
+            logging.debug("Target of filename (%s) is no file", filename)
+            os.close(fd)
+            return None
+        os.set_blocking(fd, True)
+        return os.fdopen(fd, "rb")
+    except Exception as e:
+        logging.error("File %s open: %s", filename, e)
+        os.close(fd)
+        return None
+
+def fread(filename, size=4096):
+    '''Returns the stripped content of a small file (like sysfs entries) or None. Uses a
+    plain file descriptor without the buffered file object created by fopen().'''
+    try:
+        fd = os.open(filename, os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+    except OSError as e:
+        logging.debug("File %s open: %s", filename, e)
+        return None
+    try:
+        return os.read(fd, size).decode(ENCODING).strip()
+    except OSError as e:
+        logging.error("Failed to read file %s: %s", filename, e)
+        return None
+    finally:
+        os.close(fd)
+
+@lru_cache(maxsize=None)
+def cached_glob(pattern):
+    '''Returns the sorted result of glob(pattern) as tuple. Many classes search the same
+    folders like /sys/devices/system/cpu/cpu*, so each pattern is resolved only once.
+    MachineState.generate() clears the cache.'''
+    return tuple(sorted(glob(pattern)))
+
+@lru_cache(maxsize=None)
+def cached_which(cmd):
+    '''Returns shutil.which(cmd). Many classes look up the same commands, so each command
+    is searched in $PATH only once. MachineState.generate() clears the cache.'''
+    return which(cmd)
+
+@lru_cache(maxsize=None)
+def cached_exists(path):
+    '''Returns os.path.exists(path) for paths of commands. MachineState.generate() clears
+    the cache.'''
+    return pexists(path)
+
+EXECUTOR_PREFIX = "machinestate-worker"
+
+@lru_cache(maxsize=None)
+def shared_executor():
+    '''Returns the thread pool used by all InfoGroups with parallel_update. It is created
+    at the first use. Most calls wait for sysfs reads or commands, so it uses more threads
+    than CPUs.'''
+    workers = min(32, (os.cpu_count() or 1) * 4)
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix=EXECUTOR_PREFIX)
+
+@lru_cache(maxsize=None)
+def cached_hwmon_names(folder):
+    '''Returns a dict with the indices of all hwmon entries in folder for each hwmon name.
+    The name files are read only once per folder. MachineState.generate() clears the cache.'''
+    names = {}
+    for path in cached_glob(pjoin(folder, "hwmon*/name")):
+        m = re.match(r".*/hwmon(\d+)/name$", path)
+        name = fread(path)
+        if m and name:
+            names.setdefault(name, []).append(int(m.group(1)))
+    return names
+
+def _powercap_zone(path):
+    '''Returns the name, the constraint names and the subzone folders of a powercap zone'''
+    constraints = {}
+    subzones = {}
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                m = re.match(r"constraint_(\d+)_name$", entry.name)
+                if m:
+                    constraints[int(m.group(1))] = fread(entry.path)
+                    continue
+                m = re.match(r"intel-rapl\:(?:\d+\:)?(\d+)$", entry.name)
+                if m and entry.is_dir():
+                    subzones[int(m.group(1))] = entry.path
+    except OSError:
+        pass
+    return fread(pjoin(path, "name")), dict(sorted(constraints.items())), subzones
+
+@lru_cache(maxsize=None)
+def cached_powercap_tree(folder):
+    '''Returns a dict with the name, constraint names and domains of each package in a
+    powercap folder like /sys/devices/virtual/powercap/intel-rapl. The tree is scanned
+    only once. MachineState.generate() clears the cache.'''
+    packages = {}
+    for package, ppath in sorted(_powercap_zone(folder)[2].items()):
+        pname, pconstraints, subzones = _powercap_zone(ppath)
+        domains = {}
+        for domain, dpath in sorted(subzones.items()):
+            dname, dconstraints, _ = _powercap_zone(dpath)
+            domains[domain] = {"name" : dname, "constraints" : dconstraints}
+        packages[package] = {"name" : pname, "constraints" : pconstraints, "domains" : domains}
+    return packages
+
+@lru_cache(maxsize=None)
+def path_entries(path):
+    '''Returns a set with the names of all entries in the folders of a PATH-like string.
+    MachineState.generate() clears the cache.'''
+    names = set()
+    for folder in path.split(os.pathsep):
+        try:
+            with os.scandir(folder) as entries:
+                names.update(e.name for e in entries)
+        except OSError:
+            pass
+    return frozenset(names)
+
+def find_executables(cmdlist):
+    '''Returns the commands in cmdlist which are executable. The folders in $PATH are
+    listed only once and which() is called only for the commands found there.'''
+    names = path_entries(os.environ.get("PATH", os.defpath))
+    return [c for c in cmdlist if (os.sep in c or c in names) and cached_which(c)]
 
 ################################################################################
 # Parser Functions used in multiple places. If a parser function is used only
@@ -186,6 +381,7 @@ def fopen(filename):
 
 def tostrlist(value):
     r'''Returns string split at \s and , in list of strings. Strings might not be unique in list.
+    Empty parts are dropped, so an empty string returns an empty list.
 
     :param value: string with sub-strings
 
@@ -195,7 +391,12 @@ def tostrlist(value):
     if value is not None:
         if isinstance(value, int):
             value = str(value)
-        return re.split(r"[,\s\|]+", value)
+        return value.translate(STRLIST_SEPARATORS).split()
+
+def splitlist(value):
+    r'''Returns the non-empty elements of a list string separated by commas and
+    whitespaces. Uses the string methods, which are faster than a regex split.'''
+    return value.replace(",", " ").split()
 
 def tointlist(value):
     r'''Returns string split at \s and , in list of integers. Supports lists like 0,1-4,7.
@@ -212,36 +413,42 @@ def tointlist(value):
         return [int(value)]
 
     if value and isinstance(value, str):
-        outlist = []
-        for part in [x for x in re.split(r"[,\s]", value) if x.strip()]:
-            if '-' in part:
-                start, end = part.split("-")
-                try:
-                    start = int(start)
-                    end = int(end)
-                except ValueError as exce:
-                    raise exce
-                outlist += [i for i in range(int(start), int(end)+1)]
-            else:
-                ipart = None
-                mat = re.match(r"(\d+)\.\d+", part)
-                if mat:
-                    part = mat.group(1)
-                try:
-                    ipart = int(part)
-                except ValueError as exce:
-                    raise exce
-                if ipart is not None:
-                    outlist.append(ipart)
-        return outlist
+        if "-" not in value and "." not in value:
+            # Plain lists without ranges or floats are converted directly
+            return list(map(int, splitlist(value)))
+        return list(chain.from_iterable(map(intrange, splitlist(value))))
     return None
 
+def intrange(part):
+    '''Returns the integers of a single tointlist() element like 5, 5.0 or 1-4.'''
+    if '-' in part:
+        start, end = part.split("-")
+        return range(int(start), int(end)+1)
+    mat = FLOAT_INT_REGEX.match(part)
+    return (int(mat.group(1) if mat else part),)
+
 def totitle(value):
     r'''Returns titleized split (string.title()) with _ and whitespaces removed.'''
     if value and isinstance(value, str):
-        return value.title().replace("_", "").replace(" ", "")
+        return str_totitle(value)
     return str(value)
 
+@lru_cache(maxsize=2048)
+def str_totitle(value):
+    '''String part of totitle(). The same keys recur for all CPUs and devices, so the
+    results are cached.'''
+    return value.title().translate(TITLE_DELETE_CHARS)
+
+def split_unit(value):
+    r'''Splits a value string like 1234 kB into the number and the lower-case unit.
+    Returns None if the string does not start with a number.'''
+    end = 0
+    while end < len(value) and value[end] in NUMBER_CHARS:
+        end += 1
+    if end == 0:
+        return None
+    return value[:end], value[end:].strip().lower()
+
 def tobytes(value):
     r'''Returns a size value (XXXX kB or XXXGB) to size in bytes
 
@@ -253,24 +460,21 @@ def tobytes(value):
     if value and isinstance(value, int):
         return value
     if value and isinstance(value, str):
-        mat = re.match(r"([\d\.]+)\s*([kKmMgG]{0,1})([i]{0,1})([bB]{0,1})", value)
-        if mat is not None:
-            count = int(mat.group(1))
-            mult = 1024
-            if mat.group(4).lower() == "b":
-                if mat.group(3).lower() == "i":
-                    mult = 1000
-            if mat.group(2).lower() == "k":
-                count *= mult
-            elif mat.group(2).lower() == "m":
-                count *= (mult * mult)
-            elif mat.group(2).lower() == "g":
-                count *= (mult * mult * mult)
-            return count
-        else:
-            value = None
+        return str_tobytes(value)
     return value
 
+@lru_cache(maxsize=2048)
+def str_tobytes(value):
+    '''String part of tobytes(). Sizes like 4 kB recur for many files, so the results
+    are cached.'''
+    parts = split_unit(value)
+    if parts is not None:
+        count, unit = parts
+        # Parse once, as float only if needed so large byte counts stay exact
+        number = float(count) if "." in count else int(count)
+        return int(number * BYTES_UNITS[BYTES_UNIT_REGEX.match(unit).group(0)])
+    return None
+
 def masktolist(value):
     '''Returns a integer list with the set bits in a bitmask like 0xff
 
@@ -281,60 +485,53 @@ def masktolist(value):
     '''
     outlist = None
     if value is not None:
-        bits = 0
+        imask = value
         if isinstance(value, str):
-            mask = str(value).replace(",", "")
-            bits = len(mask) * 4
-            imask = int(mask, 16)
-        elif isinstance(value, int):
-            imask = value
-            bits = 0
-            while value > 0:
-                value >>= 1
-                bits += 1
+            # Linux cpumasks are comma-separated groups of 32 bit, int() accepts '0x'
+            mask = value.strip().replace(",", "")
+            imask = int(mask, 16) if mask else 0
         outlist = []
-        for bit in range(bits):
-            if (1<<bit) & imask:
-                outlist.append(bit)
+        if imask < 0:
+            # Negative values are no bitmasks, the loop below would not terminate
+            return outlist
+        # Peel off the lowest set bit until the mask is empty
+        while imask:
+            lowest = imask & -imask
+            outlist.append(lowest.bit_length() - 1)
+            imask ^= lowest
     return outlist
 
 def tohertz(value):
     outvalue = None
     if value is not None:
-        if isinstance(value, int) or isinstance(value, float):
+        if isinstance(value, (int, float)):
             outvalue = int(value)
         elif isinstance(value, str):
-            mat = re.match(r"([\d\.]+)\s*([kKmMgG]*[Hh]*[z]*)", value)
-            if mat:
-                outvalue = float(mat.group(1))
-                if mat.group(2).lower().startswith("m"):
-                    #print("MegaHertz")
-                    outvalue *= 1000 * 1000
-                elif mat.group(2).lower().startswith("g"):
-                    #print("GigaHertz")
-                    outvalue *= 1000 * 1000 * 1000
-                elif mat.group(2).lower() == "hz":
-                    outvalue *= 1
-                else:
-                    # We assume all other frequencies are in kHz
-                    #print("KiloHertz")
-                    outvalue *= 1000
-                outvalue = int(outvalue)
+            outvalue = str_tohertz(value)
     #print("tohertz", type(value), value, outvalue)
     return outvalue
 
+@lru_cache(maxsize=2048)
+def str_tohertz(value):
+    '''String part of tohertz(). Frequencies recur for all CPUs, so the results are
+    cached.'''
+    parts = split_unit(value.rstrip())
+    if parts is not None:
+        count, unit = parts
+        # The leading token is an optional prefix (k, m, g) and an optional 'hz'
+        prefix = unit[:1] if unit[:1] in ("k", "m", "g") else ""
+        suffix = "hz" if unit.startswith("hz", len(prefix)) else ""
+        return int(float(count) * HERTZ_UNITS[prefix + suffix])
+    return None
+
 def tohertzlist(value):
-    outlist = []
+    '''Returns the frequencies in Hz of a list string like '1.2 GHz, 800000'. Text which
+    is no frequency is skipped. Returns None if the string contains no frequency.'''
     if value and isinstance(value, int):
         return [tohertz(value)]
 
     if value and isinstance(value, str):
-        try:
-            for part in [x for x in re.split(r"[,\s]", value) if x.strip()]:
-                outlist += [tohertz(part)]
-        except ValueError as exce:
-            raise exce
-        return outlist
+        return [str_tohertz(x) for x in HERTZ_LIST_REGEX.findall(value)] or None
     return None
 
 def tobool(value):
@@ -343,22 +540,15 @@ def tobool(value):
     elif isinstance(value, float):
         return value != 0.0
     elif isinstance(value, str):
-        if re.match(r"\d+", value):
+        if DIGITS_REGEX.match(value):
             return bool(int(value))
-        elif value.lower() == "on":
-            return True
-        elif value.lower() == "off":
-            return False
-        elif value.lower() == "true":
-            return True
-        elif value.lower() == "false":
-            return False
+        return value.lower() in TRUE_STRINGS
     return False
 
 
 def int_from_str(s):
     """Parse int from string, either hex with leading 0x or plain integer."""
-    if re.match(r'0x[0-9a-fA-F]+', s):
+    if HEX_REGEX.match(s):
         return int(s, base=16)
     else:
         return int(s)
@@ -367,6 +557,21 @@ def int_from_str(s):
 ################################################################################
 # Processing functions for entries in class attributes 'files' and 'commands'  #
 ################################################################################
+def regex_literal(regex):
+    '''Returns a string contained in every match of the compiled regex or None. Data without
+    this string cannot match, which is checked much faster with 'in' than with the regex.
+    Only the plain characters at the start of the regex are used.'''
+    if regex.flags & (re.IGNORECASE | re.VERBOSE) or "|" in regex.pattern:
+        return None
+    m = LITERAL_REGEX.match(regex.pattern)
+    if not m:
+        return None
+    literal = m.group(1)
+    if m.group(2) and m.group(2) in "?*+{":
+        # The last character is optional or repeated
+        literal = literal[:-1]
+    return literal if len(literal) >= 3 else None
+
 def match_data(data, regex_str):
     out = data
     regex = re.compile(regex_str)
@@ -440,6 +645,29 @@ def process_files(filedict):
                 filefp.close()
     return outdict
 
+def run_cmd(cmd, cmd_args=""):
+    '''Returns the stripped output of a command with LANG=C. Commands whose arguments
+    contain no shell syntax are executed directly instead of through a shell. A trailing
+    '2>&1' is done by the subprocess module. Failures result in the output printed so far
+    like the shell call with 'exit 0' did before.'''
+    args = cmd_args or ""
+    stderr = DEVNULL
+    if args.endswith("2>&1"):
+        args = args[:-4].rstrip()
+        stderr = STDOUT
+    if " " in cmd or SHELL_REGEX.search(args):
+        exe = "LANG=C {} {}; exit 0;".format(cmd, cmd_args or "")
+        return check_output(exe, stderr=DEVNULL, shell=True).decode(ENCODING).strip()
+    env = dict(os.environ, LANG="C")
+    try:
+        data = check_output([cmd] + args.split(), stderr=stderr, env=env)
+    except CalledProcessError as e:
+        data = e.output
+    except OSError as e:
+        logging.debug("Failed to execute %s: %s", cmd, e)
+        return ""
+    return data.decode(ENCODING).strip()
+
 def process_cmds(cmddict):
     sortdict = {}
     outdict = {}
@@ -452,11 +680,10 @@ def process_cmds(cmddict):
         outdict[key] = None
     for cmdargs in sortdict:
         cmd, cmd_opts = cmdargs
-        abscmd = which(cmd)
+        abscmd = cached_which(cmd)
         data = None
         if abscmd and len(abscmd) > 0:
-            exestr = "LANG=C {} {}; exit 0;".format(cmd, cmd_opts)
-            data = check_output(exestr, stderr=DEVNULL, shell=True).decode(ENCODING).strip()
+            data = run_cmd(cmd, cmd_opts)
         for args in sortdict[cmdargs]:
             key, cmatch, cparse = args
             tmpdata = data
@@ -474,14 +701,13 @@ def process_cmd(args):
     data = None
     cmd, *optsmatchconvert = args
     if cmd:
-        abspath = which(cmd)
+        abspath = cached_which(cmd)
         #which_cmd = "which {}; exit 0;".format(cmd)
         #data = check_output(which_cmd, stderr=DEVNULL, shell=True).decode(ENCODING).strip()
         if abspath and len(abspath) > 0:
             if optsmatchconvert:
                 cmd_opts, *matchconvert = optsmatchconvert
-                exe = "LANG=C {} {}; exit 0;".format(cmd, cmd_opts)
-                data = check_output(exe, stderr=DEVNULL, shell=True).decode(ENCODING).strip()
+                data = run_cmd(cmd, cmd_opts)
                 if data and len(data) >= 0 and len(matchconvert) > 0:
                     cmatch, *convert = matchconvert
                     if cmatch:
@@ -504,6 +730,13 @@ def process_cmd(args):
 
     return data
 
+@lru_cache(maxsize=None)
+def cached_cmd(cmd, cmd_opts=""):
+    '''Returns the output of a command like process_cmd((cmd, cmd_opts)). Used for commands
+    which are called by multiple classes while generating them, like 'clinfo --raw --offline'
+    which loads all OpenCL runtimes at each call. MachineState.generate() clears the cache.'''
+    return process_cmd((cmd, cmd_opts))
+
 def get_config_file(args):
     outdict = {}
     fname, *matchconvert = args
@@ -549,27 +782,37 @@ def get_ostype():
 ################################################################################
 
 class BaseOperation:
+    # There is one operation object per key, so avoid a __dict__ for each of them
+    __slots__ = ("regex", "parser", "required", "tolerance", "_regex", "_literal")
     def __init__(self, regex=None, parser=None, required=False, tolerance=None):
         self.regex = regex
         self.parser = parser
         self.required = required
         self.tolerance = tolerance
+        # The regex can be given as string or precompiled pattern. It is compiled
+        # only once here instead of at every update
+        self._regex = re.compile(regex) if regex is not None else None
+        self._literal = regex_literal(self._regex) if regex is not None else None
     def valid(self):
         return False
     def ident(self):
         return None
     def match(self, data):
         out = data
-        if self.regex is not None:
-            regex = re.compile(self.regex)
+        if self._regex is INT_REGEX and data.isdigit():
+            # Most sysfs files contain only an integer like temp*_input, nothing to match
+            return data
+        if self._regex is not None:
+            literal = self._literal
+            if literal is not None and literal not in data:
+                # Skip the regex, it cannot match anywhere
+                return out
             for l in NEWLINE_REGEX.split(data):
-                m = regex.match(l)
+                if literal is not None and literal not in l:
+                    continue
+                m = self._regex.search(l)
                 if m:
                     out = m.group(1)
-                else:
-                    m = regex.search(l)
-                    if m:
-                        out = m.group(1)
         return out
     def parse(self, data):
         out = data
@@ -605,6 +848,7 @@ class BaseOperation:
         return "{}({})".format(cls, args)
 
 class Constant(BaseOperation):
+    __slots__ = ("value",)
     def __init__(self, value, required=False, tolerance=None):
         super(Constant, self).__init__(regex=None,
                                        parser=None,
@@ -620,15 +864,38 @@ class Constant(BaseOperation):
 
 
 class File(BaseOperation):
-    def __init__(self, path, regex=None, parser=None, required=False, tolerance=None):
+    __slots__ = ("path", "keep_open", "throttle", "_fd", "_last", "_skip")
+    def __init__(self, path, regex=None, parser=None, required=False, tolerance=None,
+                 keep_open=False, throttle=False):
         super(File, self).__init__(regex=regex,
                                    parser=parser,
                                    required=required,
                                    tolerance=tolerance)
         self.path = path
+        # Keep the file descriptor open between updates and re-read the file with
+        # pread(). Meant for few, often updated files like sensors in sysfs.
+        self.keep_open = keep_open
+        # Reuse the previous value for some updates if a read was slow. Meant for
+        # slow sensors like coretemp inputs and thermal zones.
+        self.throttle = throttle
+        self._fd = None
+        self._last = None
+        self._skip = 0
+    def __del__(self):
+        self.close()
+    def close(self):
+        """Close the file descriptor kept open by keep_open"""
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd = None
     def ident(self):
         return self.path
     def valid(self):
+        if self._fd is not None:
+            return True
         res = super(File, self).valid()
         if os.access(self.path, os.R_OK):
             try:
@@ -642,8 +909,25 @@ class File(BaseOperation):
         #logging.debug("File %s valid: %s", self.path, res)
         return res
     def update(self):
+        if not self.throttle:
+            return self._read()
+        if self._skip > 0:
+            self._skip -= 1
+            logging.debug("Reuse value of slow file %s", self.path)
+            return self._last
+        start = time.perf_counter_ns()
+        data = self._read()
+        if data is not None and time.perf_counter_ns() - start > SLOW_READ_NS:
+            logging.debug("Slow read of file %s, skipping next %d reads", self.path, SLOW_READ_SKIP)
+            self._skip = SLOW_READ_SKIP
+        self._last = data
+        return data
+
+    def _read(self):
         data = None
         logging.debug("Read file %s", self.path)
+        if self.keep_open:
+            return self._pread()
         filefp = fopen(self.path)
         if filefp:
             try:
@@ -654,14 +938,34 @@ class File(BaseOperation):
                 filefp.close()
         return data
 
+    def _pread(self):
+        data = None
+        try:
+            if self._fd is None:
+                self._fd = os.open(self.path, os.O_RDONLY|os.O_CLOEXEC)
+            chunks = []
+            offset = 0
+            while True:
+                chunk = os.pread(self._fd, 4096, offset)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                offset += len(chunk)
+            data = b"".join(chunks).decode(ENCODING).strip()
+        except OSError as e:
+            logging.debug("Failed to read file %s: %s", self.path, e)
+            self.close()
+        return data
+
 class Command(BaseOperation):
+    __slots__ = ("cmd", "abscmd", "cmd_args")
     def __init__(self, cmd, cmd_args, regex=None, parser=None, required=False, tolerance=None):
         super(Command, self).__init__(regex=regex,
                                       parser=parser,
                                       required=required,
                                       tolerance=tolerance)
         self.cmd = cmd
-        self.abscmd = self.cmd if os.access(self.cmd, os.X_OK) else which(self.cmd)
+        self.abscmd = self.cmd if os.access(self.cmd, os.X_OK) else cached_which(self.cmd)
         self.cmd_args = cmd_args
     def ident(self):
         return "{} {}".format(self.cmd, self.cmd_args)
@@ -678,8 +982,7 @@ class Command(BaseOperation):
         data = None
         if self.valid():
             logging.debug("Exec command %s %s", self.abscmd, self.cmd_args)
-            exe = "LANG=C {} {}; exit 0;".format(self.abscmd, self.cmd_args)
-            data = check_output(exe, stderr=DEVNULL, shell=True).decode(ENCODING).strip()
+            data = run_cmd(self.abscmd, self.cmd_args)
         return data
 
 ################################################################################
@@ -715,6 +1018,12 @@ class InfoGroup:
         self.name = name
         self.extended = extended
         self.anonymous = anonymous
+        # Name of the group in older versions. compare() uses it if an old state has no
+        # entry with the current name
+        self.legacy_name = None
+        # Generate and update subclasses concurrently. Only useful for subclasses which
+        # mostly wait for external commands and are independent from each other.
+        self.parallel_update = False
 
     @classmethod
     def from_dict(cls, data):
@@ -776,11 +1085,16 @@ class InfoGroup:
                 c._data[key] = value
         return c
 
-    def addf(self, key, filename, match=None, parse=None, extended=False):
-        """Add file to object including regex and parser"""
-        self._operations[key] = File(filename, regex=match, parser=parse)
+    def addf(self, key, filename, match=None, parse=None, extended=False, keep_open=False,
+             throttle=False):
+        """Add file to object including regex (string or compiled pattern) and parser.
+        With keep_open, the file stays open between updates. With throttle, slow reads
+        are skipped for some updates (see File)."""
+        self._operations[key] = File(filename, regex=match, parser=parse, keep_open=keep_open,
+                                     throttle=throttle)
     def addc(self, key, cmd, cmd_opts=None, match=None, parse=None, extended=False):
-        """Add command to object including command options, regex and parser"""
+        """Add command to object including command options, regex (string or compiled
+        pattern) and parser"""
         self._operations[key] = Command(cmd, cmd_opts, regex=match, parser=parse)
     def const(self, key, value):
         """Add constant value to object"""
@@ -801,6 +1115,24 @@ class InfoGroup:
         '''Generate subclasses, defined by derived classes'''
         pass
 
+    def update_from_output(self, data):
+        '''Update the object's commands from already captured command output instead of
+        executing them. Used by classes which get the output of all subclasses with a
+        single command call. Other operations are updated as in update().'''
+        for key, op in self._operations.items():
+            value = None
+            if isinstance(op, Command):
+                if data is not None:
+                    try:
+                        value = op.parse(op.match(data))
+                    except (ValueError, TypeError):
+                        logging.debug("Key '%s' not found in command output", key)
+            elif op.valid():
+                value = op.update()
+                if value is not None:
+                    value = op.parse(op.match(value))
+            self._data[key] = value
+
     def update(self):
         '''Read object's files and commands. Triggers update() of subclasses'''
         outdict = { k: None for (k,v) in self._operations.items()}
@@ -820,10 +1152,20 @@ class InfoGroup:
                     data = op.match(data)
                     data = op.parse(data)
                     outdict[key] = data
-        for inst in self._instances:
-            inst.update()
+        self._map(lambda inst: inst.update(), self._instances)
         self._data.update(outdict)
 
+    def _map(self, func, items):
+        '''Call func for all items, in a thread pool if parallel_update is set. The results
+        are returned in the order of the items.'''
+        items = list(items)
+        # Nested groups called from a worker thread run serially, so only the outermost
+        # parallel group uses the shared thread pool
+        if self.parallel_update and len(items) > 1 and \
+                not threading.current_thread().name.startswith(EXECUTOR_PREFIX):
+            return list(shared_executor().map(func, items))
+        return [func(item) for item in items]
+
     def get(self, meta=False):
         """Get the object's and all subobjects' data as dict"""
         outdict = { k: None for (k,v) in self._operations.items()}
@@ -836,21 +1178,31 @@ class InfoGroup:
         return outdict
     def get_html(self, level=0):
         """Get the object's and all subobjects' data as collapsible HTML table used by get_html()"""
-        s = ""
-        s += "<button class=\"accordion\">{}</button>\n".format(self.name)
-        s += "<div class=\"panel\">\n<table style=\"width:100vw\">\n"
+        parts = []
+        self._get_html(parts, level)
+        return "".join(parts)
+
+    def _get_html(self, parts, level):
+        """Append the HTML of the object and all subobjects to the list parts. All levels
+        write into the same list instead of formatting the complete HTML of each subobject
+        into the HTML of its parent"""
+        parts.append("<button class=\"accordion\">{}</button>\n".format(self.name))
+        parts.append("<div class=\"panel\">\n<table style=\"width:100vw\">\n")
         for k,v in self._data.items():
             if isinstance(v, list):
-                s += "<tr>\n<td style=\"width: 20%\"><b>{}:</b></td>\n<td>{}</td>\n</tr>\n".format(k, ", ".join([str(x) for x in v]))
+                parts.append("<tr>\n<td style=\"width: 20%\"><b>{}:</b></td>\n<td>{}</td>\n</tr>\n".format(k, ", ".join([str(x) for x in v])))
             else:
-                s += "<tr>\n<td style=\"width: 20%\"><b>{}:</b></td>\n<td>{}</td>\n</tr>\n".format(k, v)
+                parts.append("<tr>\n<td style=\"width: 20%\"><b>{}:</b></td>\n<td>{}</td>\n</tr>\n".format(k, v))
         for inst in self._instances:
             if len(self._data) > 0 and level > 0:
-                s += "<tr>\n<td colspan=\"2\">\n{}</td>\n</tr>".format(inst.get_html(level+1))
+                parts.append("<tr>\n<td colspan=\"2\">\n")
+                inst._get_html(parts, level+1)
+                parts.append("</td>\n</tr>")
             else:
-                s += "<tr>\n<td>{}</td>\n</tr>".format(inst.get_html(level+1))
-        s += "</table>\n</div>\n"
-        return s
+                parts.append("<tr>\n<td>")
+                inst._get_html(parts, level+1)
+                parts.append("</td>\n</tr>")
+        parts.append("</table>\n</div>\n")
 
     def get_json(self, sort=False, intend=4, meta=True):
         """Get the object's and all subobjects' data as JSON document (string)"""
@@ -938,8 +1290,8 @@ class InfoGroup:
             tcase = TestCase()
             estr = "key '{}' for class {}".format(key, cls)
             if isinstance(left, str) and isinstance(right, str):
-                lmatch = re.match(r"^([\d\.]+).*", left)
-                rmatch = re.match(r"^([\d\.]+).*", right)
+                lmatch = NUMBER_PREFIX_REGEX.match(left)
+                rmatch = NUMBER_PREFIX_REGEX.match(right)
                 if lmatch and rmatch:
                     try:
                         left = float(lmatch.group(1))
@@ -1017,8 +1369,11 @@ class InfoGroup:
                      if k in required4equal
                     })
         for inst in self._instances:
-            if inst.name in selfdict and inst.name in otherdict:
-                instdiff = inst.compare(otherdict[inst.name])
+            othername = inst.name
+            if othername not in otherdict and inst.legacy_name in otherdict:
+                othername = inst.legacy_name
+            if inst.name in selfdict and othername in otherdict:
+                instdiff = inst.compare(otherdict[othername])
                 if len(instdiff) > 0:
                     diff[inst.name] = instdiff
         return diff
@@ -1075,17 +1430,23 @@ class PathMatchInfoGroup(InfoGroup):
         if self.searchpath and self.match and self.subclass:
             mat = re.compile(self.match)
             base = self.searchpath
+            flist = cached_glob(base)
+            idents = [m.group(1) for m in map(mat.match, flist) if m]
             try:
-                glist += sorted([int(mat.match(f).group(1)) for f in glob(base) if mat.match(f)])
+                glist += sorted([int(x) for x in idents])
             except ValueError:
-                glist += sorted([mat.match(f).group(1) for f in glob(base) if mat.match(f)])
-            for item in glist:
-                cls = self.subclass(item,
-                                    extended=self.extended,
-                                    anonymous=self.anonymous,
-                                    **self.subargs)
-                cls.generate()
-                self._instances.append(cls)
+                glist += sorted(idents)
+            self._spawn(glist)
+    def _spawn(self, glist):
+        '''Create and generate a subclass instance for each item in glist'''
+        def create(item):
+            cls = self.subclass(item,
+                                extended=self.extended,
+                                anonymous=self.anonymous,
+                                **self.subargs)
+            cls.generate()
+            return cls
+        self._instances.extend(self._map(create, glist))
     def get_config(self):
         outdict = super(PathMatchInfoGroup, self).get_config()
         selfdict = {}
@@ -1125,13 +1486,14 @@ class ListInfoGroup(InfoGroup):
 
     def generate(self):
         if self.userlist and self.subclass:
-            for item in self.userlist:
+            def create(item):
                 cls = self.subclass(item,
                                     extended=self.extended,
                                     anonymous=self.anonymous,
                                     **self.subargs)
                 cls.generate()
-                self._instances.append(cls)
+                return cls
+            self._instances.extend(self._map(create, self.userlist))
 
     def get_config(self):
         outdict = super(ListInfoGroup, self).get_config()
@@ -1180,15 +1542,19 @@ class MultiClassInfoGroup(InfoGroup):
                         self.classargs = classargs
 
     def generate(self):
-        for cltype, clargs in zip(self.classlist, self.classargs):
+        def create(args):
+            cltype, clargs = args
             try:
                 cls = cltype(extended=self.extended, anonymous=self.anonymous, **clargs)
                 if cls:
                     cls.generate()
-                    self._instances.append(cls)
+                return cls
             except BaseException as exce:
                 #print("{}.generate: {}".format(cltype.__name__, exce))
                 raise exce
+        for cls in self._map(create, zip(self.classlist, self.classargs)):
+            if cls:
+                self._instances.append(cls)
 
     def get_config(self):
         outdict = super(MultiClassInfoGroup, self).get_config()
@@ -1290,7 +1656,7 @@ class MachineState(MultiClassInfoGroup):
             self.classargs.append({"clinfo_path" : clinfo_path})
             if likwid_enable:
                 if likwid_path is None or not pexists(likwid_path):
-                    path = which("likwid-topology")
+                    path = cached_which("likwid-topology")
                     if path:
                         likwid_path = os.path.dirname(path)
                 clargs = {"likwid_base" : likwid_path}
@@ -1319,6 +1685,17 @@ class MachineState(MultiClassInfoGroup):
             self.classlist.append(OpenCLInfo)
             self.classargs.append({"clinfo_path" : clinfo_path})
 
+    def generate(self):
+        # Start each generation with a fresh view on the file system
+        cached_glob.cache_clear()
+        cached_which.cache_clear()
+        cached_exists.cache_clear()
+        path_entries.cache_clear()
+        cached_hwmon_names.cache_clear()
+        cached_powercap_tree.cache_clear()
+        cached_cmd.cache_clear()
+        super(MachineState, self).generate()
+
     def get_config(self, sort=False, intend=4):
         outdict = {}
         for inst in self._instances:
@@ -1326,18 +1703,18 @@ class MachineState(MultiClassInfoGroup):
             outdict.update({inst.name : clsout})
         return json.dumps(outdict, sort_keys=sort, indent=intend)
 
-    def get_html(self, level=0):
-        s = ""
-        s += "<table style=\"width:100vw\">\n"
+    def _get_html(self, parts, level):
+        parts.append("<table style=\"width:100vw\">\n")
 #        for k,v in self._data.items():
 #            if isinstance(v, list):
 #                s += "<tr>\n\t<td>{}</td>\n\t<td>{}</td>\n</tr>\n".format(k, ", ".join([str(x) for x in v]))
 #            else:
 #                s += "<tr>\n\t<td>{}</td>\n\t<td>{}</td>\n</tr>\n".format(k, v)
         for inst in self._instances:
-            s += "<tr>\n\t<td>{}</td>\n</tr>".format(inst.get_html(level+1))
-        s += "</table>\n\n"
-        return s
+            parts.append("<tr>\n\t<td>")
+            inst._get_html(parts, level+1)
+            parts.append("</td>\n</tr>")
+        parts.append("</table>\n\n")
 
 
 ################################################################################
@@ -1354,7 +1731,7 @@ class OSInfoMacOS(InfoGroup):
         ostype = get_ostype()
         self.const("Type", ostype)
         self.required("Type")
-        self.addc("Version", "sysctl", "-n kern.osproductversion", r"([\d\.]+)")
+        self.addc("Version", "sysctl", "-n kern.osproductversion", FLOAT_REGEX)
         self.required("Version")
 
 class OperatingSystemInfo(InfoGroup):
@@ -1398,10 +1775,10 @@ class HostInfo(InfoGroup):
         super(HostInfo, self).__init__(anonymous=anonymous, extended=extended)
         self.name = "HostInfo"
         if not anonymous:
-            self.addc("Hostname", "hostname", "-s", r"(.+)")
+            self.addc("Hostname", "hostname", "-s", LINE_REGEX)
             if extended:
-                self.addc("Domainname", "hostname", "-d", r"(.+)")
-                self.addc("FQDN", "hostname", "-f", r"(.+)")
+                self.addc("Domainname", "hostname", "-d", LINE_REGEX)
+                self.addc("FQDN", "hostname", "-f", LINE_REGEX)
 
 ################################################################################
 # Infos about the CPU
@@ -1456,7 +1833,7 @@ class CpuInfo(InfoGroup):
 
 
         if pexists("/sys/devices/system/cpu/smt/active"):
-            self.addf("SMT", "/sys/devices/system/cpu/smt/active", r"(\d+)", tobool)
+            self.addf("SMT", "/sys/devices/system/cpu/smt/active", INT_REGEX, tobool)
             self.required("SMT")
         if extended:
             if march in ["x86_64", "i386"]:
@@ -1491,9 +1868,10 @@ class CpuTopologyMacOS(ListInfoGroup):
     def __init__(self, extended=False, anonymous=False):
         super(CpuTopologyMacOS, self).__init__(
             name="CpuTopology", anonymous=anonymous, extended=extended)
-        ncpu = process_cmd(("sysctl", "-a", r"hw.logicalcpu: (\d+)", int))
-        ncores_pack = process_cmd(("sysctl", "-a", r"machdep.cpu.cores_per_package: (\d+)", int))
-        ncores = process_cmd(("sysctl", "-a", r"machdep.cpu.core_count: (\d+)", int))
+        out = cached_cmd("sysctl", "-a") or ""
+        ncpu = CpuTopologyMacOS.getint(out, r"hw.logicalcpu: (\d+)")
+        ncores_pack = CpuTopologyMacOS.getint(out, r"machdep.cpu.cores_per_package: (\d+)")
+        ncores = CpuTopologyMacOS.getint(out, r"machdep.cpu.core_count: (\d+)")
         if isinstance(ncpu, int) and isinstance(ncores_pack, int) and isinstance(ncores, int):
             self.userlist = list(range(ncpu))
             self.subclass = CpuTopologyMacOSClass
@@ -1503,6 +1881,12 @@ class CpuTopologyMacOS(ListInfoGroup):
             self.const("NumCores", ncores)
             self.const("NumSockets", ncpu//ncores_pack)
             self.const("NumNUMANodes", ncpu//ncores_pack)
+    @staticmethod
+    def getint(value, regex):
+        try:
+            return int(match_data(value, regex))
+        except ValueError:
+            return None
 
 class CpuTopologyClass(InfoGroup):
     def __init__(self, ident, extended=False, anonymous=False):
@@ -1510,13 +1894,13 @@ class CpuTopologyClass(InfoGroup):
         self.name = "Cpu{}".format(ident)
         self.ident = ident
         base = "/sys/devices/system/cpu/cpu{}".format(ident)
-        self.addf("CoreId", pjoin(base, "topology/core_id"), r"(\d+)", int)
-        self.addf("PackageId", pjoin(base, "topology/physical_package_id"), r"(\d+)", int)
+        self.addf("CoreId", pjoin(base, "topology/core_id"), INT_REGEX, int)
+        self.addf("PackageId", pjoin(base, "topology/physical_package_id"), INT_REGEX, int)
         self.const("DieId", CpuTopologyClass.getdieid(ident))
         self.const("HWThread", ident)
         self.const("ThreadId", CpuTopologyClass.getthreadid(ident))
         if os.access(pjoin(base, "topology/cluster_id"), os.R_OK):
-            self.addf("ClusterId", pjoin(base, "topology/cluster_id"), r"(\d+)", int)
+            self.addf("ClusterId", pjoin(base, "topology/cluster_id"), INT_REGEX, int)
         if extended:
             self.const("Present", CpuTopologyClass.inlist("present", ident))
             self.const("Online", CpuTopologyClass.inlist("online", ident))
@@ -1590,7 +1974,7 @@ class CpuTopology(PathMatchInfoGroup):
         if searchpath and match and pexists(os.path.dirname(searchpath)):
             mat = re.compile(match)
             base = searchpath
-            glist = sorted([int(mat.match(f).group(1)) for f in glob(base) if mat.match(f)])
+            glist = sorted([int(mat.match(f).group(1)) for f in cached_glob(base) if mat.match(f)])
             return max(len(glist), 1)
         return 0
     @staticmethod
@@ -1600,7 +1984,7 @@ class CpuTopology(PathMatchInfoGroup):
         if searchpath and match and pexists(os.path.dirname(searchpath)):
             mat = re.compile(match)
             base = searchpath
-            glist = sorted([int(mat.match(f).group(1)) for f in glob(base) if mat.match(f)])
+            glist = sorted([int(mat.match(f).group(1)) for f in cached_glob(base) if mat.match(f)])
             return max(len(glist), 1)
         return 0
     @staticmethod
@@ -1687,14 +2071,14 @@ class CpuFrequencyClass(InfoGroup):
         self.ident = ident
         base = "/sys/devices/system/cpu/cpu{}/cpufreq".format(ident)
         if pexists(pjoin(base, "scaling_max_freq")):
-            self.addf("MaxFreq", pjoin(base, "scaling_max_freq"), r"(\d+)", tohertz)
+            self.addf("MaxFreq", pjoin(base, "scaling_max_freq"), INT_REGEX, tohertz)
         if pexists(pjoin(base, "scaling_max_freq")):
-            self.addf("MinFreq", pjoin(base, "scaling_min_freq"), r"(\d+)", tohertz)
+            self.addf("MinFreq", pjoin(base, "scaling_min_freq"), INT_REGEX, tohertz)
         if pexists(pjoin(base, "scaling_governor")):
-            self.addf("Governor", pjoin(base, "scaling_governor"), r"(.+)")
+            self.addf("Governor", pjoin(base, "scaling_governor"), LINE_REGEX)
         if pexists(pjoin(base, "energy_performance_preference")):
             fname = pjoin(base, "energy_performance_preference")
-            self.addf("EnergyPerfPreference", fname, r"(.+)")
+            self.addf("EnergyPerfPreference", fname, LINE_REGEX)
         self.required(list(self.files.keys()))
 
 class CpuFrequency(PathMatchInfoGroup):
@@ -1712,11 +2096,11 @@ class CpuFrequency(PathMatchInfoGroup):
             if extended:
                 if pexists(pjoin(base, "cpuinfo_transition_latency")):
                     fname = pjoin(base, "cpuinfo_transition_latency")
-                    self.addf("TransitionLatency", fname, r"(\d+)", int)
+                    self.addf("TransitionLatency", fname, INT_REGEX, int)
                 if pexists(pjoin(base, "cpuinfo_max_freq")):
-                    self.addf("MaxAvailFreq", pjoin(base, "cpuinfo_max_freq"), r"(\d+)", tohertz)
+                    self.addf("MaxAvailFreq", pjoin(base, "cpuinfo_max_freq"), INT_REGEX, tohertz)
                 if pexists(pjoin(base, "cpuinfo_min_freq")):
-                    self.addf("MinAvailFreq", pjoin(base, "cpuinfo_min_freq"), r"(\d+)", tohertz)
+                    self.addf("MinAvailFreq", pjoin(base, "cpuinfo_min_freq"), INT_REGEX, tohertz)
                 if pexists(pjoin(base, "scaling_available_frequencies")):
                     fname = pjoin(base, "scaling_available_frequencies")
                     self.addf("AvailFrequencies", fname, r"(.*)", tohertzlist)
@@ -1763,8 +2147,8 @@ class NumaInfoHugepagesClass(InfoGroup):
         self.size = size
         self.node = node
         base = "/sys/devices/system/node/node{}/hugepages/hugepages-{}".format(node, size)
-        self.addf("Count", pjoin(base, "nr_hugepages"), r"(\d+)", int)
-        self.addf("Free", pjoin(base, "free_hugepages"), r"(\d+)", int)
+        self.addf("Count", pjoin(base, "nr_hugepages"), INT_REGEX, int)
+        self.addf("Free", pjoin(base, "free_hugepages"), INT_REGEX, int)
         self.required(["Count", "Free"])
 
 class NumaInfoClass(PathMatchInfoGroup):
@@ -1806,7 +2190,7 @@ class CacheTopologyMacOSClass(InfoGroup):
         super(CacheTopologyMacOSClass, self).__init__(
             name=ident.upper(), extended=extended, anonymous=anonymous)
         self.ident = ident
-        self.addc("Size", "sysctl", "-n hw.{}cachesize".format(ident), r"(\d+)", int)
+        self.addc("Size", "sysctl", "-n hw.{}cachesize".format(ident), INT_REGEX, int)
         self.const("Level", re.match(r"l(\d+)[id]*", ident).group(1))
         if re.match(r"l\d+([id]*)", ident).group(1) == 'i':
             self.const("Type", "Instruction")
@@ -1816,11 +2200,11 @@ class CacheTopologyMacOSClass(InfoGroup):
             self.const("Type", "Unified")
         self.const("CpuList", CacheTopologyMacOSClass.getcpulist(ident))
         if extended:
-            self.addc("CoherencyLineSize", "sysctl", "-n hw.cachelinesize", r"(\d+)", int)
+            self.addc("CoherencyLineSize", "sysctl", "-n hw.cachelinesize", INT_REGEX, int)
             key = "machdep.cpu.cache.{}_associativity".format(self.name)
             out = process_cmd(("sysctl", "-n {}".format(key), r"(\d+)", int))
             if isinstance(out, int):
-                self.addc("Associativity", "sysctl", "-n {}".format(key), r"(\d+)", int)
+                self.addc("Associativity", "sysctl", "-n {}".format(key), INT_REGEX, int)
     @staticmethod
     def getcpulist(arg):
         clist = []
@@ -1854,31 +2238,31 @@ class CacheTopologyClass(InfoGroup):
         base = "/sys/devices/system/cpu/cpu0/cache/index{}".format(ident)
         fparse = CacheTopologyClass.kBtoBytes
         if pexists(base):
-            self.addf("Size", pjoin(base, "size"), r"(\d+)", fparse)
-            self.addf("Level", pjoin(base, "level"), r"(\d+)", int)
-            self.addf("Type", pjoin(base, "type"), r"(.+)")
+            self.addf("Size", pjoin(base, "size"), INT_REGEX, fparse)
+            self.addf("Level", pjoin(base, "level"), INT_REGEX, int)
+            self.addf("Type", pjoin(base, "type"), LINE_REGEX)
             self.const("CpuList", CacheTopologyClass.getcpulist(ident))
             if extended:
-                self.addf("Sets", pjoin(base, "number_of_sets"), r"(\d+)", int)
-                self.addf("Associativity", pjoin(base, "ways_of_associativity"), r"(\d+)", int)
-                self.addf("CoherencyLineSize", pjoin(base, "coherency_line_size"), r"(\d+)", fparse)
+                self.addf("Sets", pjoin(base, "number_of_sets"), INT_REGEX, int)
+                self.addf("Associativity", pjoin(base, "ways_of_associativity"), INT_REGEX, int)
+                self.addf("CoherencyLineSize", pjoin(base, "coherency_line_size"), INT_REGEX, fparse)
                 phys_line_part = pjoin(base, "physical_line_partition")
                 if pexists(phys_line_part):
 
-                    self.addf("PhysicalLineSize", phys_line_part, r"(\d+)", fparse)
+                    self.addf("PhysicalLineSize", phys_line_part, INT_REGEX, fparse)
                 alloc_policy = pjoin(base, "allocation_policy")
                 if pexists(alloc_policy):
-                    self.addf("AllocPolicy", alloc_policy, r"(.+)")
+                    self.addf("AllocPolicy", alloc_policy, LINE_REGEX)
                 write_policy = pjoin(base, "write_policy")
                 if pexists(write_policy):
-                    self.addf("WritePolicy", write_policy, r"(.+)", int)
+                    self.addf("WritePolicy", write_policy, LINE_REGEX, int)
         self.required(list(self.files.keys()))
         #"CpuList" : (pjoin(self.searchpath, "shared_cpu_list"), r"(.+)", tointlist),
     @staticmethod
     def getcpulist(arg):
         base = "/sys/devices/system/cpu/cpu*"
         cmat = re.compile(r".*/cpu(\d+)$")
-        cpus = sorted([int(cmat.match(x).group(1)) for x in glob(base) if cmat.match(x)])
+        cpus = sorted([int(cmat.match(x).group(1)) for x in cached_glob(base) if cmat.match(x)])
         cpulist = []
         slist = []
         cpath = "cache/index{}/shared_cpu_list".format(arg)
@@ -1989,7 +2373,7 @@ class LoadAvgMacOs(InfoGroup):
 class LoadAvg(InfoGroup):
     def __init__(self, extended=False, anonymous=False):
         super(LoadAvg, self).__init__(name="LoadAvg", extended=extended, anonymous=anonymous)
-        self.addf("LoadAvg1m", "/proc/loadavg", r"([\d\.]+)", float)
+        self.addf("LoadAvg1m", "/proc/loadavg", FLOAT_REGEX, float)
         self.addf("LoadAvg5m", "/proc/loadavg", r"[\d\.]+\s+([\d+\.]+)", float)
         self.addf("LoadAvg15m", "/proc/loadavg", r"[\d\.]+\s+[\d+\.]+\s+([\d+\.]+)", float)
         #self.required(["LoadAvg15m"])
@@ -2099,14 +2483,14 @@ class CgroupInfo(InfoGroup):
         cset = process_file(("/proc/self/cgroup", csetmat))
         if cset is not None:
             base = pjoin("/sys/fs/cgroup/cpuset", cset.strip("/"))
-            self.addf("CPUs", pjoin(base, "cpuset.cpus"), r"(.+)", tointlist)
-            self.addf("Mems", pjoin(base, "cpuset.mems"), r"(.+)", tointlist)
+            self.addf("CPUs", pjoin(base, "cpuset.cpus"), LINE_REGEX, tointlist)
+            self.addf("Mems", pjoin(base, "cpuset.mems"), LINE_REGEX, tointlist)
             self.required("CPUs", "Mems")
             if extended:
                 names = ["CPUs.effective", "Mems.effective"]
                 files = ["cpuset.effective_cpus", "cpuset.effective_mems"]
                 for key, fname in zip(names, files):
-                    self.addf(key, pjoin(base, fname), r"(.+)", tointlist)
+                    self.addf(key, pjoin(base, fname), LINE_REGEX, tointlist)
                     self.required(key)
 
 ################################################################################
@@ -2119,8 +2503,8 @@ class WritebackWorkqueue(InfoGroup):
                                                  anonymous=anonymous)
         base = "/sys/bus/workqueue/devices/writeback"
         self.addf("CPUmask", pjoin(base, "cpumask"), r"([0-9a-fA-F]+)", masktolist)
-        self.addf("MaxActive", pjoin(base, "max_active"), r"(\d+)", int)
-        self.addf("NUMA", pjoin(base, "numa"), r"(\d+)", int)
+        self.addf("MaxActive", pjoin(base, "max_active"), INT_REGEX, int)
+        self.addf("NUMA", pjoin(base, "numa"), INT_REGEX, int)
         self.required(["CPUmask", "MaxActive", "NUMA"])
 
 ################################################################################
@@ -2132,11 +2516,11 @@ class WritebackInfo(InfoGroup):
                                             extended=extended,
                                             anonymous=anonymous)
         base = "/proc/sys/vm"
-        self.addf("DirtyRatio", pjoin(base, "dirty_ratio"), r"(\d+)", int)
-        self.addf("DirtyBackgroundRatio", pjoin(base, "dirty_background_ratio"), r"(\d+)", int)
-        self.addf("DirtyBytes", pjoin(base, "dirty_bytes"), r"(\d+)", int)
-        self.addf("DirtyBackgroundBytes", pjoin(base, "dirty_background_bytes"), r"(\d+)", int)
-        self.addf("DirtyExpireCentisecs", pjoin(base, "dirty_expire_centisecs"), r"(\d+)", int)
+        self.addf("DirtyRatio", pjoin(base, "dirty_ratio"), INT_REGEX, int)
+        self.addf("DirtyBackgroundRatio", pjoin(base, "dirty_background_ratio"), INT_REGEX, int)
+        self.addf("DirtyBytes", pjoin(base, "dirty_bytes"), INT_REGEX, int)
+        self.addf("DirtyBackgroundBytes", pjoin(base, "dirty_background_bytes"), INT_REGEX, int)
+        self.addf("DirtyExpireCentisecs", pjoin(base, "dirty_expire_centisecs"), INT_REGEX, int)
         self.required(["DirtyRatio",
                        "DirtyBytes",
                        "DirtyBackgroundRatio",
@@ -2151,10 +2535,10 @@ class TransparentHugepagesDaemon(InfoGroup):
                                                          extended=extended,
                                                          anonymous=anonymous)
         base = "/sys/kernel/mm/transparent_hugepage/khugepaged"
-        self.addf("Defrag", pjoin(base, "defrag"), r"(\d+)", int)
-        self.addf("PagesToScan", pjoin(base, "pages_to_scan"), r"(\d+)", int)
-        self.addf("ScanSleepMillisecs", pjoin(base, "scan_sleep_millisecs"), r"(\d+)", int)
-        self.addf("AllocSleepMillisecs", pjoin(base, "alloc_sleep_millisecs"), r"(\d+)", int)
+        self.addf("Defrag", pjoin(base, "defrag"), INT_REGEX, int)
+        self.addf("PagesToScan", pjoin(base, "pages_to_scan"), INT_REGEX, int)
+        self.addf("ScanSleepMillisecs", pjoin(base, "scan_sleep_millisecs"), INT_REGEX, int)
+        self.addf("AllocSleepMillisecs", pjoin(base, "alloc_sleep_millisecs"), INT_REGEX, int)
         self.required(["Defrag", "PagesToScan", "ScanSleepMillisecs", "AllocSleepMillisecs"])
 
 class TransparentHugepages(InfoGroup):
@@ -2166,7 +2550,7 @@ class TransparentHugepages(InfoGroup):
         self.addf("State", pjoin(base, "enabled"), r".*\[(.*)\].*")
         self.addf("Defrag", pjoin(base, "defrag"), r".*\[(.*)\].*")
         self.addf("ShmemEnabled", pjoin(base, "shmem_enabled"), r".*\[(.*)\].*")
-        self.addf("UseZeroPage", pjoin(base, "use_zero_page"), r"(\d+)", tobool)
+        self.addf("UseZeroPage", pjoin(base, "use_zero_page"), INT_REGEX, tobool)
         self.required(["State", "UseZeroPage", "Defrag", "ShmemEnabled"])
         self._instances = [TransparentHugepagesDaemon(extended, anonymous)]
 
@@ -2183,19 +2567,19 @@ class PowercapInfoConstraintClass(InfoGroup):
         self.ident = ident
         self.package = package
         self.domain = domain
-        base = "/sys/devices/virtual/powercap/intel-rapl/intel-rapl:{}".format(package)
-        fptr = fopen(pjoin(base, "constraint_{}_name".format(ident)))
-        if fptr:
-            self.name = totitle(fptr.read().decode(ENCODING).strip())
-            fptr.close()
+        base = pjoin(POWERCAP_BASE, "intel-rapl:{}".format(package))
         if domain >= 0:
             base = pjoin(base, "intel-rapl:{}:{}".format(package, domain))
+        # The constraint name was read by the scan of the powercap tree
+        cname = PowercapInfo.zone(package, domain).get("constraints", {}).get(ident)
+        if cname is not None:
+            self.name = totitle(cname)
         names = ["PowerLimitUw",
                  "TimeWindowUs"]
         files = ["constraint_{}_power_limit_uw".format(ident),
                  "constraint_{}_time_window_us".format(ident)]
         for key, fname in zip(names, files):
-            self.addf(key, pjoin(base, fname), r"(.+)", int)
+            self.addf(key, pjoin(base, fname), LINE_REGEX, int)
         self.required(names)
 
 class PowercapInfoClass(PathMatchInfoGroup):
@@ -2204,24 +2588,26 @@ class PowercapInfoClass(PathMatchInfoGroup):
         super(PowercapInfoClass, self).__init__(extended=extended, anonymous=anonymous)
         self.ident = ident
         self.package = package
-        base = "/sys/devices/virtual/powercap/intel-rapl"
-        base = pjoin(base, "intel-rapl:{}/intel-rapl:{}:{}".format(package, package, ident))
-        fptr = fopen(pjoin(base, "name".format(ident)))
-        if fptr:
-            self.name = totitle(fptr.read().decode(ENCODING).strip())
-            fptr.close()
-        self.addf("Enabled", pjoin(base, "enabled"), r"(\d+)", tobool)
+        base = pjoin(POWERCAP_BASE, "intel-rapl:{}/intel-rapl:{}:{}".format(package, package, ident))
+        dname = PowercapInfo.zone(package, ident).get("name")
+        if dname is not None:
+            self.name = totitle(dname)
+        self.addf("Enabled", pjoin(base, "enabled"), INT_REGEX, tobool)
         self.searchpath = pjoin(base, "constraint_*_name")
         self.match = r".*/constraint_(\d+)_name"
         self.subclass = PowercapInfoConstraintClass
         self.subargs = {"package" : package, "domain" : ident}
 
+    def generate(self):
+        # The constraints were found by the scan of the powercap tree
+        self._spawn(list(PowercapInfo.zone(self.package, self.ident).get("constraints", {})))
+
 class PowercapInfoPackageClass(PathMatchInfoGroup):
     '''Class to spawn subclasses for powercap package domain
     (/sys/devices/virtual/powercap/intel-rapl/intel-rapl:*)
     '''
     def __init__(self, ident, extended=False, anonymous=False):
-        base = "/sys/devices/virtual/powercap/intel-rapl/intel-rapl:{}".format(ident)
+        base = pjoin(POWERCAP_BASE, "intel-rapl:{}".format(ident))
         super(PowercapInfoPackageClass, self).__init__(name="Package",
                                                        extended=extended,
                                                        anonymous=anonymous,
@@ -2230,31 +2616,34 @@ class PowercapInfoPackageClass(PathMatchInfoGroup):
                                                        subclass=PowercapInfoConstraintClass,
                                                        subargs={"package" : ident})
         self.ident = ident
-        self.addf("Enabled", pjoin(base, "enabled"), r"(\d+)", tobool)
+        self.addf("Enabled", pjoin(base, "enabled"), INT_REGEX, tobool)
+
+    def generate(self):
+        # The constraints were found by the scan of the powercap tree
+        self._spawn(list(PowercapInfo.zone(self.ident).get("constraints", {})))
 
 class PowercapInfoPackage(PathMatchInfoGroup):
     '''Class to spawn subclasses for one powercap device/package
     (/sys/devices/virtual/powercap/intel-rapl/intel-rapl:<package>*:*)
     '''
     def __init__(self, package, extended=False, anonymous=False):
-        base = "/sys/devices/virtual/powercap/intel-rapl/intel-rapl:{}".format(package)
+        base = pjoin(POWERCAP_BASE, "intel-rapl:{}".format(package))
         super(PowercapInfoPackage, self).__init__(extended=extended,
                                                   anonymous=anonymous,
                                                   subargs={"package" : package},
                                                   match=r".*/intel-rapl\:\d+:(\d+)",
                                                   subclass=PowercapInfoClass)
         self.package = package
-        fptr = fopen(pjoin(base, "name"))
-        if fptr:
-            self.name = totitle(fptr.read().decode(ENCODING).strip())
-            fptr.close()
+        pname = PowercapInfo.zone(package).get("name")
+        if pname is not None:
+            self.name = totitle(pname)
         else:
             self.name = "PowercapInfoPackage{}".format(package)
         self.searchpath = pjoin(base, "intel-rapl:{}:*".format(package))
-        self.package = package
 
     def generate(self):
-        super(PowercapInfoPackage, self).generate()
+        # The subdomains were found by the scan of the powercap tree
+        self._spawn(list(PowercapInfo.zone(self.package).get("domains", {})))
         cls = PowercapInfoPackageClass(self.package, extended=self.extended)
         cls.generate()
         self._instances.append(cls)
@@ -2271,20 +2660,40 @@ class PowercapInfo(PathMatchInfoGroup):
                                            anonymous=anonymous)
         if platform.machine() in ["x86_64", "i386"]:
             self.subclass = PowercapInfoPackage
-            self.searchpath = "/sys/devices/virtual/powercap/intel-rapl/intel-rapl:*"
+            self.searchpath = pjoin(POWERCAP_BASE, "intel-rapl:*")
             self.match = r".*/intel-rapl\:(\d+)"
         else:
             base = "/sys/firmware/opal/powercap/system-powercap"
             if pexists(base):
-                self.addf("PowerLimit", pjoin(base, "powercap-current"), r"(\d+)", int)
+                self.addf("PowerLimit", pjoin(base, "powercap-current"), INT_REGEX, int)
                 if extended:
-                    self.addf("PowerLimitMax", pjoin(base, "powercap-max"), r"(\d+)", int)
-                    self.addf("PowerLimitMin", pjoin(base, "powercap-min"), r"(\d+)", int)
+                    self.addf("PowerLimitMax", pjoin(base, "powercap-max"), INT_REGEX, int)
+                    self.addf("PowerLimitMin", pjoin(base, "powercap-min"), INT_REGEX, int)
             base = "/sys/firmware/opal/psr"
             if pexists(base):
-                for i, fname in enumerate(glob(pjoin(base, "cpu_to_gpu_*"))):
-                    key = "CpuToGpu{}".format(i)
-                    self.addf(key, fname, r"(\d+)", int)
+                # Sort numerically and use the number in the file name as key
+                # suffix, so cpu_to_gpu_10 does not get listed before cpu_to_gpu_2
+                with os.scandir(base) as entries:
+                    fnames = [e.name for e in entries
+                              if e.name.startswith("cpu_to_gpu_") and e.name[11:].isdigit()]
+                for fname in sorted(fnames, key=lambda x: int(x.rsplit("_", 1)[1])):
+                    key = "CpuToGpu{}".format(fname.rsplit("_", 1)[1])
+                    self.addf(key, pjoin(base, fname), INT_REGEX, int)
+
+    def generate(self):
+        # The packages, domains and constraints are found by a single scan of the
+        # powercap tree which the subclasses share
+        if self.subclass:
+            self._spawn(list(cached_powercap_tree(POWERCAP_BASE)))
+
+    @staticmethod
+    def zone(package, domain=-1):
+        '''Get the scanned name, constraints and domains of a powercap package or of one
+        of its domains (empty dict if missing)'''
+        zone = cached_powercap_tree(POWERCAP_BASE).get(package, {})
+        if domain >= 0:
+            zone = zone.get("domains", {}).get(domain, {})
+        return zone
 
 
 ################################################################################
@@ -2297,9 +2706,9 @@ class HugepagesClass(InfoGroup):
         super(HugepagesClass, self).__init__(name=name, extended=extended, anonymous=anonymous)
         self.size = size
         base = "/sys/kernel/mm/hugepages/hugepages-{}".format(size)
-        self.addf("Count", pjoin(base, "nr_hugepages"), r"(\d+)", int)
-        self.addf("Free", pjoin(base, "free_hugepages"), r"(\d+)", int)
-        self.addf("Reserved", pjoin(base, "resv_hugepages"), r"(\d+)", int)
+        self.addf("Count", pjoin(base, "nr_hugepages"), INT_REGEX, int)
+        self.addf("Free", pjoin(base, "free_hugepages"), INT_REGEX, int)
+        self.addf("Reserved", pjoin(base, "resv_hugepages"), INT_REGEX, int)
 
 class Hugepages(PathMatchInfoGroup):
     '''Class to spawn subclasses for all hugepages sizes (/sys/kernel/mm/hugepages/hugepages-*)'''
@@ -2320,7 +2729,7 @@ class CompilerInfoClass(InfoGroup):
         self.executable = executable
         self.name = executable
         self.addc("Version", executable, "--version", r"(\d+\.\d+\.\d+)")
-        abscmd = which(executable)
+        abscmd = cached_which(executable)
         if abscmd and len(abscmd) > 0:
             self.const("Path", abscmd)
         self.required("Version")
@@ -2340,7 +2749,8 @@ class CCompilerInfo(ListInfoGroup):
             comp = os.environ["CC"]
             if comp not in self.compilerlist:
                 self.compilerlist.append(comp)
-        self.userlist = [c for c in self.compilerlist if which(c)]
+        self.userlist = find_executables(self.compilerlist)
+        self.parallel_update = True
 
 
 class CPlusCompilerInfo(ListInfoGroup):
@@ -2357,7 +2767,8 @@ class CPlusCompilerInfo(ListInfoGroup):
             comp = os.environ["CXX"]
             if comp not in self.compilerlist:
                 self.compilerlist.append(comp)
-        self.userlist = [c for c in self.compilerlist if which(c)]
+        self.userlist = find_executables(self.compilerlist)
+        self.parallel_update = True
 
 
 class FortranCompilerInfo(ListInfoGroup):
@@ -2375,7 +2786,8 @@ class FortranCompilerInfo(ListInfoGroup):
             comp = os.environ["FC"]
             if comp not in self.compilerlist:
                 self.compilerlist.append(comp)
-        self.userlist = [c for c in self.compilerlist if which(c)]
+        self.userlist = find_executables(self.compilerlist)
+        self.parallel_update = True
 
 class AcceleratorCompilerInfo(ListInfoGroup):
     '''Class to spawn subclasses for various compilers used with accelerators'''
@@ -2386,7 +2798,8 @@ class AcceleratorCompilerInfo(ListInfoGroup):
                                                       anonymous=anonymous)
         self.compilerlist = ["nvcc", "hipcc", "icx", "icpx", "dpcpp",
                              "clocl", "nfort", "ncc", "nc++", "rocm-clang-ocl"]
-        self.userlist = [c for c in self.compilerlist if which(c)]
+        self.userlist = find_executables(self.compilerlist)
+        self.parallel_update = True
 
 class CompilerInfo(MultiClassInfoGroup):
     '''Class to spawn subclasses for various compilers'''
@@ -2398,6 +2811,7 @@ class CompilerInfo(MultiClassInfoGroup):
                                            anonymous=anonymous,
                                            classlist=clist,
                                            classargs=cargs)
+        self.parallel_update = True
 
 ################################################################################
 # Infos about Python interpreters
@@ -2408,7 +2822,7 @@ class PythonInfoClass(InfoGroup):
         super(PythonInfoClass, self).__init__(
             name=executable, extended=extended, anonymous=anonymous)
         self.executable = executable
-        abspath = which(executable)
+        abspath = cached_which(executable)
         if abspath and len(abspath) > 0:
             self.addc("Version", abspath, "--version 2>&1", r"(\d+\.\d+\.\d+)")
             self.const("Path", abspath)
@@ -2422,7 +2836,8 @@ class PythonInfo(ListInfoGroup):
                                          extended=extended,
                                          anonymous=anonymous,
                                          subclass=PythonInfoClass,
-                                         userlist=[i for i in self.interpreters if which(i)])
+                                         userlist=[i for i in self.interpreters if cached_which(i)])
+        self.parallel_update = True
 
 ################################################################################
 # Infos about MPI libraries
@@ -2434,7 +2849,7 @@ class MpiInfoClass(InfoGroup):
         self.executable = executable
         self.addc("Version", executable, "--version", None, MpiInfoClass.mpiversion)
         self.addc("Implementor", executable, "--version", None, MpiInfoClass.mpivendor)
-        abscmd = which(executable)
+        abscmd = cached_which(executable)
         if abscmd and len(abscmd) > 0:
             self.const("Path", abscmd)
         self.required(["Version", "Implementor"])
@@ -2467,13 +2882,14 @@ class MpiInfo(ListInfoGroup):
         super(MpiInfo, self).__init__(name="MpiInfo", extended=extended)
         self.mpilist = ["mpiexec", "mpiexec.hydra", "mpirun", "srun", "aprun"]
         self.subclass = MpiInfoClass
-        self.userlist = [m for m in self.mpilist if which(m)]
+        self.userlist = [m for m in self.mpilist if cached_which(m)]
+        self.parallel_update = True
         if extended:
-            ompi = which("ompi_info")
+            ompi = cached_which("ompi_info")
             if ompi and len(ompi) > 0 and extended:
                 ompi_args = "--parseable --params all all --level 9"
                 self.addc("OpenMpiParams", ompi, ompi_args, parse=MpiInfo.openmpiparams)
-            impi = which("impi_info")
+            impi = cached_which("impi_info")
             if impi and len(impi) > 0 and extended:
                 self.addc("IntelMpiParams", impi, "| grep \"|\"", parse=MpiInfo.intelmpiparams)
     @staticmethod
@@ -2505,31 +2921,45 @@ class ShellEnvironment(InfoGroup):
     def __init__(self, extended=False, anonymous=False):
         super(ShellEnvironment, self).__init__(extended=extended, anonymous=anonymous)
         self.name = "ShellEnvironment"
+        replacements = None
+        if self.anonymous:
+            replacements = ShellEnvironment.anonymous_replacements()
         for k,v in os.environ.items():
             value = v
             if self.anonymous:
-                value = ShellEnvironment.anonymous_shell_var(k, v)
+                value = ShellEnvironment.anonymous_shell_var(k, v, replacements)
             self.const(k, value)
 
     def update(self):
         super(ShellEnvironment, self).update()
         outdict = {}
+        replacements = None
+        if self.anonymous:
+            replacements = ShellEnvironment.anonymous_replacements()
         for k,v in os.environ.items():
             value = v
             if self.anonymous:
-                value = ShellEnvironment.anonymous_shell_var(k, v)
+                value = ShellEnvironment.anonymous_shell_var(k, v, replacements)
             self._data[k] = value
 
     @staticmethod
-    def anonymous_shell_var(key, value):
-        out = value
-        ipregex = re.compile(r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}")
-        for ipaddr in ipregex.findall(value):
-            out = out.replace(ipaddr, "XXX.XXX.XXX.XXX")
-        out = out.replace(getuser(), "anonuser")
+    def anonymous_replacements():
+        """Get list of (name, replacement) tuples for the user and group names"""
+        replacements = [(getuser(), "anonuser")]
         for i, group in enumerate(os.getgroups()):
             gname = getgrgid(group)
-            out = out.replace(gname.gr_name, "group{}".format(i))
+            replacements.append((gname.gr_name, "group{}".format(i)))
+        return replacements
+
+    @staticmethod
+    def anonymous_shell_var(key, value, replacements=None):
+        out = value
+        if "." in out:
+            out = IPADDR_REGEX.sub("XXX.XXX.XXX.XXX", out)
+        if replacements is None:
+            replacements = ShellEnvironment.anonymous_replacements()
+        for name, repl in replacements:
+            out = out.replace(name, repl)
         return out
 
 ################################################################################
@@ -2537,19 +2967,23 @@ class ShellEnvironment(InfoGroup):
 ################################################################################
 class PrefetcherInfoClass(InfoGroup):
     '''Class to read prefetcher settings for one HW thread (uses the likwid-features command)'''
-    def __init__(self, ident, extended=False, anonymous=False, likwid_base=None):
+    def __init__(self, ident, extended=False, anonymous=False, likwid_base=None, abscmd=None):
         super(PrefetcherInfoClass, self).__init__(
             name="Cpu{}".format(ident), extended=extended, anonymous=anonymous)
         self.ident = ident
         self.likwid_base = likwid_base
+        self.abscmd = abscmd
         names = ["HW_PREFETCHER", "CL_PREFETCHER", "DCU_PREFETCHER", "IP_PREFETCHER"]
         cmd_opts = "-c {} -l".format(ident)
-        cmd = "likwid-features"
-        abscmd = cmd
-        if likwid_base and os.path.isdir(likwid_base):
-            abscmd = pjoin(likwid_base, cmd)
-        if not pexists(abscmd):
-            abscmd = which(cmd)
+        # The parent class resolves the likwid-features path once and hands it
+        # down, so the lookup is only done here if the class is used standalone.
+        if not abscmd:
+            cmd = "likwid-features"
+            abscmd = cmd
+            if likwid_base and os.path.isdir(likwid_base):
+                abscmd = pjoin(likwid_base, cmd)
+            if not cached_exists(abscmd):
+                abscmd = cached_which(cmd)
 
         if abscmd:
             for name in names:
@@ -2567,8 +3001,9 @@ class PrefetcherInfo(PathMatchInfoGroup):
         abscmd = cmd
         if likwid_base and os.path.isdir(likwid_base):
             abscmd = pjoin(likwid_base, cmd)
-        if not pexists(abscmd):
-            abscmd = which(cmd)
+        if not cached_exists(abscmd):
+            abscmd = cached_which(cmd)
+        self.abscmd = abscmd
 
         if abscmd:
             for r in [r"Feature\s+HWThread\s(\d+)", r"Feature\s+CPU\s(\d+)"]:
@@ -2580,11 +3015,43 @@ class PrefetcherInfo(PathMatchInfoGroup):
                         self.searchpath = "/sys/devices/system/cpu/cpu*"
                         self.match = r".*/cpu(\d+)$"
                         self.subclass = PrefetcherInfoClass
-                        self.subargs = {"likwid_base" : likwid_base}
+                        self.subargs = {"likwid_base" : likwid_base, "abscmd" : abscmd}
                         break
                 except:
                     pass
-                
+
+    @staticmethod
+    def splitoutput(data):
+        '''Split the feature table of likwid-features for multiple HW threads into the
+        output of each HW thread. The table has a column for each HW thread:
+        Feature    HWThread 0    HWThread 1
+        HW_PREFETCHER    on    off'''
+        cpus = []
+        lines = {}
+        for line in data.splitlines():
+            tokens = line.split()
+            if len(tokens) > 2 and tokens[0] == "Feature":
+                cpus = [int(x) for x in tokens[2::2] if x.isdigit()]
+                lines = {cpu : ["Feature {} {}".format(tokens[1], cpu)] for cpu in cpus}
+            elif cpus and len(tokens) == len(cpus) + 1:
+                for cpu, value in zip(cpus, tokens[1:]):
+                    lines[cpu].append("{} {}".format(tokens[0], value))
+        return {cpu : "\n".join(clines) for cpu, clines in lines.items()}
+
+    def update(self):
+        '''Call likwid-features only once for all HW threads'''
+        outputs = {}
+        if self.abscmd and len(self._instances) > 0:
+            cpulist = ",".join(str(inst.ident) for inst in self._instances)
+            data = process_cmd((self.abscmd, "-l -c {}".format(cpulist)))
+            if data:
+                outputs = PrefetcherInfo.splitoutput(data)
+        if any(inst.ident not in outputs for inst in self._instances):
+            super(PrefetcherInfo, self).update()
+            return
+        for inst in self._instances:
+            inst.update_from_output(outputs[inst.ident])
+
 
 ################################################################################
 # Infos about the turbo frequencies (LIKWID only)
@@ -2598,11 +3065,6 @@ class TurboInfo(InfoGroup):
         self.likwid_base = likwid_base
         cmd = "likwid-powermeter"
         cmd_opts = "-i 2>&1"
-        error_matches = [r".*Cannot gather values.*",
-                         r".*Cannot get access.*",
-                         r".*Query Turbo Mode only supported.*",
-                         r"^Failed.*",
-                         r"^ERROR .*"]
         names = ["BaseClock", "MinClock", "MinUncoreClock", "MaxUncoreClock"]
         matches = [r"Base clock:\s+([\d\.]+ MHz)",
                    r"Minimal clock:\s+([\d\.]+ MHz)",
@@ -2614,17 +3076,11 @@ class TurboInfo(InfoGroup):
             if pexists(tmpcmd):
                 abscmd = tmpcmd
         else:
-            abscmd = which(cmd)
+            abscmd = cached_which(cmd)
         if abscmd:
             data = process_cmd((abscmd, cmd_opts, matches[0]))
             if len(data) > 0:
-                err = False
-                for l in data.split("\n"):
-                    for regex in error_matches:
-                        if re.match(regex, data):
-                            err = True
-                            break
-                if not err:
+                if not TURBO_ERROR_REGEX.search(data):
                     for name, regex in zip(names, matches):
                         self.addc(name, abscmd, cmd_opts, regex, tohertz)
                         self.required(name)
@@ -2635,12 +3091,7 @@ class TurboInfo(InfoGroup):
                     self.addc("TurboFrequencies", abscmd, cmd_opts, None, freqfunc)
     @staticmethod
     def getactivecores(indata):
-        freqs = []
-        for line in re.split(r"\n", indata):
-            mat = re.match(r"C(\d+)\s+([\d\.]+ MHz)", line)
-            if mat:
-                freqs.append(tohertz(mat.group(2)))
-        return freqs
+        return [tohertz(f) for f in TURBO_CORES_REGEX.findall(indata)]
 
 ################################################################################
 # Infos about the clock sources provided by the kernel
@@ -2654,7 +3105,7 @@ class ClocksourceInfoClass(InfoGroup):
         base = "/sys/devices/system/clocksource/clocksource{}".format(ident)
         self.addf("Current", pjoin(base, "current_clocksource"), r"(\s+)", str)
         if extended:
-            self.addf("Available", pjoin(base, "available_clocksource"), r"(.+)", tostrlist)
+            self.addf("Available", pjoin(base, "available_clocksource"), LINE_REGEX, tostrlist)
         self.required("Current")
 
 class ClocksourceInfo(PathMatchInfoGroup):
@@ -2679,18 +3130,24 @@ class ExecutableInfoExec(InfoGroup):
         self.executable = executable
 
         if executable is not None:
-            abscmd = which(self.executable)
+            abscmd = cached_which(self.executable)
             self.const("Name", str(self.executable))
             self.required("Name")
             if abscmd and len(abscmd) > 0:
                 self.const("Abspath", abscmd)
                 self.const("Size", psize(abscmd))
                 self.required("Size")
-                if which("readelf"):
+                if cached_which("readelf"):
+                    # Both keys use the same readelf call, so it is executed only once.
+                    # The debug info of large executables can be hundreds of MB but the
+                    # compiler flags are in the first compilation unit, so the output is
+                    # cut after READELF_MAX_BYTES.
+                    readelf_opts = "-p .comment -wi {} | head -c {}".format(abscmd,
+                                                                           READELF_MAX_BYTES)
                     comp_regex = r"\s*\[\s*\d+\]\s+(.+)"
-                    self.addc("CompiledWith", "readelf", "-p .comment {}".format(abscmd), comp_regex)
-                    flags_regex = r"^\s*\<c\>\s+DW_AT_producer\s+:\s+\(.*\):\s*(.*)$"
-                    self.addc("CompilerFlags", "readelf", "-wi {}".format(abscmd), flags_regex)
+                    self.addc("CompiledWith", "readelf", readelf_opts, comp_regex)
+                    self.addc("CompilerFlags", "readelf", readelf_opts,
+                              parse=ExecutableInfoExec.getcompilerflags)
                 if extended:
                     self.const("MD5sum", ExecutableInfoExec.getmd5sum(abscmd))
                     self.required("MD5sum")
@@ -2704,9 +3161,18 @@ class ExecutableInfoExec(InfoGroup):
                 hash_md5.update(chunk)
         return hash_md5.hexdigest()
 
+    @staticmethod
+    def getcompilerflags(value):
+        flags_regex = re.compile(r"^\s*<[0-9a-f]+>\s+DW_AT_producer\s+:\s+(?:\(.*\):\s*)?(.*)$")
+        for line in value.split("\n"):
+            mat = flags_regex.match(line)
+            if mat:
+                return mat.group(1)
+        return None
+
     @staticmethod
     def getcompiledwith(value):
-        for line in re.split(r"\n", value):
+        for line in value.split("\n"):
             if "CC" in line:
                 return line
         return "Not detectable"
@@ -2720,19 +3186,23 @@ class ExecutableInfo(MultiClassInfoGroup):
         self.executable = executable
         absexe = executable
         if executable is not None and not os.access(absexe, os.X_OK):
-            absexe = which(executable)
+            absexe = cached_which(executable)
         if absexe is not None:
             self.executable = absexe
-            ldd = which("ldd")
-            objd = which("objdump")
+            ldd = cached_which("ldd")
+            readelf = cached_which("readelf")
+            objd = cached_which("objdump")
             self.classlist = [ExecutableInfoExec]
             clsargs = {"executable" : self.executable}
             self.classargs = [clsargs for i in range(len(self.classlist))]
             if self.executable is not None:
                 if ldd is not None:
                     self.addc("LinkedLibraries", ldd, absexe, r"(.*)", ExecutableInfo.parseLdd)
-                if objd is not None:
-                    parser = ExecutableInfo.parseNeededLibs
+                parser = ExecutableInfo.parseNeededLibs
+                # 'readelf -d' reads only the dynamic section, 'objdump -p' all headers
+                if readelf is not None:
+                    self.addc("NeededLibraries", readelf, "-d {}".format(absexe), parse=parser)
+                elif objd is not None:
                     self.addc("NeededLibraries", objd, "-p {}".format(absexe), parse=parser)
     @staticmethod
     def parseLdd(lddinput):
@@ -2756,7 +3226,13 @@ class ExecutableInfo(MultiClassInfoGroup):
     def parseNeededLibs(data):
         libs = []
         for line in data.split("\n"):
-            m = re.match(r"^\s+NEEDED\s+(.*)$", line)
+            # objdump -p
+            m = OBJDUMP_NEEDED_REGEX.match(line)
+            if m:
+                libs.append(m.group(1))
+                continue
+            # readelf -d
+            m = READELF_NEEDED_REGEX.match(line)
             if m:
                 libs.append(m.group(1))
         return libs
@@ -2775,12 +3251,14 @@ class CoretempInfoHwmonClassX86(InfoGroup):
         self.sensor = sensor
         self.socket = socket
         self.hwmon = hwmon
-        self.addf("Input", pjoin(base, "temp{}_input".format(sensor)), r"(\d+)", int)
+        self.addf("Input", pjoin(base, "temp{}_input".format(sensor)), INT_REGEX, int,
+                  keep_open=True, throttle=True)
         self.required("Input")
         if extended:
-            self.addf("Critical", pjoin(base, "temp{}_crit".format(sensor)), r"(\d+)", int)
-            self.addf("Alarm", pjoin(base, "temp{}_crit_alarm".format(sensor)), r"(\d+)", int)
-            self.addf("Max", pjoin(base, "temp{}_max".format(sensor)), r"(\d+)", int)
+            # The thresholds are fixed by the hardware, so they are read only once
+            self.const("Critical", CoretempInfo.readthreshold(pjoin(base, "temp{}_crit".format(sensor))))
+            self.addf("Alarm", pjoin(base, "temp{}_crit_alarm".format(sensor)), INT_REGEX, int)
+            self.const("Max", CoretempInfo.readthreshold(pjoin(base, "temp{}_max".format(sensor))))
 
 class CoretempInfoHwmonX86(PathMatchInfoGroup):
     '''Class to spawn subclasses for one hwmon entry inside a X86 coretemps device'''
@@ -2792,6 +3270,12 @@ class CoretempInfoHwmonX86(PathMatchInfoGroup):
         self.subclass = CoretempInfoHwmonClassX86
         self.subargs = {"socket" : socket, "hwmon" : hwmon}
         base = "/sys/devices/platform/coretemp.{}".format(socket)
+        # The hwmon index might change at reboot, so use the name of the hwmon entry
+        # if no other hwmon entry of the device has the same name
+        hwmon_name = CoretempInfo.unique_name(pjoin(base, "hwmon"), hwmon)
+        if hwmon_name:
+            self.name = hwmon_name
+            self.legacy_name = "Hwmon{}".format(hwmon)
         self.searchpath = pjoin(base, "hwmon/hwmon{}/temp*_label".format(hwmon))
         self.match = r".*/temp(\d+)_label$"
 
@@ -2814,10 +3298,12 @@ class CoretempInfoHwmonClassARM(InfoGroup):
         self.sensor = sensor
         self.hwmon = hwmon
         base = "/sys/devices/virtual/hwmon/hwmon{}".format(hwmon)
-        self.addf("Input", pjoin(base, "temp{}_input".format(sensor)), r"(\d+)", int)
+        self.addf("Input", pjoin(base, "temp{}_input".format(sensor)), INT_REGEX, int,
+                  keep_open=True, throttle=True)
         self.required("Input")
         if extended:
-            self.addf("Critical", pjoin(base, "temp{}_crit".format(sensor)), r"(\d+)", int)
+            # The threshold is fixed by the hardware, so it is read only once
+            self.const("Critical", CoretempInfo.readthreshold(pjoin(base, "temp{}_crit".format(sensor))))
 
 class CoretempInfoSocketARM(PathMatchInfoGroup):
     '''Class to spawn subclasses for ARM coretemps for one hwmon entry'''
@@ -2825,6 +3311,12 @@ class CoretempInfoSocketARM(PathMatchInfoGroup):
         super(CoretempInfoSocketARM, self).__init__(
             name="Hwmon{}".format(hwmon), extended=extended, anonymous=anonymous)
         self.hwmon = hwmon
+        # The hwmon index might change at reboot, so use the name of the hwmon entry
+        # if no other hwmon entry has the same name
+        hwmon_name = CoretempInfo.unique_name("/sys/devices/virtual/hwmon", hwmon)
+        if hwmon_name:
+            self.name = hwmon_name
+            self.legacy_name = "Hwmon{}".format(hwmon)
         self.searchpath = "/sys/devices/virtual/hwmon/hwmon{}/temp*_input".format(hwmon)
         self.match = r".*/temp(\d+)_input$"
         self.subclass = CoretempInfoHwmonClassARM
@@ -2849,6 +3341,21 @@ class CoretempInfo(PathMatchInfoGroup):
             self.searchpath = "/sys/devices/virtual/hwmon/hwmon*"
             self.match = r".*/hwmon(\d+)$"
 
+    @staticmethod
+    def readthreshold(path):
+        '''Read a temperature threshold file or return None if missing'''
+        value = fread(path)
+        return int(value) if value and value.lstrip("-").isdigit() else None
+
+    @staticmethod
+    def unique_name(folder, hwmon):
+        '''Get the name of the hwmon entry in folder or None if the name is missing or
+        shared with other hwmon entries in folder'''
+        for name, hwmons in cached_hwmon_names(folder).items():
+            if hwmon in hwmons:
+                return name if len(hwmons) == 1 else None
+        return None
+
 
 ################################################################################
 # Infos about the BIOS
@@ -2881,15 +3388,17 @@ class ThermalZoneInfoClass(InfoGroup):
                                                    anonymous=anonymous)
         self.zone = zone
         base = "/sys/devices/virtual/thermal/thermal_zone{}".format(zone)
-        if pexists(pjoin(base, "device/description")):
-            with (open(pjoin(base, "device/description"), "rb")) as filefp:
-                self.name = filefp.read().decode(ENCODING).strip()
-        self.addf("Temperature", pjoin(base, "temp"), r"(\d+)", int)
+        # Most zones have no description, so try to read it instead of checking its existence
+        description = fread(pjoin(base, "device/description"))
+        if description:
+            self.name = description
+        self.addf("Temperature", pjoin(base, "temp"), INT_REGEX, int,
+                  keep_open=True, throttle=True)
         if extended:
-            self.addf("Policy", pjoin(base, "policy"), r"(.+)")
+            self.addf("Policy", pjoin(base, "policy"), LINE_REGEX)
             avpath = pjoin(base, "available_policies")
-            self.addf("AvailablePolicies", avpath, r"(.+)", tostrlist)
-            self.addf("Type", pjoin(base, "type"), r"(.+)")
+            self.addf("AvailablePolicies", avpath, LINE_REGEX, tostrlist)
+            self.addf("Type", pjoin(base, "type"), LINE_REGEX)
 
 class ThermalZoneInfo(PathMatchInfoGroup):
     '''Class to read information for thermal zones (/sys/devices/virtual/thermal/thermal_zone*)'''
@@ -2901,6 +3410,7 @@ class ThermalZoneInfo(PathMatchInfoGroup):
                                               match=r".*/thermal_zone(\d+)$",
                                               searchpath=spath,
                                               subclass=ThermalZoneInfoClass)
+        self.parallel_update = True
 
 ################################################################################
 # Infos about CPU vulnerabilities
@@ -2911,11 +3421,21 @@ class VulnerabilitiesInfo(InfoGroup):
         super(VulnerabilitiesInfo, self).__init__(extended=extended, anonymous=anonymous)
         self.name = "VulnerabilitiesInfo"
         base = "/sys/devices/system/cpu/vulnerabilities"
-        for vfile in glob(pjoin(base, "*")):
+        vfiles = []
+        if os.path.isdir(base):
+            with os.scandir(base) as entries:
+                vfiles = sorted(e.path for e in entries if e.is_file())
+        for vfile in vfiles:
             vkey = totitle(os.path.basename(vfile))
             self.addf(vkey, vfile)
             self.required(vkey)
 
+    def update(self):
+        '''Read all vulnerability files in a single loop. The files contain only the plain
+        string, so there is nothing to match or parse'''
+        for key, op in self._operations.items():
+            self._data[key] = fread(op.path) if isinstance(op, File) else None
+
 ################################################################################
 # Infos about logged in users (only count to avoid logging user names)
 ################################################################################
@@ -2929,7 +3449,7 @@ class UsersInfo(InfoGroup):
     def countusers(value):
         if not value or len(value) == 0:
             return 0
-        return len(list(set(re.split(r"[,\s]", value))))
+        return len({u for u in value.replace(",", " ").split()})
 
 ################################################################################
 # Infos from the dmidecode file (if DMIDECODE_FILE is available)
@@ -2963,15 +3483,17 @@ class CpuAffinity(InfoGroup):
         if "get_schedaffinity" in dir(os):
             self.const("Affinity", os.get_schedaffinity())
         elif DO_LIKWID and LIKWID_PATH and pexists(LIKWID_PATH):
-            abscmd = which("likwid-pin")
+            # The affinity is set at process start, so the command is called only once
+            abscmd = cached_which("likwid-pin")
             if abscmd and len(abscmd) > 0:
-                self.addc("Affinity", abscmd, "-c N -p 2>&1", r"(.*)", tointlist)
+                self.const("Affinity", process_cmd((abscmd, "-c N -p 2>&1", r"(.*)", tointlist)))
                 self.required("Affinity")
         else:
-            abscmd = which("taskset")
+            abscmd = cached_which("taskset")
             if abscmd and len(abscmd) > 0:
                 regex = r".*current affinity list: (.*)"
-                self.addc("Affinity", abscmd, "-c -p $$", regex, tointlist)
+                cmd_opts = "-c -p {}".format(os.getpid())
+                self.const("Affinity", process_cmd((abscmd, cmd_opts, regex, tointlist)))
                 self.required("Affinity")
 
 ################################################################################
@@ -2989,24 +3511,24 @@ class ModulesInfo(InfoGroup):
         parse = ModulesInfo.parsemodules
         cmd_opts = "sh -t list 2>&1"
         cmd = modulecmd
-        abspath = which(cmd)
+        abspath = cached_which(cmd)
         if modulecmd is not None and len(modulecmd) > 0:
             path = "{}".format(modulecmd)
             path_opts = "{}".format(cmd_opts)
             if " " in path:
                 tmplist = path.split(" ")
-                path = which(tmplist[0])
+                path = cached_which(tmplist[0])
                 path_opts = "{} {}".format(" ".join(tmplist[1:]), path_opts)
             else:
-                path = which(cmd)
+                path = cached_which(cmd)
             abscmd = path
             cmd_opts = path_opts
         if abscmd and len(abscmd) > 0:
             self.addc("Loaded", abscmd, cmd_opts, None, parse)
     @staticmethod
     def parsemodules(value):
-        slist = [ x for x in re.split("\n", value) if ";" not in x ]
-        if re.match("^Currently Loaded.+$", slist[0]):
+        slist = [ x for x in value.split("\n") if ";" not in x ]
+        if MODULES_HEADER_REGEX.match(slist[0]):
             slist = slist[1:]
         return slist
 
@@ -3016,12 +3538,14 @@ class ModulesInfo(InfoGroup):
 ################################################################################
 class IrqAffinityClass(InfoGroup):
     '''Class to read information about one interrupt affinity'''
-    def __init__(self, irq, extended=False, anonymous=False):
+    def __init__(self, irq, extended=False, anonymous=False, keep_open=False):
         super(IrqAffinityClass, self).__init__(name="irq{}".format(irq),
                                                extended=extended,
                                                anonymous=anonymous)
         self.irq = irq
-        self.addf("SMPAffinity", "/proc/irq/{}/smp_affinity".format(irq), parse=masktolist)
+        self.keep_open = keep_open
+        self.addf("SMPAffinity", "/proc/irq/{}/smp_affinity".format(irq), parse=masktolist,
+                  keep_open=keep_open)
 
 class IrqAffinity(PathMatchInfoGroup):
     '''Class to read information about one interrupt affinity'''
@@ -3033,6 +3557,12 @@ class IrqAffinity(PathMatchInfoGroup):
                                           match=r".*/(\d+)",
                                           subclass=IrqAffinityClass)
         self.addf("DefaultSMPAffinity", "/proc/irq/default_smp_affinity", parse=masktolist)
+        # Keep the files of all IRQs open between updates if they use only a small part
+        # of the allowed file descriptors
+        num_irqs = len(cached_glob(self.searchpath))
+        soft_limit, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft_limit == resource.RLIM_INFINITY or num_irqs <= soft_limit // 4:
+            self.subargs = {"keep_open" : True}
 
 
 ################################################################################
@@ -3040,15 +3570,41 @@ class IrqAffinity(PathMatchInfoGroup):
 ################################################################################
 class InfinibandInfoClassPort(InfoGroup):
     '''Class to read the information of a single port of an InfiniBand/OmniPath driver.'''
+    BASE = "/sys/class/infiniband"
+    KEYS = {"Rate" : "rate", "PhysState" : "phys_state", "LinkLayer" : "link_layer"}
     def __init__(self, port, extended=False, anonymous=False, driver=""):
         super(InfinibandInfoClassPort, self).__init__(
             name="Port{}".format(port), extended=extended, anonymous=anonymous)
         self.port = port
         self.driver = driver
-        ibpath = "/sys/class/infiniband/{}/ports/{}".format(driver, port)
-        self.addf("Rate", pjoin(ibpath, "rate"), r"(.+)")
-        self.addf("PhysState", pjoin(ibpath, "phys_state"), r"(.+)")
-        self.addf("LinkLayer", pjoin(ibpath, "link_layer"), r"(.+)")
+        self._ibpath = pjoin(InfinibandInfoClassPort.BASE, driver, "ports", str(port))
+        # Ports which are not active (like '1: DOWN') are not polled. Their values are
+        # read only once and only the state file is checked at each update.
+        self._state = None
+        if InfinibandInfoClassPort.active(fread(pjoin(self._ibpath, "state"))) is False:
+            for key, fname in InfinibandInfoClassPort.KEYS.items():
+                self.const(key, fread(pjoin(self._ibpath, fname)))
+            self._state = File(pjoin(self._ibpath, "state"))
+        else:
+            self._addports()
+
+    @staticmethod
+    def active(state):
+        '''Check whether a port state like '4: ACTIVE' is active, None if unknown'''
+        if state is None:
+            return None
+        return state.split(":")[-1].strip() == "ACTIVE"
+
+    def _addports(self):
+        for key, fname in InfinibandInfoClassPort.KEYS.items():
+            self.addf(key, pjoin(self._ibpath, fname), LINE_REGEX)
+
+    def update(self):
+        '''Poll the port values once the port became active'''
+        if self._state is not None and InfinibandInfoClassPort.active(self._state.update()):
+            self._state = None
+            self._addports()
+        super(InfinibandInfoClassPort, self).update()
 
 
 class InfinibandInfoClass(PathMatchInfoGroup):
@@ -3058,20 +3614,21 @@ class InfinibandInfoClass(PathMatchInfoGroup):
             name=driver, extended=extended, anonymous=anonymous)
         self.driver = driver
         ibpath = "/sys/class/infiniband/{}".format(driver)
-        self.addf("BoardId", pjoin(ibpath, "board_id"), r"(.+)")
-        self.addf("FirmwareVersion", pjoin(ibpath, "fw_ver"), r"([\d\.]+)")
+        self.addf("BoardId", pjoin(ibpath, "board_id"), LINE_REGEX)
+        self.addf("FirmwareVersion", pjoin(ibpath, "fw_ver"), FLOAT_REGEX)
         self.addf("HCAType", pjoin(ibpath, "hca_type"), r"([\w\d\.]+)")
         self.addf("HWRevision", pjoin(ibpath, "hw_rev"), r"([\w\d\.]+)")
-        self.addf("NodeType", pjoin(ibpath, "node_type"), r"(.+)")
+        self.addf("NodeType", pjoin(ibpath, "node_type"), LINE_REGEX)
 
         if not anonymous:
-            self.addf("NodeGUID", pjoin(ibpath, "node_guid"), r"(.+)")
-            self.addf("NodeDescription", pjoin(ibpath, "node_desc"), r"(.+)")
-            self.addf("SysImageGUID", pjoin(ibpath, "sys_image_guid"), r"(.+)")
+            self.addf("NodeGUID", pjoin(ibpath, "node_guid"), LINE_REGEX)
+            self.addf("NodeDescription", pjoin(ibpath, "node_desc"), LINE_REGEX)
+            self.addf("SysImageGUID", pjoin(ibpath, "sys_image_guid"), LINE_REGEX)
         self.searchpath = "/sys/class/infiniband/{}/ports/*".format(driver)
         self.match = r".*/(\d+)$"
         self.subclass = InfinibandInfoClassPort
         self.subargs = {"driver" : driver}
+        self.parallel_update = True
 
 class InfinibandInfo(PathMatchInfoGroup):
     '''Class to read InfiniBand/OmniPath (/sys/class/infiniband).'''
@@ -3082,10 +3639,111 @@ class InfinibandInfo(PathMatchInfoGroup):
             self.searchpath = "/sys/class/infiniband/*"
             self.match = r".*/(.*)$"
             self.subclass = InfinibandInfoClass
+            self.parallel_update = True
 
 ################################################################################
 # Infos from nvidia-smi (Nvidia GPUs)
 ################################################################################
+NVML_LIBRARY = "libnvidia-ml.so.1"
+# Keys only available in extended mode
+NVML_EXTENDED_KEYS = ["PciDevice", "PciLinkWidth", "GPUMaxOpTemp"]
+NVML_COMPUTE_MODES = {0 : "Default",
+                      1 : "Exclusive_Thread",
+                      2 : "Prohibited",
+                      3 : "Exclusive_Process"}
+
+class NvmlMemory(ctypes.Structure):
+    _fields_ = [("total", ctypes.c_ulonglong),
+                ("free", ctypes.c_ulonglong),
+                ("used", ctypes.c_ulonglong)]
+
+class NvmlPciInfo(ctypes.Structure):
+    _fields_ = [("busIdLegacy", ctypes.c_char * 16),
+                ("domain", ctypes.c_uint),
+                ("bus", ctypes.c_uint),
+                ("device", ctypes.c_uint),
+                ("pciDeviceId", ctypes.c_uint),
+                ("pciSubSystemId", ctypes.c_uint),
+                ("busId", ctypes.c_char * 32)]
+
+def nvml_init():
+    '''Load and initialize the NVIDIA management library. Returns the library handle for
+    nvml_query() or None if the library is not usable. Release it with nvml_shutdown().'''
+    try:
+        nvml = ctypes.CDLL(NVML_LIBRARY)
+    except OSError:
+        return None
+    try:
+        if nvml.nvmlInit_v2() != 0:
+            return None
+    except AttributeError:
+        return None
+    return nvml
+
+def nvml_shutdown(nvml):
+    '''Release a library handle returned by nvml_init()'''
+    if nvml is not None:
+        try:
+            nvml.nvmlShutdown()
+        except AttributeError:
+            pass
+
+def nvml_query(nvml):
+    '''Read the GPU information directly from the NVIDIA management library initialized
+    with nvml_init(). Returns the driver information and a list with the information of
+    each GPU using the same keys and formats as the nvidia-smi output or None if the
+    library is not usable. The memory sizes are the framebuffer (FB) memory.'''
+    if nvml is None:
+        return None
+    def string(func, *args, size=96):
+        buf = ctypes.create_string_buffer(size)
+        if func(*args, buf, ctypes.c_uint(size)) == 0:
+            return buf.value.decode(ENCODING)
+        return None
+    def uint(func, *args):
+        value = ctypes.c_uint(0)
+        if func(*args, ctypes.byref(value)) == 0:
+            return value.value
+        return None
+    try:
+        info = {"DriverVersion" : string(nvml.nvmlSystemGetDriverVersion, size=80)}
+        cuda = uint(nvml.nvmlSystemGetCudaDriverVersion)
+        info["CudaVersion"] = "{}.{}".format(cuda // 1000, (cuda % 1000) // 10) if cuda else None
+        devices = []
+        count = uint(nvml.nvmlDeviceGetCount_v2) or 0
+        for idx in range(count):
+            handle = ctypes.c_void_p()
+            if nvml.nvmlDeviceGetHandleByIndex_v2(ctypes.c_uint(idx), ctypes.byref(handle)) != 0:
+                return None
+            dev = {"ProductName" : string(nvml.nvmlDeviceGetName, handle),
+                   "VBiosVersion" : string(nvml.nvmlDeviceGetVbiosVersion, handle, size=32)}
+            mode = uint(nvml.nvmlDeviceGetComputeMode, handle)
+            dev["ComputeMode"] = NVML_COMPUTE_MODES.get(mode, None)
+            temp = uint(nvml.nvmlDeviceGetTemperature, handle, ctypes.c_int(0))
+            dev["GPUCurrentTemp"] = "{} C".format(temp) if temp is not None else None
+            mem = NvmlMemory()
+            if nvml.nvmlDeviceGetMemoryInfo(handle, ctypes.byref(mem)) == 0:
+                dev["MemTotal"] = "{} MiB".format(mem.total // (1024 * 1024))
+                dev["MemFree"] = "{} MiB".format(mem.free // (1024 * 1024))
+            else:
+                dev["MemTotal"] = dev["MemFree"] = None
+            pci = NvmlPciInfo()
+            if nvml.nvmlDeviceGetPciInfo_v3(handle, ctypes.byref(pci)) == 0:
+                dev["PciDevice"] = pci.busId.decode(ENCODING).split(".")[0]
+            else:
+                dev["PciDevice"] = None
+            width = uint(nvml.nvmlDeviceGetCurrPcieLinkWidth, handle)
+            dev["PciLinkWidth"] = "{}x".format(width) if width is not None else None
+            # NVML_TEMPERATURE_THRESHOLD_GPU_MAX
+            temp = uint(nvml.nvmlDeviceGetTemperatureThreshold, handle, ctypes.c_int(3))
+            dev["GPUMaxOpTemp"] = "{} C".format(temp) if temp is not None else None
+            devices.append(dev)
+        info["Devices"] = devices
+        return info
+    except AttributeError as e:
+        logging.debug("NVML function not available: %s", e)
+        return None
+
 class NvidiaSmiInfoClass(InfoGroup):
     '''Class to read information for one Nvidia GPU (uses the nvidia-smi command)'''
     def __init__(self, device, extended=False, anonymous=False, nvidia_path=""):
@@ -3094,20 +3752,24 @@ class NvidiaSmiInfoClass(InfoGroup):
                                                  anonymous=anonymous)
         self.device = device
         self.nvidia_path = nvidia_path
+        self.cmd = "nvidia-smi"
         cmd = pjoin(nvidia_path, "nvidia-smi")
-        if pexists(cmd):
+        if cached_exists(cmd):
             self.cmd = cmd
-        elif which("nvidia-smi"):
-            self.cmd = which("nvidia-smi")
+        elif cached_which("nvidia-smi"):
+            self.cmd = cached_which("nvidia-smi")
         self.cmd_opts = "-q -i {}".format(device)
-        abscmd = which(self.cmd)
+        abscmd = cached_which(self.cmd)
         matches = {"ProductName" : r"\s+Product Name\s+:\s+(.+)",
                    "VBiosVersion" : r"\s+VBIOS Version\s+:\s+(.+)",
                    "ComputeMode" : r"\s+Compute Mode\s+:\s+(.+)",
                    "GPUCurrentTemp" : r"\s+GPU Current Temp\s+:\s+(\d+\sC)",
-                   "MemTotal" : r"\s+Total\s+:\s+(\d+\sMiB)",
-                   "MemFree" : r"\s+Free\s+:\s+(\d+\sMiB)",
                   }
+        # The memory sizes are searched in the FB memory section like in nvml_query(),
+        # the BAR1 section has the same 'Total' and 'Free' lines
+        fbmatches = {"MemTotal" : NvidiaSmiInfoClass.getfbtotal,
+                     "MemFree" : NvidiaSmiInfoClass.getfbfree,
+                    }
         extmatches = {"PciDevice" : r"^GPU\s+([0-9a-fA-F:]+)",
                       "PciLinkWidth" : r"\s+Current\s+:\s+(\d+x)",
                       "GPUMaxOpTemp" : r"\s+GPU Max Operating Temp\s+:\s+(\d+\sC)",
@@ -3115,10 +3777,21 @@ class NvidiaSmiInfoClass(InfoGroup):
         if abscmd:
             for key, regex in matches.items():
                 self.addc(key, self.cmd, self.cmd_opts, regex)
+            for key, parse in fbmatches.items():
+                self.addc(key, self.cmd, self.cmd_opts, None, parse)
             if extended:
                 for key, regex in extmatches.items():
                     self.addc(key, self.cmd, self.cmd_opts, regex)
 
+    @staticmethod
+    def getfbtotal(value):
+        mat = NVSMI_FB_TOTAL_REGEX.search(value)
+        return mat.group(1) if mat else None
+    @staticmethod
+    def getfbfree(value):
+        mat = NVSMI_FB_FREE_REGEX.search(value)
+        return mat.group(1) if mat else None
+
 class NvidiaSmiInfo(ListInfoGroup):
     '''Class to spawn subclasses for each NVIDIA GPU device (uses the nvidia-smi command)'''
     def __init__(self, nvidia_path="", extended=False, anonymous=False):
@@ -3128,16 +3801,11 @@ class NvidiaSmiInfo(ListInfoGroup):
         self.nvidia_path = nvidia_path
         self.cmd = "nvidia-smi"
         cmd = pjoin(nvidia_path, "nvidia-smi")
-        if pexists(cmd):
+        if cached_exists(cmd):
             self.cmd = cmd
         self.cmd_opts = "-q"
-        abscmd = which(self.cmd)
-        if abscmd:
-            num_gpus = process_cmd((self.cmd, self.cmd_opts, r"Attached GPUs\s+:\s+(\d+)", int))
-            if num_gpus > 0:
-                self.userlist = [i for i in range(num_gpus)]
-                self.subclass = NvidiaSmiInfoClass
-                self.subargs = {"nvidia_path" : nvidia_path}
+        self._nvml = None
+        abscmd = cached_which(self.cmd)
         matches = {"DriverVersion" : r"Driver Version\s+:\s+([\d\.]+)",
                    "CudaVersion" : r"CUDA Version\s+:\s+([\d\.]+)",
                   }
@@ -3145,6 +3813,56 @@ class NvidiaSmiInfo(ListInfoGroup):
             for key, regex in matches.items():
                 self.addc(key, self.cmd, self.cmd_opts, regex)
 
+    def __del__(self):
+        nvml_shutdown(getattr(self, "_nvml", None))
+
+    def generate(self):
+        '''Initialize the NVIDIA management library once for all updates and count the
+        GPUs with it. Without the library, the GPUs are counted with nvidia-smi'''
+        nvml_shutdown(self._nvml)
+        self._nvml = nvml_init()
+        num_gpus = None
+        nvml = nvml_query(self._nvml)
+        if nvml is not None:
+            num_gpus = len(nvml["Devices"])
+        elif cached_which(self.cmd):
+            num_gpus = process_cmd((self.cmd, self.cmd_opts, r"Attached GPUs\s+:\s+(\d+)", int))
+        if num_gpus and num_gpus > 0:
+            self.userlist = list(range(num_gpus))
+            self.subclass = NvidiaSmiInfoClass
+            self.subargs = {"nvidia_path" : self.nvidia_path}
+        super(NvidiaSmiInfo, self).generate()
+
+    def update(self):
+        '''Read the GPU information through the NVIDIA management library if available.
+        Otherwise call 'nvidia-smi -q' only once and hand the section of each GPU to its
+        subclass instead of calling 'nvidia-smi -q -i <device>' for each GPU'''
+        nvml = nvml_query(self._nvml) if len(self._instances) > 0 else None
+        if nvml is not None and len(nvml["Devices"]) == len(self._instances):
+            for key in ["DriverVersion", "CudaVersion"]:
+                self._data[key] = nvml[key]
+            for inst, dev in zip(self._instances, nvml["Devices"]):
+                for key, value in dev.items():
+                    if inst.extended or key not in NVML_EXTENDED_KEYS:
+                        inst._data[key] = value
+            return
+        data = None
+        if len(self._instances) > 0:
+            data = process_cmd((self.cmd, self.cmd_opts))
+        sections = NvidiaSmiInfo.splitgpus(data) if data else []
+        if len(sections) != len(self._instances) or len(sections) == 0:
+            super(NvidiaSmiInfo, self).update()
+            return
+        self.update_from_output(data)
+        for inst, section in zip(self._instances, sections):
+            inst.update_from_output(section)
+
+    @staticmethod
+    def splitgpus(value):
+        '''Split the output of 'nvidia-smi -q' in the sections of the GPUs'''
+        parts = re.split(r"^(?=GPU\s+[0-9a-fA-F:\.]+\s*$)", value, flags=re.MULTILINE)
+        return [p.strip() for p in parts[1:] if p.strip()]
+
 
 ################################################################################
 # Infos from veosinfo (NEC Tsubasa)
@@ -3171,7 +3889,9 @@ class NecTsubasaInfoClass(InfoGroup):
         self.vecmd_path = vecmd_path
         vecmd = pjoin(vecmd_path, "vecmd")
         veargs = "-N {} info".format(device)
-        if pexists(vecmd):
+        self.cmd = vecmd
+        self.cmd_opts = veargs
+        if cached_exists(vecmd):
             self.addc("State", vecmd, veargs, r"VE State\s+:\s+(.+)", totitle)
             self.addc("Model", vecmd, veargs, r"VE Model\s+:\s+(\d+)")
             self.addc("ProductType", vecmd, veargs, r"Product Type\s+:\s+(\d+)")
@@ -3185,13 +3905,23 @@ class NecTsubasaInfoClass(InfoGroup):
             tempargs = {"device" : device, "vecmd_path" : vecmd_path}
             cls = NecTsubasaInfoTemps(ve_temps, extended=extended, anonymous=anonymous, **tempargs)
             self._instances.append(cls)
+
+    def update(self):
+        '''Call 'vecmd -N <device> info' only once for the device and its temperatures'''
+        data = None
+        if len(self._operations) > 0:
+            data = process_cmd((self.cmd, self.cmd_opts))
+        self.update_from_output(data)
+        for inst in self._instances:
+            inst.update_from_output(data)
+
     @staticmethod
     def gettempkeys(value):
         keys = []
-        for line in re.split("\n", value):
-            if re.match(r"(.+):\s+[\d\.]+\sC$", line):
-                key = re.match(r"(.+):\s+[\d\.]+\sC$", line).group(1).strip()
-                keys.append(key)
+        for line in value.split("\n"):
+            mat = VECMD_TEMP_REGEX.match(line)
+            if mat:
+                keys.append(mat.group(1).strip())
         return keys
 
 
@@ -3203,197 +3933,334 @@ class NecTsubasaInfo(ListInfoGroup):
                                              anonymous=anonymous)
         self.vecmd_path = vecmd_path
         vecmd = pjoin(vecmd_path, "vecmd")
-        if not pexists(vecmd):
-            vecmd = which("vecmd")
+        if not cached_exists(vecmd):
+            vecmd = cached_which("vecmd")
             if vecmd is not None:
                 vecmd_path = os.path.dirname(vecmd)
         if vecmd and len(vecmd) > 0:
             num_ves = process_cmd((vecmd, "info", r"Attached VEs\s+:\s+(\d+)", int))
             if num_ves > 0:
-                self.userlist = [i for i in range(num_ves)]
+                self.userlist = list(range(num_ves))
                 self.subclass = NecTsubasaInfoClass
                 self.subargs = {"vecmd_path" : vecmd_path}
 
 ################################################################################
 # Infos from clinfo (OpenCL devices and runtime)
 ################################################################################
+def clinfo_command(clinfo_path):
+    '''Returns the path of the clinfo command in clinfo_path or in $PATH. The lookups are
+    cached, so all OpenCL classes can call it'''
+    clcmd = pjoin(clinfo_path, "clinfo")
+    if not cached_exists(clcmd):
+        clcmd = cached_which("clinfo")
+    return clcmd
+
+def clstrlist(value):
+    '''Parse a list of strings in the clinfo output'''
+    return tostrlist(value.strip())
+
 class OpenCLInfoPlatformDeviceClass(InfoGroup):
     '''Class to read information for one OpenCL device in one platform(uses the clinfo command)'''
+    # Keys, clinfo properties, value regexes and parsers for all device properties in the
+    # output of clinfo. They are created once for all devices instead of in each constructor call
+    FIELDS = (
+              ("ImagePitchAlignment", "CL_DEVICE_IMAGE_PITCH_ALIGNMENT", r"(\d+)", int),
+              ("Vendor", "CL_DEVICE_VENDOR", r"(.+)", str),
+              ("DriverVersion", "CL_DRIVER_VERSION", r"(.+)", str),
+              ("VendorId", "CL_DEVICE_VENDOR_ID", r"(.+)", str),
+              ("OpenCLVersion", "CL_DEVICE_OPENCL_C_VERSION", r"(.+)", str),
+              ("Type", "CL_DEVICE_TYPE", r"(.+)", str),
+              ("MaxComputeUnits", "CL_DEVICE_MAX_COMPUTE_UNITS", r"(\d+)", int),
+              ("MaxClockFrequency", "CL_DEVICE_MAX_CLOCK_FREQUENCY", r"(\d+)", int),
+              ("DeviceAvailable", "CL_DEVICE_AVAILABLE", r"(.+)", str),
+              ("CompilerAvailable", "CL_DEVICE_COMPILER_AVAILABLE", r"(.+)", str),
+              ("LinkerAvailable", "CL_DEVICE_LINKER_AVAILABLE", r"(.+)", str),
+              ("Profile", "CL_DEVICE_PROFILE", r"(.+)", str),
+              ("PartitionMaxSubDevices", "CL_DEVICE_PARTITION_MAX_SUB_DEVICES", r"(\d+)", int),
+              ("PartitionProperties", "CL_DEVICE_PARTITION_PROPERTIES", r"(.+)", clstrlist),
+              ("PartitionAffinityDomain", "CL_DEVICE_PARTITION_AFFINITY_DOMAIN", r"(.+)", str),
+              ("MaxWorkItemDims", "CL_DEVICE_MAX_WORK_ITEM_DIMENSIONS", r"(\d+)", int),
+              ("MaxWorkItemSizes", "CL_DEVICE_MAX_WORK_ITEM_SIZES", r"(.+)", tointlist),
+              ("MaxWorkGroupSize", "CL_DEVICE_MAX_WORK_GROUP_SIZE", r"(\d+)", int),
+              ("PreferredWorkGroupSizeMultiple", "CL_KERNEL_PREFERRED_WORK_GROUP_SIZE_MULTIPLE", r"(\d+)", int),
+              ("MaxNumSubGroups", "CL_DEVICE_MAX_NUM_SUB_GROUPS", r"(\d+)", int),
+              ("SubGroupSizesIntel", "CL_DEVICE_SUB_GROUP_SIZES_INTEL", r"([\d\s]+)", tointlist),
+              ("PreferredVectorWidthChar", "CL_DEVICE_PREFERRED_VECTOR_WIDTH_CHAR", r"(\d+)", int),
+              ("NativeVectorWidthChar", "CL_DEVICE_NATIVE_VECTOR_WIDTH_CHAR", r"(\d+)", int),
+              ("PreferredVectorWidthShort", "CL_DEVICE_PREFERRED_VECTOR_WIDTH_SHORT", r"(\d+)", int),
+              ("NativeVectorWidthShort", "CL_DEVICE_NATIVE_VECTOR_WIDTH_SHORT", r"(\d+)", int),
+              ("PreferredVectorWidthInt", "CL_DEVICE_PREFERRED_VECTOR_WIDTH_INT", r"(\d+)", int),
+              ("NativeVectorWidthInt", "CL_DEVICE_NATIVE_VECTOR_WIDTH_INT", r"(\d+)", int),
+              ("PreferredVectorWidthLong", "CL_DEVICE_PREFERRED_VECTOR_WIDTH_LONG", r"(\d+)", int),
+              ("NativeVectorWidthLong", "CL_DEVICE_NATIVE_VECTOR_WIDTH_LONG", r"(\d+)", int),
+              ("PreferredVectorWidthFloat", "CL_DEVICE_PREFERRED_VECTOR_WIDTH_FLOAT", r"(\d+)", int),
+              ("NativeVectorWidthFloat", "CL_DEVICE_NATIVE_VECTOR_WIDTH_FLOAT", r"(\d+)", int),
+              ("PreferredVectorWidthDouble", "CL_DEVICE_PREFERRED_VECTOR_WIDTH_DOUBLE", r"(\d+)", int),
+              ("NativeVectorWidthDouble", "CL_DEVICE_NATIVE_VECTOR_WIDTH_DOUBLE", r"(\d+)", int),
+              ("PreferredVectorWidthHalf", "CL_DEVICE_PREFERRED_VECTOR_WIDTH_HALF", r"(\d+)", int),
+              ("NativeVectorWidthHalf", "CL_DEVICE_NATIVE_VECTOR_WIDTH_HALF", r"(\d+)", int),
+              ("HalfFpConfig", "CL_DEVICE_HALF_FP_CONFIG", r"(.+)", clstrlist),
+              ("SingleFpConfig", "CL_DEVICE_SINGLE_FP_CONFIG", r"(.+)", clstrlist),
+              ("DoubleFpConfig", "CL_DEVICE_DOUBLE_FP_CONFIG", r"(.+)", clstrlist),
+              ("AddressBits", "CL_DEVICE_ADDRESS_BITS", r"(\d+)", int),
+              ("EndianLittle", "CL_DEVICE_ENDIAN_LITTLE", r"(.+)", str),
+              ("GlobalMemSize", "CL_DEVICE_GLOBAL_MEM_SIZE", r"(\d+)", int),
+              ("MaxMemAllocSize", "CL_DEVICE_MAX_MEM_ALLOC_SIZE", r"(\d+)", int),
+              ("ErrorCorrection", "CL_DEVICE_ERROR_CORRECTION_SUPPORT", r"(.+)", str),
+              ("HostUnifiedMemory", "CL_DEVICE_HOST_UNIFIED_MEMORY", r"(.+)", str),
+              ("SvmCapabilities", "CL_DEVICE_SVM_CAPABILITIES", r"(.+)", str),
+              ("MinDataTypeAlignSize", "CL_DEVICE_MIN_DATA_TYPE_ALIGN_SIZE", r"(\d+)", int),
+              ("MemBaseAddrAlign", "CL_DEVICE_MEM_BASE_ADDR_ALIGN", r"(\d+)", int),
+              ("PreferredPlatformAtomicAlign", "CL_DEVICE_PREFERRED_PLATFORM_ATOMIC_ALIGNMENT", r"(\d+)", int),
+              ("PreferredGlobalAtomicAlign", "CL_DEVICE_PREFERRED_GLOBAL_ATOMIC_ALIGNMENT", r"(\d+)", int),
+              ("PreferredLocalAtomicAlign", "CL_DEVICE_PREFERRED_LOCAL_ATOMIC_ALIGNMENT", r"(\d+)", int),
+              ("MaxGlobalVariableSize", "CL_DEVICE_MAX_GLOBAL_VARIABLE_SIZE", r"(\d+)", int),
+              ("GlobalVariablePreferredTotalSize", "CL_DEVICE_GLOBAL_VARIABLE_PREFERRED_TOTAL_SIZE", r"(\d+)", int),
+              ("GlobalMemCacheType", "CL_DEVICE_GLOBAL_MEM_CACHE_TYPE", r"(.+)", str),
+              ("GlobalMemCacheSize", "CL_DEVICE_GLOBAL_MEM_CACHE_SIZE", r"(\d+)", int),
+              ("GlobalMemCachelineSize", "CL_DEVICE_GLOBAL_MEM_CACHELINE_SIZE", r"(\d+)", int),
+              ("ImageSupport", "CL_DEVICE_IMAGE_SUPPORT", r"(.+)", str),
+              ("MaxSamplers", "CL_DEVICE_MAX_SAMPLERS", r"(\d+)", int),
+              ("ImageMaxBufferSize", "CL_DEVICE_IMAGE_MAX_BUFFER_SIZE", r"(\d+)", int),
+              ("ImageMaxArraySize", "CL_DEVICE_IMAGE_MAX_ARRAY_SIZE", r"(\d+)", int),
+              ("ImageBaseAddressAlign", "CL_DEVICE_IMAGE_BASE_ADDRESS_ALIGNMENT", r"(\d+)", int),
+              ("ImagePitchAlign", "CL_DEVICE_IMAGE_PITCH_ALIGNMENT", r"(\d+)", int),
+              ("Image2dMaxHeight", "CL_DEVICE_IMAGE2D_MAX_HEIGHT", r"(\d+)", int),
+              ("Image2dMaxWidth", "CL_DEVICE_IMAGE2D_MAX_WIDTH", r"(\d+)", int),
+              ("PlanarYuvMaxHeightIntel", "CL_DEVICE_PLANAR_YUV_MAX_HEIGHT_INTEL", r"(\d+)", int),
+              ("PlanarYuvMaxWidthIntel", "CL_DEVICE_PLANAR_YUV_MAX_WIDTH_INTEL", r"(\d+)", int),
+              ("Image3dMaxHeight", "CL_DEVICE_IMAGE3D_MAX_HEIGHT", r"(\d+)", int),
+              ("Image3dMaxWidth", "CL_DEVICE_IMAGE3D_MAX_WIDTH", r"(\d+)", int),
+              ("Image3dMaxDepth", "CL_DEVICE_IMAGE3D_MAX_DEPTH", r"(\d+)", int),
+              ("MaxReadImageArgs", "CL_DEVICE_MAX_READ_IMAGE_ARGS", r"(\d+)", int),
+              ("MaxWriteImageArgs", "CL_DEVICE_MAX_WRITE_IMAGE_ARGS", r"(\d+)", int),
+              ("MaxReadWriteImageArgs", "CL_DEVICE_MAX_READ_WRITE_IMAGE_ARGS", r"(\d+)", int),
+              ("MaxPipeArgs", "CL_DEVICE_MAX_PIPE_ARGS", r"(\d+)", int),
+              ("PipeMaxActiveReservations", "CL_DEVICE_PIPE_MAX_ACTIVE_RESERVATIONS", r"(\d+)", int),
+              ("PipeMaxPacketSize", "CL_DEVICE_PIPE_MAX_PACKET_SIZE", r"(\d+)", int),
+              ("LocalMemType", "CL_DEVICE_LOCAL_MEM_TYPE", r"(.+)", str),
+              ("MaxConstantArgs", "CL_DEVICE_MAX_CONSTANT_ARGS", r"(\d+)", int),
+              ("MaxConstantBufferSize", "CL_DEVICE_MAX_CONSTANT_BUFFER_SIZE", r"(\d+)", int),
+              ("MaxParameterSize", "CL_DEVICE_MAX_PARAMETER_SIZE", r"(\d+)", int),
+              ("QueueOnHostProperties", "CL_DEVICE_QUEUE_ON_HOST_PROPERTIES", r"(.+)", clstrlist),
+              ("QueueOnDeviceProperties", "CL_DEVICE_QUEUE_ON_DEVICE_PROPERTIES", r"(.+)", clstrlist),
+              ("QueueOnDevicePreferredSize", "CL_DEVICE_QUEUE_ON_DEVICE_PREFERRED_SIZE", r"(\d+)", int),
+              ("QueueOnDeviceMaxSize", "CL_DEVICE_QUEUE_ON_DEVICE_MAX_SIZE", r"(\d+)", int),
+              ("MaxOnDeviceQueues", "CL_DEVICE_MAX_ON_DEVICE_QUEUES", r"(\d+)", int),
+              ("MaxOnDeviceEvents", "CL_DEVICE_MAX_ON_DEVICE_EVENTS", r"(\d+)", int),
+              ("PreferredInteropUserSync", "CL_DEVICE_PREFERRED_INTEROP_USER_SYNC", r"(.+)", str),
+              ("ProfilingTimerResolution", "CL_DEVICE_PROFILING_TIMER_RESOLUTION", r"(\d+)", int),
+              ("ExecutionCapabilities", "CL_DEVICE_EXECUTION_CAPABILITIES", r"(.+)", clstrlist),
+              ("SubGroupIndependentForwardProgress", "CL_DEVICE_SUB_GROUP_INDEPENDENT_FORWARD_PROGRESS", r"(.+)", str),
+              ("IlVersion", "CL_DEVICE_IL_VERSION", r"(.+)", str),
+              ("SpirVersions", "CL_DEVICE_SPIR_VERSIONS", r"(.+)", str),
+              ("PrintfBufferSize", "CL_DEVICE_PRINTF_BUFFER_SIZE", r"(\d+)", int),
+              ("BuiltInKernels", "CL_DEVICE_BUILT_IN_KERNELS", r"(.+)", clstrlist),
+              ("MeVersionIntel", "CL_DEVICE_ME_VERSION_INTEL", r"(\d+)", int),
+              ("AvcMeVersionIntel", "CL_DEVICE_AVC_ME_VERSION_INTEL", r"(\d+)", int),
+              ("AvcMeSupportsTextureSamplerUseIntel", "CL_DEVICE_AVC_ME_SUPPORTS_TEXTURE_SAMPLER_USE_INTEL", r"(.+)", str),
+              ("AvcMeSupportsPreemptionIntel", "CL_DEVICE_AVC_ME_SUPPORTS_PREEMPTION_INTEL", r"(.+)", str),
+              ("DeviceExtensions", "CL_DEVICE_EXTENSIONS", r"(.+)", clstrlist),
+             )
+    # The compiled regex for each key like r"CL_DEVICE_VENDOR\s+(.+)" for 'Vendor'
+    REGEXES = {key : re.compile(r"{}\s+{}".format(prop, value)) for key, prop, value, _ in FIELDS}
+    # Key, clinfo property, compiled regex and parser of each field for update_from_output()
+    MATCHERS = tuple((key, prop, regex, parse) for (key, prop, _, parse), regex in zip(FIELDS, REGEXES.values()))
+
     def __init__(self, device, suffix, extended=False, anonymous=False, clinfo_path=""):
         super(OpenCLInfoPlatformDeviceClass, self).__init__(extended=extended, anonymous=anonymous)
         self.device = device
         self.suffix = suffix
         self.clinfo_path = clinfo_path
-        clcmd = pjoin(clinfo_path, "clinfo")
-        if not pexists(clcmd):
-            clcmd = which("clinfo")
+        clcmd = clinfo_command(clinfo_path)
+        self.cmd = clcmd
+        self.cmd_opts = CLINFO_OPTS
         if clcmd and len(clcmd) > 0:
-            cmdopts = "--raw --offline | grep '[{}/{}]'".format(self.suffix, self.device)
-            self.name = process_cmd((clcmd, cmdopts, r"CL_DEVICE_NAME\s+(.+)", str))
+            cmdopts = self.cmd_opts
+            data = OpenCLInfoPlatformDeviceClass.devicelines(cached_cmd(clcmd, CLINFO_OPTS), suffix, device)
+            self.name = str(match_data(data, r"CL_DEVICE_NAME\s+(.+)")) if data else "None"
             self.const("Name", self.name)
-            self.addc("ImagePitchAlignment", clcmd, cmdopts, r"CL_DEVICE_IMAGE_PITCH_ALIGNMENT\s+(\d+)", int)
-            self.addc("Vendor", clcmd, cmdopts, r"CL_DEVICE_VENDOR\s+(.+)", str)
-            self.addc("DriverVersion", clcmd, cmdopts, r"CL_DRIVER_VERSION\s+(.+)", str)
-            self.addc("VendorId", clcmd, cmdopts, r"CL_DEVICE_VENDOR_ID\s+(.+)", str)
-            self.addc("OpenCLVersion", clcmd, cmdopts, r"CL_DEVICE_OPENCL_C_VERSION\s+(.+)", str)
-            self.addc("Type", clcmd, cmdopts, r"CL_DEVICE_TYPE\s+(.+)", str)
-            self.addc("MaxComputeUnits", clcmd, cmdopts, r"CL_DEVICE_MAX_COMPUTE_UNITS\s+(\d+)", int)
-            self.addc("MaxClockFrequency", clcmd, cmdopts, r"CL_DEVICE_MAX_CLOCK_FREQUENCY\s+(\d+)", int)
-            self.addc("DeviceAvailable", clcmd, cmdopts, r"CL_DEVICE_AVAILABLE\s+(.+)", str)
-            self.addc("CompilerAvailable", clcmd, cmdopts, r"CL_DEVICE_COMPILER_AVAILABLE\s+(.+)", str)
-            self.addc("LinkerAvailable", clcmd, cmdopts, r"CL_DEVICE_LINKER_AVAILABLE\s+(.+)", str)
-            self.addc("Profile", clcmd, cmdopts, r"CL_DEVICE_PROFILE\s+(.+)", str)
-            self.addc("PartitionMaxSubDevices", clcmd, cmdopts, r"CL_DEVICE_PARTITION_MAX_SUB_DEVICES\s+(\d+)", int)
-            self.addc("PartitionProperties", clcmd, cmdopts, r"CL_DEVICE_PARTITION_PROPERTIES\s+(.+)", lambda x: tostrlist(x.strip()))
-            self.addc("PartitionAffinityDomain", clcmd, cmdopts, r"CL_DEVICE_PARTITION_AFFINITY_DOMAIN\s+(.+)", str)
-            self.addc("MaxWorkItemDims", clcmd, cmdopts, r"CL_DEVICE_MAX_WORK_ITEM_DIMENSIONS\s+(\d+)", int)
-            self.addc("MaxWorkItemSizes", clcmd, cmdopts, r"CL_DEVICE_MAX_WORK_ITEM_SIZES\s+(.+)", tointlist)
-            self.addc("MaxWorkGroupSize", clcmd, cmdopts, r"CL_DEVICE_MAX_WORK_GROUP_SIZE\s+(\d+)", int)
-            self.addc("PreferredWorkGroupSizeMultiple", clcmd, cmdopts, r"CL_KERNEL_PREFERRED_WORK_GROUP_SIZE_MULTIPLE\s+(\d+)", int)
-            self.addc("MaxNumSubGroups", clcmd, cmdopts, r"CL_DEVICE_MAX_NUM_SUB_GROUPS\s+(\d+)", int)
-            self.addc("SubGroupSizesIntel", clcmd, cmdopts, r"CL_DEVICE_SUB_GROUP_SIZES_INTEL\s+([\d\s]+)", tointlist)
-            self.addc("PreferredVectorWidthChar", clcmd, cmdopts, r"CL_DEVICE_PREFERRED_VECTOR_WIDTH_CHAR\s+(\d+)", int)
-            self.addc("NativeVectorWidthChar", clcmd, cmdopts, r"CL_DEVICE_NATIVE_VECTOR_WIDTH_CHAR\s+(\d+)", int)
-            self.addc("PreferredVectorWidthShort", clcmd, cmdopts, r"CL_DEVICE_PREFERRED_VECTOR_WIDTH_SHORT\s+(\d+)", int)
-            self.addc("NativeVectorWidthShort", clcmd, cmdopts, r"CL_DEVICE_NATIVE_VECTOR_WIDTH_SHORT\s+(\d+)", int)
-            self.addc("PreferredVectorWidthInt", clcmd, cmdopts, r"CL_DEVICE_PREFERRED_VECTOR_WIDTH_INT\s+(\d+)", int)
-            self.addc("NativeVectorWidthInt", clcmd, cmdopts, r"CL_DEVICE_NATIVE_VECTOR_WIDTH_INT\s+(\d+)", int)
-            self.addc("PreferredVectorWidthLong", clcmd, cmdopts, r"CL_DEVICE_PREFERRED_VECTOR_WIDTH_LONG\s+(\d+)", int)
-            self.addc("NativeVectorWidthLong", clcmd, cmdopts, r"CL_DEVICE_NATIVE_VECTOR_WIDTH_LONG\s+(\d+)", int)
-            self.addc("PreferredVectorWidthFloat", clcmd, cmdopts, r"CL_DEVICE_PREFERRED_VECTOR_WIDTH_FLOAT\s+(\d+)", int)
-            self.addc("NativeVectorWidthFloat", clcmd, cmdopts, r"CL_DEVICE_NATIVE_VECTOR_WIDTH_FLOAT\s+(\d+)", int)
-            self.addc("PreferredVectorWidthDouble", clcmd, cmdopts, r"CL_DEVICE_PREFERRED_VECTOR_WIDTH_DOUBLE\s+(\d+)", int)
-            self.addc("NativeVectorWidthDouble", clcmd, cmdopts, r"CL_DEVICE_NATIVE_VECTOR_WIDTH_DOUBLE\s+(\d+)", int)
-            self.addc("PreferredVectorWidthHalf", clcmd, cmdopts, r"CL_DEVICE_PREFERRED_VECTOR_WIDTH_HALF\s+(\d+)", int)
-            self.addc("NativeVectorWidthHalf", clcmd, cmdopts, r"CL_DEVICE_NATIVE_VECTOR_WIDTH_HALF\s+(\d+)", int)
-            self.addc("HalfFpConfig", clcmd, cmdopts, r"CL_DEVICE_HALF_FP_CONFIG\s+(.+)", lambda x: tostrlist(x.strip()))
-            self.addc("SingleFpConfig", clcmd, cmdopts, r"CL_DEVICE_SINGLE_FP_CONFIG\s+(.+)", lambda x: tostrlist(x.strip()))
-            self.addc("DoubleFpConfig", clcmd, cmdopts, r"CL_DEVICE_DOUBLE_FP_CONFIG\s+(.+)", lambda x: tostrlist(x.strip()))
-            self.addc("AddressBits", clcmd, cmdopts, r"CL_DEVICE_ADDRESS_BITS\s+(\d+)", int)
-            self.addc("EndianLittle", clcmd, cmdopts, r"CL_DEVICE_ENDIAN_LITTLE\s+(.+)", str)
-            self.addc("GlobalMemSize", clcmd, cmdopts, r"CL_DEVICE_GLOBAL_MEM_SIZE\s+(\d+)", int)
-            self.addc("MaxMemAllocSize", clcmd, cmdopts, r"CL_DEVICE_MAX_MEM_ALLOC_SIZE\s+(\d+)", int)
-            self.addc("ErrorCorrection", clcmd, cmdopts, r"CL_DEVICE_ERROR_CORRECTION_SUPPORT\s+(.+)", str)
-            self.addc("HostUnifiedMemory", clcmd, cmdopts, r"CL_DEVICE_HOST_UNIFIED_MEMORY\s+(.+)", str)
-            self.addc("SvmCapabilities", clcmd, cmdopts, r"CL_DEVICE_SVM_CAPABILITIES\s+(.+)", str)
-            self.addc("MinDataTypeAlignSize", clcmd, cmdopts, r"CL_DEVICE_MIN_DATA_TYPE_ALIGN_SIZE\s+(\d+)", int)
-            self.addc("MemBaseAddrAlign", clcmd, cmdopts, r"CL_DEVICE_MEM_BASE_ADDR_ALIGN\s+(\d+)", int)
-            self.addc("PreferredPlatformAtomicAlign", clcmd, cmdopts, r"CL_DEVICE_PREFERRED_PLATFORM_ATOMIC_ALIGNMENT\s+(\d+)", int)
-            self.addc("PreferredGlobalAtomicAlign", clcmd, cmdopts, r"CL_DEVICE_PREFERRED_GLOBAL_ATOMIC_ALIGNMENT\s+(\d+)", int)
-            self.addc("PreferredLocalAtomicAlign", clcmd, cmdopts, r"CL_DEVICE_PREFERRED_LOCAL_ATOMIC_ALIGNMENT\s+(\d+)", int)
-            self.addc("MaxGlobalVariableSize", clcmd, cmdopts, r"CL_DEVICE_MAX_GLOBAL_VARIABLE_SIZE\s+(\d+)", int)
-            self.addc("GlobalVariablePreferredTotalSize", clcmd, cmdopts, r"CL_DEVICE_GLOBAL_VARIABLE_PREFERRED_TOTAL_SIZE\s+(\d+)", int)
-            self.addc("GlobalMemCacheType", clcmd, cmdopts, r"CL_DEVICE_GLOBAL_MEM_CACHE_TYPE\s+(.+)", str)
-            self.addc("GlobalMemCacheSize", clcmd, cmdopts, r"CL_DEVICE_GLOBAL_MEM_CACHE_SIZE\s+(\d+)", int)
-            self.addc("GlobalMemCachelineSize", clcmd, cmdopts, r"CL_DEVICE_GLOBAL_MEM_CACHELINE_SIZE\s+(\d+)", int)
-            self.addc("ImageSupport", clcmd, cmdopts, r"CL_DEVICE_IMAGE_SUPPORT\s+(.+)", str)
-            self.addc("MaxSamplers", clcmd, cmdopts, r"CL_DEVICE_MAX_SAMPLERS\s+(\d+)", int)
-            self.addc("ImageMaxBufferSize", clcmd, cmdopts, r"CL_DEVICE_IMAGE_MAX_BUFFER_SIZE\s+(\d+)", int)
-            self.addc("ImageMaxArraySize", clcmd, cmdopts, r"CL_DEVICE_IMAGE_MAX_ARRAY_SIZE\s+(\d+)", int)
-            self.addc("ImageBaseAddressAlign", clcmd, cmdopts, r"CL_DEVICE_IMAGE_BASE_ADDRESS_ALIGNMENT\s+(\d+)", int)
-            self.addc("ImagePitchAlign", clcmd, cmdopts, r"CL_DEVICE_IMAGE_PITCH_ALIGNMENT\s+(\d+)", int)
-            self.addc("Image2dMaxHeight", clcmd, cmdopts, r"CL_DEVICE_IMAGE2D_MAX_HEIGHT\s+(\d+)", int)
-            self.addc("Image2dMaxWidth", clcmd, cmdopts, r"CL_DEVICE_IMAGE2D_MAX_WIDTH\s+(\d+)", int)
-            self.addc("PlanarYuvMaxHeightIntel", clcmd, cmdopts, r"CL_DEVICE_PLANAR_YUV_MAX_HEIGHT_INTEL\s+(\d+)", int)
-            self.addc("PlanarYuvMaxWidthIntel", clcmd, cmdopts, r"CL_DEVICE_PLANAR_YUV_MAX_WIDTH_INTEL\s+(\d+)", int)
-            self.addc("Image3dMaxHeight", clcmd, cmdopts, r"CL_DEVICE_IMAGE3D_MAX_HEIGHT\s+(\d+)", int)
-            self.addc("Image3dMaxWidth", clcmd, cmdopts, r"CL_DEVICE_IMAGE3D_MAX_WIDTH\s+(\d+)", int)
-            self.addc("Image3dMaxDepth", clcmd, cmdopts, r"CL_DEVICE_IMAGE3D_MAX_DEPTH\s+(\d+)", int)
-            self.addc("MaxReadImageArgs", clcmd, cmdopts, r"CL_DEVICE_MAX_READ_IMAGE_ARGS\s+(\d+)", int)
-            self.addc("MaxWriteImageArgs", clcmd, cmdopts, r"CL_DEVICE_MAX_WRITE_IMAGE_ARGS\s+(\d+)", int)
-            self.addc("MaxReadWriteImageArgs", clcmd, cmdopts, r"CL_DEVICE_MAX_READ_WRITE_IMAGE_ARGS\s+(\d+)", int)
-            self.addc("MaxPipeArgs", clcmd, cmdopts, r"CL_DEVICE_MAX_PIPE_ARGS\s+(\d+)", int)
-            self.addc("PipeMaxActiveReservations", clcmd, cmdopts, r"CL_DEVICE_PIPE_MAX_ACTIVE_RESERVATIONS\s+(\d+)", int)
-            self.addc("PipeMaxPacketSize", clcmd, cmdopts, r"CL_DEVICE_PIPE_MAX_PACKET_SIZE\s+(\d+)", int)
-            self.addc("LocalMemType", clcmd, cmdopts, r"CL_DEVICE_LOCAL_MEM_TYPE\s+(.+)", str)
-            self.addc("MaxConstantArgs", clcmd, cmdopts, r"CL_DEVICE_MAX_CONSTANT_ARGS\s+(\d+)", int)
-            self.addc("MaxConstantBufferSize", clcmd, cmdopts, r"CL_DEVICE_MAX_CONSTANT_BUFFER_SIZE\s+(\d+)", int)
-            self.addc("MaxParameterSize", clcmd, cmdopts, r"CL_DEVICE_MAX_PARAMETER_SIZE\s+(\d+)", int)
-            self.addc("QueueOnHostProperties", clcmd, cmdopts, r"CL_DEVICE_QUEUE_ON_HOST_PROPERTIES\s+(.+)", lambda x: tostrlist(x.strip()))
-            self.addc("QueueOnDeviceProperties", clcmd, cmdopts, r"CL_DEVICE_QUEUE_ON_DEVICE_PROPERTIES\s+(.+)", lambda x: tostrlist(x.strip()))
-            self.addc("QueueOnDevicePreferredSize", clcmd, cmdopts, r"CL_DEVICE_QUEUE_ON_DEVICE_PREFERRED_SIZE\s+(\d+)", int)
-            self.addc("QueueOnDeviceMaxSize", clcmd, cmdopts, r"CL_DEVICE_QUEUE_ON_DEVICE_MAX_SIZE\s+(\d+)", int)
-            self.addc("MaxOnDeviceQueues", clcmd, cmdopts, r"CL_DEVICE_MAX_ON_DEVICE_QUEUES\s+(\d+)", int)
-            self.addc("MaxOnDeviceEvents", clcmd, cmdopts, r"CL_DEVICE_MAX_ON_DEVICE_EVENTS\s+(\d+)", int)
-            self.addc("PreferredInteropUserSync", clcmd, cmdopts, r"CL_DEVICE_PREFERRED_INTEROP_USER_SYNC\s+(.+)", str)
-            self.addc("ProfilingTimerResolution", clcmd, cmdopts, r"CL_DEVICE_PROFILING_TIMER_RESOLUTION\s+(\d+)", int)
-            self.addc("ExecutionCapabilities", clcmd, cmdopts, r"CL_DEVICE_EXECUTION_CAPABILITIES\s+(.+)", lambda x: tostrlist(x.strip()))
-            self.addc("SubGroupIndependentForwardProgress", clcmd, cmdopts, r"CL_DEVICE_SUB_GROUP_INDEPENDENT_FORWARD_PROGRESS\s+(.+)", str)
-            self.addc("IlVersion", clcmd, cmdopts, r"CL_DEVICE_IL_VERSION\s+(.+)", str)
-            self.addc("SpirVersions", clcmd, cmdopts, r"CL_DEVICE_SPIR_VERSIONS\s+(.+)", str)
-            self.addc("PrintfBufferSize", clcmd, cmdopts, r"CL_DEVICE_PRINTF_BUFFER_SIZE\s+(\d+)", int)
-            self.addc("BuiltInKernels", clcmd, cmdopts, r"CL_DEVICE_BUILT_IN_KERNELS\s+(.+)", lambda x: tostrlist(x.strip()))
-            self.addc("MeVersionIntel", clcmd, cmdopts, r"CL_DEVICE_ME_VERSION_INTEL\s+(\d+)", int)
-            self.addc("AvcMeVersionIntel", clcmd, cmdopts, r"CL_DEVICE_AVC_ME_VERSION_INTEL\s+(\d+)", int)
-            self.addc("AvcMeSupportsTextureSamplerUseIntel", clcmd, cmdopts, r"CL_DEVICE_AVC_ME_SUPPORTS_TEXTURE_SAMPLER_USE_INTEL\s+(.+)", str)
-            self.addc("AvcMeSupportsPreemptionIntel", clcmd, cmdopts, r"CL_DEVICE_AVC_ME_SUPPORTS_PREEMPTION_INTEL\s+(.+)", str)
-            self.addc("DeviceExtensions", clcmd, cmdopts, r"CL_DEVICE_EXTENSIONS\s+(.+)", lambda x: tostrlist(x.strip()))
-            
+            for key, _, _, parse in OpenCLInfoPlatformDeviceClass.FIELDS:
+                self.addc(key, clcmd, cmdopts, OpenCLInfoPlatformDeviceClass.REGEXES[key], parse)
+
+    def update(self):
+        '''Call clinfo only once and match all keys in the lines of this device instead
+        of calling 'clinfo --raw --offline | grep ...' for each key'''
+        data = None
+        if self.cmd and len(self._operations) > 0:
+            data = process_cmd((self.cmd, self.cmd_opts))
+        self.update_from_output(OpenCLInfoPlatformDeviceClass.devicelines(data, self.suffix, self.device))
+
+    def update_from_output(self, data):
+        '''Split the lines of this device once by their property and match each key only
+        against the line of its property instead of scanning all lines for each key'''
+        super(OpenCLInfoPlatformDeviceClass, self).update_from_output(None)
+        if not data:
+            return
+        lines = OpenCLInfoPlatformDeviceClass.splitproperties(data)
+        # The regex and parser of each key are static, so use them directly instead
+        # of going through the match() and parse() calls of the operation
+        for key, prop, regex, parse in OpenCLInfoPlatformDeviceClass.MATCHERS:
+            line = lines.get(prop)
+            if line is None or key not in self._operations:
+                continue
+            m = regex.search(line)
+            if m:
+                try:
+                    self._data[key] = parse(m.group(1))
+                except (ValueError, TypeError):
+                    logging.debug("Key '%s' not found in command output", key)
+
+    @staticmethod
+    def splitproperties(value):
+        '''Get a dict with the line of each property like '[NV/0] CL_DEVICE_NAME  Tesla' in
+        the clinfo output of one device. For repeated properties, the last line is used.'''
+        lines = {}
+        for line in value.split("\n"):
+            tokens = line.split(None, 2)
+            if len(tokens) > 1:
+                lines[tokens[1]] = line
+        return lines
+
+    @staticmethod
+    def splitdevices(value):
+        '''Split the output of clinfo in raw mode in a single pass into the lines of each
+        device. Returns a dict with the line prefix like '[NV/0]' as key'''
+        devices = {}
+        for line in value.split("\n") if value else []:
+            if line.startswith("["):
+                prefix = line.split("]", 1)[0] + "]"
+                devices.setdefault(prefix, []).append(line)
+        return {prefix : "\n".join(lines) for prefix, lines in devices.items()}
+
+    @staticmethod
+    def devicelines(value, suffix, device):
+        '''Get the lines of one device from the output of clinfo in raw mode'''
+        if not value:
+            return None
+        prefix = "[{}/{}]".format(suffix, device)
+        lines = [l for l in value.split("\n") if l.startswith(prefix)]
+        return "\n".join(lines) if len(lines) > 0 else None
+
 class OpenCLInfoPlatformClass(ListInfoGroup):
     '''Class to read information for one OpenCL device (uses the clinfo command)'''
+    FIELDS = (("Name", re.compile(r"\s+CL_PLATFORM_NAME\s+(.+)"), str),
+              ("Version", re.compile(r"\s+CL_PLATFORM_VERSION\s+(.+)"), str),
+              ("Extensions", re.compile(r"\s+CL_PLATFORM_EXTENSIONS\s+(.+)"), clstrlist),
+              ("Profile", re.compile(r"\s+CL_PLATFORM_PROFILE\s+(.+)"), str),
+              ("Vendor", re.compile(r"\s+CL_PLATFORM_VENDOR\s+(.+)"), str),
+             )
+
     def __init__(self, platform, extended=False, anonymous=False, clinfo_path=""):
         super(OpenCLInfoPlatformClass, self).__init__(extended=extended, anonymous=anonymous)
         self.name = platform
         self.platform = platform
         self.clinfo_path = clinfo_path
-        clcmd = pjoin(clinfo_path, "clinfo")
-        if not pexists(clcmd):
-            clcmd = which("clinfo")
+        clcmd = clinfo_command(clinfo_path)
+        self.cmd = clcmd
+        self.cmd_opts = CLINFO_OPTS
         if clcmd and len(clcmd) > 0:
-            cmdopts = "--raw --offline"
-            self.addc("Name", clcmd, cmdopts, r"\s+CL_PLATFORM_NAME\s+(.+)", str)
-            self.addc("Version", clcmd, cmdopts, r"\s+CL_PLATFORM_VERSION\s+(.+)", str)
-            self.addc("Extensions", clcmd, cmdopts, r"\s+CL_PLATFORM_EXTENSIONS\s+(.+)", lambda x: tostrlist(x.strip()))
-            self.addc("Profile", clcmd, cmdopts, r"\s+CL_PLATFORM_PROFILE\s+(.+)", str)
-            self.addc("Vendor", clcmd, cmdopts, r"\s+CL_PLATFORM_VENDOR\s+(.+)", str)
+            cmdopts = self.cmd_opts
+            for key, regex, parse in OpenCLInfoPlatformClass.FIELDS:
+                self.addc(key, clcmd, cmdopts, regex, parse)
             #self.commands["IcdSuffix"] = (clcmd, cmdopts, r"\s+CL_PLATFORM_ICD_SUFFIX_KHR\s+(.+)", str)
-            suffix = process_cmd((clcmd, cmdopts, r"\s+CL_PLATFORM_ICD_SUFFIX_KHR\s+(.+)", str))
+            out = cached_cmd(clcmd, CLINFO_OPTS) or ""
+            suffix = str(match_data(out, r"\s+CL_PLATFORM_ICD_SUFFIX_KHR\s+(.+)"))
             self.const("IcdSuffix", suffix)
-            num_devs = process_cmd((clcmd, cmdopts, r".*{}.*#DEVICES\s*(\d+)".format(suffix), int))
+            num_devs = None
+            try:
+                num_devs = int(match_data(out, r".*{}.*#DEVICES\s*(\d+)".format(suffix)))
+            except ValueError:
+                pass
             if num_devs and num_devs > 0:
-                self.userlist = [r for r in range(num_devs)]
+                self.userlist = list(range(num_devs))
                 self.subargs = {"clinfo_path" : clinfo_path, "suffix" : suffix}
                 self.subclass = OpenCLInfoPlatformDeviceClass
+                self.parallel_update = True
+
+    def update(self):
+        '''Call clinfo only once for the platform and all its devices'''
+        data = None
+        if self.cmd and len(self._operations) > 0:
+            data = process_cmd((self.cmd, self.cmd_opts))
+        if not data:
+            super(OpenCLInfoPlatformClass, self).update()
+            return
+        self.update_from_output(data)
+
+    def update_from_output(self, data):
+        '''Update the platform and hand each device only its lines of the clinfo output'''
+        super(OpenCLInfoPlatformClass, self).update_from_output(data)
+        devices = OpenCLInfoPlatformDeviceClass.splitdevices(data)
+        for inst in self._instances:
+            inst.update_from_output(devices.get("[{}/{}]".format(inst.suffix, inst.device)))
 
 class OpenCLInfoLoaderClass(InfoGroup):
     '''Class to read information for one OpenCL loader (uses the clinfo command)'''
+    FIELDS = (("Name", re.compile(r"\s+CL_ICDL_NAME\s+(.+)"), str),
+              ("Vendor", re.compile(r"\s+CL_ICDL_VENDOR\s+(.+)"), str),
+              ("Version", re.compile(r"\s+CL_ICDL_VERSION\s+(.+)"), str),
+              ("OclVersion", re.compile(r"\s+CL_ICDL_OCL_VERSION\s+(.+)"), str),
+             )
+
     def __init__(self, loader, extended=False, anonymous=False, clinfo_path=""):
         super(OpenCLInfoLoaderClass, self).__init__(name=loader, extended=extended, anonymous=anonymous)
         self.clinfo_path = clinfo_path
         self.loader = loader
-        clcmd = pjoin(clinfo_path, "clinfo")
-        if not pexists(clcmd):
-            clcmd = which("clinfo")
+        clcmd = clinfo_command(clinfo_path)
+        self.cmd = clcmd
+        self.cmd_opts = CLINFO_OPTS
         if clcmd and len(clcmd) > 0:
-            cmdopts = "--raw --offline | grep '[OCLICD/*]'"
-            self.addc("Name", clcmd, cmdopts, r"\s+CL_ICDL_NAME\s+(.+)", str)
-            self.addc("Vendor", clcmd, cmdopts, r"\s+CL_ICDL_VENDOR\s+(.+)", str)
-            self.addc("Version", clcmd, cmdopts, r"\s+CL_ICDL_VERSION\s+(.+)", str)
-            self.addc("OclVersion", clcmd, cmdopts, r"\s+CL_ICDL_OCL_VERSION\s+(.+)", str)
+            cmdopts = self.cmd_opts
+            for key, regex, parse in OpenCLInfoLoaderClass.FIELDS:
+                self.addc(key, clcmd, cmdopts, regex, parse)
+
+    def update(self):
+        '''Call clinfo only once for all keys of the loader'''
+        data = None
+        if self.cmd and len(self._operations) > 0:
+            data = process_cmd((self.cmd, self.cmd_opts))
+        self.update_from_output(data)
+
+    def update_from_output(self, data):
+        '''Match the keys only in the '[OCLICD/*]' lines of the clinfo output'''
+        lines = None
+        if data:
+            lines = "\n".join(l for l in data.split("\n") if l.startswith("[OCLICD/"))
+        super(OpenCLInfoLoaderClass, self).update_from_output(lines or None)
 
 class OpenCLInfo(MultiClassInfoGroup):
     '''Class to spawn subclasses for each OpenCL device and loader (uses the clinfo command)'''
     def __init__(self, clinfo_path="", extended=False, anonymous=False):
         super(OpenCLInfo, self).__init__(name="OpenCLInfo", extended=extended, anonymous=anonymous)
         self.clinfo_path = clinfo_path
-        clcmd = pjoin(clinfo_path, "clinfo")
-        if not pexists(clcmd):
-            clcmd = which("clinfo")
+        self.parallel_update = True
+        clcmd = clinfo_command(clinfo_path)
         if clcmd and len(clcmd) > 0:
-            out = process_cmd((clcmd, "--raw --offline"))
-            loaderlist = []
+            out = cached_cmd(clcmd, CLINFO_OPTS) or ""
             platlist = []
-            for l in out.split("\n"):
-                m = re.match(r".*CL_PLATFORM_NAME\s+(.*)", l)
-                if m and m.group(1) not in platlist:
+            for m in CL_PLATFORM_REGEX.finditer(out):
+                if m.group(1) not in platlist:
                     platlist.append(m.group(1))
-                    self.classlist.append(OpenCLInfoPlatformClass)
-                    self.classargs.append({"platform" : m.group(1), "clinfo_path" : clinfo_path})
-            for l in out.split("\n"):
-                m = re.match(r".*CL_ICDL_NAME\s+(.*)", l)
-                if m:
-                    self.classlist.append(OpenCLInfoLoaderClass)
-                    self.classargs.append({"loader" : m.group(1), "clinfo_path" : clinfo_path})
+            loaderlist = [m.group(1) for m in CL_ICDL_REGEX.finditer(out)]
+            for platform in platlist:
+                self.classlist.append(OpenCLInfoPlatformClass)
+                self.classargs.append({"platform" : platform, "clinfo_path" : clinfo_path})
+            for loader in loaderlist:
+                self.classlist.append(OpenCLInfoLoaderClass)
+                self.classargs.append({"loader" : loader, "clinfo_path" : clinfo_path})
+        self.cmd = clcmd
+
+    def update(self):
+        '''Call clinfo only once for all platforms, devices and loaders'''
+        data = None
+        if self.cmd and len(self._instances) > 0:
+            data = process_cmd((self.cmd, CLINFO_OPTS))
+        if not data:
+            super(OpenCLInfo, self).update()
+            return
+        for inst in self._instances:
+            inst.update_from_output(data)
 
 ################################################################################
 # Skript code
@@ -3481,19 +4348,20 @@ def read_config(config={"extended" : False, "anonymous" : False, "executable" :
             searchfiles.append(pjoin(os.environ["HOME"], ".machinestate"))
         searchfiles.append("/etc/machinestate.conf")
     for sfile in searchfiles:
-        if pexists(sfile):
-            sfp = fopen(sfile)
-            if sfp:
-                sstr = sfp.read().decode(ENCODING)
-                if len(sstr) > 0:
-                    try:
-                        tmpdict = json.loads(sstr)
-                        configdict.update(tmpdict)
-                    except:
-                        exce = "Configuration file '{}' not valid JSON".format(userfile)
-                        raise ValueError(exce)
-                sfp.close()
-                break
+        # Try to read the file directly, missing or unreadable files are skipped
+        try:
+            with open(sfile, "rb") as sfp:
+                sstr = sfp.read()
+        except OSError:
+            continue
+        if len(sstr) > 0:
+            try:
+                tmpdict = json.loads(sstr.decode(ENCODING))
+                configdict.update(tmpdict)
+            except:
+                exce = "Configuration file '{}' not valid JSON".format(userfile)
+                raise ValueError(exce)
+        break
 
     if configdict["loglevel"]:
         numeric_level = getattr(logging, configdict["loglevel"].upper(), None)
@@ -3640,11 +4508,15 @@ base_html = """
 </html>
 """
 
+# base_html split at its placeholders {css}, {table} and {script}
+base_html_parts = re.split(r"\{(?:css|table|script)\}", base_html)
+
 def get_html(cls, css=True, js=True):
     add_css = base_css if css is True else ""
     add_js = base_js if js is True else ""
     table = cls.get_html()
-    return base_html.format(table=table, css=add_css, script=add_js)
+    head, body, tail, end = base_html_parts
+    return "".join([head, add_css, body, table, tail, add_js, end])
 
 
 def main():
@@ -3672,25 +4544,20 @@ def main():
             print("The current state differs at least in one setting with input file")
         sys.exit(0)
 
-    # Get JSON document string (either from the configuration or the state)
-    jsonout = {}
-    if not cliargs["config"]:
-        jsonout = mstate.get_json(sort=cliargs["sort"], intend=cliargs["indent"], meta=cliargs["no_meta"])
+    # Get output document string (HTML or JSON from either the configuration or the state)
+    if cliargs["html"]:
+        out = get_html(mstate)
+    elif not cliargs["config"]:
+        out = mstate.get_json(sort=cliargs["sort"], intend=cliargs["indent"], meta=cliargs["no_meta"])
     else:
-        jsonout = mstate.get_config(sort=cliargs["sort"], intend=cliargs["indent"])
+        out = mstate.get_config(sort=cliargs["sort"], intend=cliargs["indent"])
 
     # Determine output destination
     if not cliargs["output"]:
-        if cliargs["html"]:
-            print(get_html(mstate))
-        else:
-            print(jsonout)
+        print(out)
     else:
         with open(cliargs["output"], "w") as outfp:
-            if cliargs["html"]:
-                outfp.write(get_html(mstate))
-            else:
-                outfp.write(mstate.get_json(sort=cliargs["sort"], intend=cliargs["indent"], meta=cliargs["no_meta"]))
+            outfp.write(out)
             outfp.write("\n")
     sys.exit(0)
 
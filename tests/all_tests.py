@@ -11,6 +11,11 @@ suite = unittest.TestLoader().loadTestsFromNames(
         'test_parsers',
         'test_helpers',
         'test_dmidecode_file',
+        'test_nvidiasmi',
+        'test_clinfo',
+        'test_prefetcher',
+        'test_infiniband',
+        'test_powercap',
         'test_machinestate',
         'test_repr',
         'test_config',
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Objects and fixtures shared by the test modules
+"""
+import os
+import unittest
+import tempfile
+from functools import lru_cache
+import machinestate
+from machinestate import ENCODING
+
+# Content of the temporary files, encoded once for all tests
+PAYLOADS = {"File{}".format(x) : "File{}\n".format(x).encode(ENCODING) for x in range(4)}
+
+@lru_cache(maxsize=None)
+def list_dir(path):
+    '''Returns the names in a temporary test directory. The files do not change while its
+    tests run, so the directory is listed once instead of for each subclass instance'''
+    return tuple(os.listdir(path))
+
+@lru_cache(maxsize=None)
+def machinestate_instance():
+    '''Returns a generated and updated MachineState object. It is created once per test
+    run, so the tests using it must not change it'''
+    ms = machinestate.MachineState()
+    ms.generate()
+    ms.update()
+    return ms
+
+
+class TempFilesTestCase(unittest.TestCase):
+    '''Base class for tests reading the PAYLOADS files. temp_files maps each key of
+    PAYLOADS to (None, path) of its file'''
+    @classmethod
+    def setUpClass(cls):
+        # Create a temporary directory shared by all tests of the class
+        cls.temp_dir = tempfile.mkdtemp()
+        # The directory is private, so the files get fixed names instead of mkstemp() ones
+        cls.temp_files = {tkey : (None, os.path.join(cls.temp_dir, tkey)) for tkey in PAYLOADS}
+        for tkey in cls.temp_files:
+            _, tfname = cls.temp_files[tkey]
+            tfp = os.open(tfname, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            os.write(tfp, PAYLOADS[tkey])
+            os.close(tfp)
+
+    @classmethod
+    def write_files(cls):
+        # (Re-)write the initial content. Tests changing the files call it as cleanup
+        for tkey in cls.temp_files:
+            _, tfname = cls.temp_files[tkey]
+            with open(tfname, "wb") as tfp:
+                tfp.write(PAYLOADS[tkey])
+
+    @classmethod
+    def tearDownClass(cls):
+        # Remove the known files and the directory after the last test
+        for _, tfname in cls.temp_files.values():
+            os.unlink(tfname)
+        os.rmdir(cls.temp_dir)
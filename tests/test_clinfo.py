@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+High-level tests for the class OpenCLInfo using a fake clinfo command
+"""
+import os
+import unittest
+import tempfile
+import shutil
+import stat
+import machinestate
+from machinestate import ENCODING
+
+
+CLINFO_OUTPUT = """#PLATFORMS                                1
+  CL_PLATFORM_NAME                        NVIDIA CUDA
+  CL_PLATFORM_VENDOR                      NVIDIA Corporation
+  CL_PLATFORM_VERSION                     OpenCL 3.0 CUDA 12.2.140
+  CL_PLATFORM_PROFILE                     FULL_PROFILE
+  CL_PLATFORM_EXTENSIONS                  cl_khr_global_int32_base_atomics cl_khr_fp64
+  CL_PLATFORM_ICD_SUFFIX_KHR              NV
+[NV/*] #DEVICES                           2
+[NV/0] CL_DEVICE_NAME                     Tesla V100-PCIE-32GB
+[NV/0] CL_DEVICE_VENDOR                   NVIDIA Corporation
+[NV/0] CL_DEVICE_MAX_COMPUTE_UNITS        80
+[NV/0] CL_DEVICE_GLOBAL_MEM_SIZE          34089730048
+[NV/1] CL_DEVICE_NAME                     Tesla V100-PCIE-16GB
+[NV/1] CL_DEVICE_VENDOR                   NVIDIA Corporation
+[NV/1] CL_DEVICE_MAX_COMPUTE_UNITS        40
+[NV/1] CL_DEVICE_GLOBAL_MEM_SIZE          17045651456
+[OCLICD/*] CL_ICDL_NAME                   OpenCL ICD Loader
+[OCLICD/*] CL_ICDL_VENDOR                 OCL Icd free software
+[OCLICD/*] CL_ICDL_VERSION                2.2.14
+[OCLICD/*] CL_ICDL_OCL_VERSION            OpenCL 3.0
+"""
+
+class TestOpenCLInfo(unittest.TestCase):
+    def setUp(self):
+        # Create a temporary directory with a fake clinfo printing CLINFO_OUTPUT
+        # and counting its calls
+        self.temp_dir = tempfile.mkdtemp()
+        self.calls = os.path.join(self.temp_dir, "calls")
+        script = os.path.join(self.temp_dir, "clinfo")
+        with open(script, "wb") as tfp:
+            tfp.write(bytes("#!/bin/sh\necho $@ >> {}\ncat <<'EOF'\n{}\nEOF\n".format(
+                      self.calls, CLINFO_OUTPUT), ENCODING))
+        os.chmod(script, stat.S_IRWXU)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_devicelines(self):
+        lines = machinestate.OpenCLInfoPlatformDeviceClass.devicelines(CLINFO_OUTPUT, "NV", 1)
+        self.assertEqual(len(lines.split("\n")), 4)
+        self.assertTrue(all(l.startswith("[NV/1]") for l in lines.split("\n")))
+        self.assertEqual(machinestate.OpenCLInfoPlatformDeviceClass.devicelines(CLINFO_OUTPUT, "NV", 2), None)
+        self.assertEqual(machinestate.OpenCLInfoPlatformDeviceClass.devicelines(None, "NV", 0), None)
+    def test_splitdevices(self):
+        devices = machinestate.OpenCLInfoPlatformDeviceClass.splitdevices(CLINFO_OUTPUT)
+        self.assertEqual(devices["[NV/1]"],
+                         machinestate.OpenCLInfoPlatformDeviceClass.devicelines(CLINFO_OUTPUT, "NV", 1))
+        self.assertEqual(sorted(devices.keys()), ["[NV/*]", "[NV/0]", "[NV/1]", "[OCLICD/*]"])
+    def test_splitproperties(self):
+        lines = machinestate.OpenCLInfoPlatformDeviceClass.devicelines(CLINFO_OUTPUT, "NV", 0)
+        props = machinestate.OpenCLInfoPlatformDeviceClass.splitproperties(lines)
+        self.assertEqual(len(props), 4)
+        self.assertTrue(props["CL_DEVICE_NAME"].endswith("Tesla V100-PCIE-32GB"))
+    def test_update(self):
+        cls = machinestate.OpenCLInfo(clinfo_path=self.temp_dir)
+        cls.generate()
+        with open(self.calls, "wb"):
+            pass
+        cls.update()
+        outdict = cls.get()
+        platform = outdict["NVIDIA CUDA"]
+        self.assertEqual(platform["IcdSuffix"], "NV")
+        self.assertEqual(platform["Version"], "OpenCL 3.0 CUDA 12.2.140")
+        self.assertEqual(platform["Tesla V100-PCIE-32GB"]["MaxComputeUnits"], 80)
+        self.assertEqual(platform["Tesla V100-PCIE-16GB"]["MaxComputeUnits"], 40)
+        self.assertEqual(platform["Tesla V100-PCIE-16GB"]["GlobalMemSize"], 17045651456)
+        self.assertEqual(outdict["OpenCL ICD Loader"]["Version"], "2.2.14")
+        with open(self.calls, "rb") as tfp:
+            calls = tfp.read().decode(ENCODING).strip().split("\n")
+        self.assertEqual(calls, ["--raw --offline"])
+    def test_generate(self):
+        machinestate.cached_cmd.cache_clear()
+        cls = machinestate.OpenCLInfo(clinfo_path=self.temp_dir)
+        cls.generate()
+        with open(self.calls, "rb") as tfp:
+            calls = tfp.read().decode(ENCODING).strip().split("\n")
+        self.assertEqual(calls, ["--raw --offline"])
+    def test_discovery(self):
+        cls = machinestate.OpenCLInfo(clinfo_path=self.temp_dir)
+        self.assertEqual(cls.classlist, [machinestate.OpenCLInfoPlatformClass,
+                                         machinestate.OpenCLInfoLoaderClass])
+        self.assertEqual(cls.classargs[0]["platform"], "NVIDIA CUDA")
+        self.assertEqual(cls.classargs[1]["loader"], "OpenCL ICD Loader")
@@ -3,30 +3,27 @@
 High-level tests for the class InfoGroup
 """
 import os
-import sys
 import unittest
 import tempfile
-import shutil
 import stat
 import json
 import machinestate
-from locale import getpreferredencoding
+from machinestate import ENCODING
 
-ENCODING = getpreferredencoding()
 
 class TestCliParser(unittest.TestCase):
-    def setUp(self):
-        self.cmd = tempfile.NamedTemporaryFile(mode='w+b', delete=True)
-        self.cmd.write(b"#!/bin/bash\n\necho Hello")
-        self.cmd.flush()
-        os.chmod(self.cmd.name, stat.S_IXUSR)
-        self.readable = tempfile.NamedTemporaryFile(mode='rb', delete=True)
-
-        pass
-    def tearDown(self):
-        self.cmd.close()
-        self.readable.close()
-        pass
+    @classmethod
+    def setUpClass(cls):
+        # read_cli() only checks the paths, so the files are shared by all tests
+        cls.cmd = tempfile.NamedTemporaryFile(mode='w+b', delete=True)
+        cls.cmd.write(b"#!/bin/bash\n\necho Hello")
+        cls.cmd.flush()
+        os.chmod(cls.cmd.name, stat.S_IXUSR)
+        cls.readable = tempfile.NamedTemporaryFile(mode='rb', delete=True)
+    @classmethod
+    def tearDownClass(cls):
+        cls.cmd.close()
+        cls.readable.close()
     def test_emptyCli(self):
         cli = []
         conf = machinestate.read_cli(cli)
@@ -71,6 +68,7 @@ class TestCliParser(unittest.TestCase):
         fname = self.readable.name+"bla"
         cli = ["--configfile", fname]
         self.assertRaises(ValueError, machinestate.read_cli, cli)
+    @unittest.skipIf(os.geteuid() == 0, "root can read files without read permission")
     def test_configfile_not_readable(self):
         fname = self.cmd.name
         cli = ["--configfile", fname]
@@ -99,6 +97,7 @@ class TestCliParser(unittest.TestCase):
         fname = self.readable.name+"bla"
         cli = ["--json", fname]
         self.assertRaises(ValueError, machinestate.read_cli, cli)
+    @unittest.skipIf(os.geteuid() == 0, "root can read files without read permission")
     def test_jsoncmp_not_readable(self):
         fname = self.cmd.name
         cli = ["--json", fname]
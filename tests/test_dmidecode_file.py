@@ -3,28 +3,25 @@
 High-level tests for the class InfoGroup
 """
 import os
-import sys
 import unittest
 import tempfile
-import shutil
-import stat
 import machinestate
-from locale import getpreferredencoding
-
-ENCODING = getpreferredencoding()
+from machinestate import ENCODING
 
 
 class TestHelpers(unittest.TestCase):
-    def setUp(self):
-        # Create a temporary directory
-        self.test_input = "DMIDECODEFILECONTENT"
-        tfp, self.temp_file = tempfile.mkstemp()
+    @classmethod
+    def setUpClass(cls):
+        # Create one temporary file for all tests, they only read it
+        cls.test_input = "DMIDECODEFILECONTENT"
+        tfp, cls.temp_file = tempfile.mkstemp()
         if tfp > 0:
-            os.pwrite(tfp, bytes("{}\n".format(self.test_input), ENCODING), 0)
+            os.write(tfp, "{}\n".format(cls.test_input).encode(ENCODING))
             os.close(tfp)
 
-    def tearDown(self):
-        os.remove(self.temp_file)
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.temp_file)
 
     def testDmiDecodeFile(self):
         cls = machinestate.DmiDecodeFile(dmifile=self.temp_file)
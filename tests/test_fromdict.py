@@ -5,57 +5,53 @@ Tests for from_dict() function
 
 import unittest
 import machinestate
+from shared_state import machinestate_instance
 from tempfile import NamedTemporaryFile
-from locale import getpreferredencoding
+from machinestate import ENCODING
 
-ENCODING = getpreferredencoding()
 
 class TestFromDict(unittest.TestCase):
-    def setUp(self):
-        self.ms = machinestate.MachineState()
-        self.ms.generate()
-        self.ms.update()
-        data = self.ms.get()
+    # Show the complete difference of the large state dicts
+    maxDiff = None
+    @classmethod
+    def setUpClass(cls):
+        # The tests only read the state, so it is created once for all of them
+        cls.ms = machinestate_instance()
+        data = cls.ms.get()
         if data["OperatingSystemInfo"]["Type"] == "Linux":
-            self.ci = machinestate.CpuInfo()
-            self.ci.generate()
-            self.ci.update()
+            cls.ci = machinestate.CpuInfo()
+            cls.ci.generate()
+            cls.ci.update()
         else:
-            self.ci = machinestate.CpuInfoMacOS()
-            self.ci.generate()
-            self.ci.update()
+            cls.ci = machinestate.CpuInfoMacOS()
+            cls.ci.generate()
+            cls.ci.update()
+        # The state does not change, so get the dict with meta information only once
+        cls.msmeta = cls.ms.get(meta=True)
+        # The copy is only compared, so it is also created once for all tests
+        cls.mscopy = machinestate.MachineState.from_dict(cls.msmeta)
     def test_fromdictCompareClass(self):
-        mscopy = machinestate.MachineState.from_dict(self.ms.get(meta=True))
-        self.assertEqual(self.ms, mscopy)
+        self.assertEqual(self.ms, self.mscopy)
     def test_fromdictCompareDict(self):
-        mscopy = machinestate.MachineState.from_dict(self.ms.get(meta=True))
-        self.assertEqual(self.ms, mscopy.get())
+        self.assertEqual(self.ms, self.mscopy.get())
     def test_fromdictCompareDictMeta(self):
-        mscopy = machinestate.MachineState.from_dict(self.ms.get(meta=True))
-        self.assertEqual(self.ms, mscopy.get(meta=True))
+        self.assertEqual(self.ms, self.mscopy.get(meta=True))
     def test_fromdictCompareJSON(self):
-        mscopy = machinestate.MachineState.from_dict(self.ms.get(meta=True))
-        self.assertEqual(self.ms, mscopy.get_json())
+        self.assertEqual(self.ms, self.mscopy.get_json())
     def test_fromdictCompareJSONFile(self):
-        mscopy = machinestate.MachineState.from_dict(self.ms.get(meta=True))
         jsonfp = NamedTemporaryFile(mode="wb", delete=True)
-        jsonfp.write(bytes(mscopy.get_json(), ENCODING))
+        jsonfp.write(bytes(self.mscopy.get_json(), ENCODING))
         jsonfp.seek(0)
         self.assertEqual(self.ms, jsonfp.name)
         jsonfp.close()
     def test_fromdictCompareDictDict(self):
-        mscopy = machinestate.MachineState.from_dict(self.ms.get(meta=True))
-        self.assertEqual(self.ms.get(), mscopy.get())
+        self.assertEqual(self.ms.get(), self.mscopy.get())
     def test_fromdictCompareDictMetaDictMeta(self):
-        mscopy = machinestate.MachineState.from_dict(self.ms.get(meta=True))
-        self.assertEqual(self.ms.get(meta=True), mscopy.get(meta=True))
+        self.assertEqual(self.msmeta, self.mscopy.get(meta=True))
     def test_fromdictCompareDictMetaDict(self):
-        mscopy = machinestate.MachineState.from_dict(self.ms.get(meta=True))
-        self.assertNotEqual(self.ms.get(), mscopy.get(meta=True))
+        self.assertNotEqual(self.ms.get(), self.mscopy.get(meta=True))
     def test_fromdictLoadFaulty(self):
-        cicopy = {}
-        for k,v in self.ci.get(meta=True).items():
-            cicopy[k] = v
+        cicopy = dict(self.ci.get(meta=True))
         cicopy["Model"] = cicopy["Model"] - 1
         faulty = machinestate.CpuInfo.from_dict(cicopy)
         self.assertNotEqual(self.ci.get(), faulty.get())
@@ -3,32 +3,15 @@
 High-level tests for the class InfoGroup
 """
 import os
-import sys
 import unittest
 import tempfile
 import shutil
-import stat
 import machinestate
-from locale import getpreferredencoding
+from machinestate import ENCODING
+from shared_state import TempFilesTestCase
 
-ENCODING = getpreferredencoding()
-
-
-class TestHelpers(unittest.TestCase):
-    def setUp(self):
-        # Create a temporary directory
-        self.temp_dir = tempfile.mkdtemp()
-        self.temp_files = {"File{}".format(x) : tempfile.mkstemp(prefix=str(x), dir=self.temp_dir) for x in range(4)}
-
-        for tkey in self.temp_files:
-            tfp, tfname = self.temp_files[tkey]
-            os.pwrite(tfp, bytes("{}\n".format(tkey), ENCODING), 0)
-            os.close(tfp)
-
-    def tearDown(self):
-        # Remove the directory after the test
-        shutil.rmtree(self.temp_dir)
 
+class TestHelpers(TempFilesTestCase):
     def test_fopen(self):
         fp = machinestate.fopen(self.temp_files["File0"][1])
         self.assertNotEqual(fp, None)
@@ -45,9 +28,66 @@ class TestHelpers(unittest.TestCase):
         fp = machinestate.fopen(self.temp_files["File0"][1]+"1234")
         self.assertEqual(fp, None)
         if fp: fp.close()
+    def test_fopenFifo(self):
+        fifo = os.path.join(self.temp_dir, "fifo")
+        os.mkfifo(fifo)
+        self.addCleanup(os.unlink, fifo)
+        fp = machinestate.fopen(fifo)
+        self.assertEqual(fp, None)
+        if fp: fp.close()
+    @unittest.skipIf(os.geteuid() == 0, "root can read files without read permission")
     def test_fopenNoPerm(self):
         os.chmod(self.temp_files["File0"][1], 0o0200)
+        self.addCleanup(os.chmod, self.temp_files["File0"][1], 0o0644)
         fp = machinestate.fopen(self.temp_files["File0"][1])
         self.assertEqual(fp, None)
         if fp: fp.close()
-        os.chmod(self.temp_files["File0"][1], 0o0644)
+    def test_findExecutables(self):
+        exe = os.path.join(self.temp_dir, "testexe")
+        self.addCleanup(os.remove, exe)
+        shutil.copy(self.temp_files["File0"][1], exe)
+        os.chmod(exe, 0o0755)
+        path = os.environ.get("PATH", "")
+        os.environ["PATH"] = os.pathsep.join([self.temp_dir, path])
+        try:
+            found = machinestate.find_executables(["testexe", "testexe1234"])
+        finally:
+            os.environ["PATH"] = path
+        self.assertEqual(found, ["testexe"])
+    def test_fread(self):
+        data = machinestate.fread(self.temp_files["File0"][1])
+        self.assertEqual(data, "File0")
+    def test_freadNotExist(self):
+        data = machinestate.fread(self.temp_files["File0"][1]+"1234")
+        self.assertEqual(data, None)
+    def test_freadDir(self):
+        data = machinestate.fread(self.temp_dir)
+        self.assertEqual(data, None)
+    def test_runCmd(self):
+        data = machinestate.run_cmd("cat", self.temp_files["File0"][1])
+        self.assertEqual(data, "File0")
+    def test_runCmdShell(self):
+        data = machinestate.run_cmd("cat", "{} | tr F f".format(self.temp_files["File0"][1]))
+        self.assertEqual(data, "file0")
+    def test_runCmdStderr(self):
+        path = self.temp_files["File0"][1]+"1234"
+        self.assertEqual(machinestate.run_cmd("cat", path), "")
+        self.assertNotEqual(machinestate.run_cmd("cat", "{} 2>&1".format(path)), "")
+    def test_runCmdNotExist(self):
+        data = machinestate.run_cmd(os.path.join(self.temp_dir, "notexist"), "-a")
+        self.assertEqual(data, "")
+    def test_hwmonNames(self):
+        base = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, base)
+        for hwmon, name in enumerate(["coretemp", "acpitz", "acpitz"]):
+            os.makedirs(os.path.join(base, "hwmon{}".format(hwmon)))
+            with open(os.path.join(base, "hwmon{}".format(hwmon), "name"), "w") as fp:
+                fp.write(name + "\n")
+        os.makedirs(os.path.join(base, "hwmon3"))
+        self.addCleanup(machinestate.cached_glob.cache_clear)
+        self.addCleanup(machinestate.cached_hwmon_names.cache_clear)
+        names = machinestate.cached_hwmon_names(base)
+        self.assertEqual(names, {"coretemp" : [0], "acpitz" : [1, 2]})
+        self.assertEqual(machinestate.CoretempInfo.unique_name(base, 0), "coretemp")
+        self.assertEqual(machinestate.CoretempInfo.unique_name(base, 1), None)
+        self.assertEqual(machinestate.CoretempInfo.unique_name(base, 3), None)
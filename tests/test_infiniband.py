@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+High-level tests for the class InfinibandInfoClassPort using a fake sysfs tree
+"""
+import os
+import unittest
+import tempfile
+import shutil
+from unittest import mock
+import machinestate
+
+
+PORT_FILES = {"rate" : "100 Gb/sec (4X EDR)",
+              "phys_state" : "5: LinkUp",
+              "link_layer" : "InfiniBand"}
+
+class TestInfinibandInfoClassPort(unittest.TestCase):
+    def setUp(self):
+        # Create a temporary directory with the port files of driver mlx5_0
+        self.temp_dir = tempfile.mkdtemp()
+        self.port_dir = os.path.join(self.temp_dir, "mlx5_0", "ports", "1")
+        os.makedirs(self.port_dir)
+        patcher = mock.patch.object(machinestate.InfinibandInfoClassPort, "BASE", self.temp_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write_port(self, state, files):
+        for fname, content in dict(files, state=state).items():
+            with open(os.path.join(self.port_dir, fname), "w") as tfp:
+                tfp.write(content + "\n")
+
+    def test_active(self):
+        self.write_port("4: ACTIVE", PORT_FILES)
+        cls = machinestate.InfinibandInfoClassPort(1, driver="mlx5_0")
+        cls.update()
+        self.assertEqual(cls.get()["PhysState"], "5: LinkUp")
+        self.write_port("4: ACTIVE", dict(PORT_FILES, phys_state="3: Disabled"))
+        cls.update()
+        self.assertEqual(cls.get()["PhysState"], "3: Disabled")
+
+    def test_down(self):
+        down = {"rate" : "10 Gb/sec (4X SDR)", "phys_state" : "3: Disabled",
+                "link_layer" : "InfiniBand"}
+        self.write_port("1: DOWN", down)
+        cls = machinestate.InfinibandInfoClassPort(1, driver="mlx5_0")
+        cls.update()
+        outdict = cls.get()
+        self.assertEqual(outdict["PhysState"], "3: Disabled")
+        self.assertEqual(outdict["Rate"], "10 Gb/sec (4X SDR)")
+        # The values are constant while the port is down
+        self.write_port("1: DOWN", PORT_FILES)
+        cls.update()
+        self.assertEqual(cls.get()["PhysState"], "3: Disabled")
+        # and polled again once the port is active
+        self.write_port("4: ACTIVE", PORT_FILES)
+        cls.update()
+        outdict = cls.get()
+        self.assertEqual(outdict["PhysState"], "5: LinkUp")
+        self.assertEqual(outdict["Rate"], "100 Gb/sec (4X EDR)")
@@ -3,15 +3,26 @@
 High-level tests for the class InfoGroup
 """
 import os
-import sys
+import re
 import unittest
-import tempfile
-import shutil
-import stat
+import threading
+from unittest import mock
+import machinestate
 from machinestate import InfoGroup
-from locale import getpreferredencoding
+from machinestate import ENCODING
+from shared_state import TempFilesTestCase
 
-ENCODING = getpreferredencoding()
+# Regex for the number in the file contents. Most tests share the compiled pattern,
+# test_filesMatch passes the string to cover that case
+FILE_REGEX = r"File(\d+)"
+FILE_PATTERN = re.compile(FILE_REGEX)
+
+RUN_CMD = machinestate.run_cmd
+def fake_run_cmd(cmd, cmd_args=""):
+    # Answer 'echo' in-process instead of starting a subprocess for each key
+    if os.path.basename(cmd) == "echo":
+        return cmd_args
+    return RUN_CMD(cmd, cmd_args)
 
 class TestInfoGroupBase(unittest.TestCase):
     def test_empty(self):
@@ -43,21 +54,35 @@ class TestInfoGroupBase(unittest.TestCase):
         outdict = cls.get()
         for key in testdict:
             self.assertEqual(testdict[key], outdict[key])
+    def test_compareLegacyName(self):
+        # Old states name the coretemp hwmon groups by their index like 'Hwmon1'
+        with mock.patch.object(machinestate.CoretempInfo, "unique_name", return_value="coretemp"):
+            hwmon = machinestate.CoretempInfoHwmonX86(1)
+        self.assertEqual((hwmon.name, hwmon.legacy_name), ("coretemp", "Hwmon1"))
+        hwmon.const("Input", 42000)
+        hwmon.required("Input")
+        cls = InfoGroup(name="Package0")
+        cls._instances.append(hwmon)
+        cls.update()
+        self.assertEqual(cls.compare({"coretemp" : {"Input" : 42000}}), {})
+        self.assertEqual(cls.compare({"Hwmon1" : {"Input" : 42000}}), {})
+        self.assertNotEqual(cls.compare({"Hwmon1" : {"Input" : 84000}}), {})
+    def test_mapNested(self):
+        outer = InfoGroup()
+        inner = InfoGroup()
+        outer.parallel_update = True
+        inner.parallel_update = True
+        def threads(item):
+            return (threading.current_thread().name,
+                    inner._map(lambda x: threading.current_thread().name, range(4)))
+        result = outer._map(threads, range(4))
+        for name, inner_names in result:
+            self.assertTrue(name.startswith(machinestate.EXECUTOR_PREFIX))
+            self.assertEqual(inner_names, [name] * 4)
+        self.assertIs(machinestate.shared_executor(), machinestate.shared_executor())
 
-class TestInfoGroupFiles(unittest.TestCase):
-    def setUp(self):
-        # Create a temporary directory
-        self.temp_dir = tempfile.mkdtemp()
-        self.temp_files = {"File{}".format(x) : tempfile.mkstemp(prefix=str(x), dir=self.temp_dir) for x in range(4)}
-        for tkey in self.temp_files:
-            tfp, tfname = self.temp_files[tkey]
-            os.pwrite(tfp, bytes("{}\n".format(tkey), ENCODING), 0)
-            os.close(tfp)
-
-    def tearDown(self):
-        # Remove the directory after the test
-        shutil.rmtree(self.temp_dir)
 
+class TestInfoGroupFiles(TempFilesTestCase):
     def test_files(self):
         resdict = {"File{}".format(x) : "File{}".format(x) for x in range(4)}
         cls = InfoGroup()
@@ -71,7 +96,19 @@ class TestInfoGroupFiles(unittest.TestCase):
             self.assertEqual(resdict[tkey], outdict[tkey])
     def test_filesMatch(self):
         resdict = {"File{}".format(x) : "{}".format(x) for x in range(4)}
-        match = r"File(\d+)"
+        match = FILE_REGEX
+        cls = InfoGroup()
+        for tkey in self.temp_files:
+            _, tfname = self.temp_files[tkey]
+            cls.addf(tkey, tfname, match)
+        cls.generate()
+        cls.update()
+        outdict = cls.get()
+        for i,tkey in enumerate(resdict):
+            self.assertEqual(resdict[tkey], outdict[tkey])
+    def test_filesMatchCompiled(self):
+        resdict = {"File{}".format(x) : "{}".format(x) for x in range(4)}
+        match = FILE_PATTERN
         cls = InfoGroup()
         for tkey in self.temp_files:
             _, tfname = self.temp_files[tkey]
@@ -83,7 +120,7 @@ class TestInfoGroupFiles(unittest.TestCase):
             self.assertEqual(resdict[tkey], outdict[tkey])
     def test_filesMatchConvert(self):
         resdict = {"File{}".format(x) : x for x in range(4)}
-        match = r"File(\d+)"
+        match = FILE_PATTERN
         cls = InfoGroup()
         for tkey in self.temp_files:
             _, tfname = self.temp_files[tkey]
@@ -93,9 +130,49 @@ class TestInfoGroupFiles(unittest.TestCase):
         outdict = cls.get()
         for i,tkey in enumerate(resdict):
             self.assertEqual(resdict[tkey], outdict[tkey])
+    def test_filesKeepOpen(self):
+        self.addCleanup(self.write_files)
+        cls = InfoGroup()
+        for tkey in self.temp_files:
+            _, tfname = self.temp_files[tkey]
+            cls.addf(tkey, tfname, keep_open=True)
+        cls.generate()
+        cls.update()
+        outdict = cls.get()
+        for tkey in self.temp_files:
+            self.assertEqual(tkey, outdict[tkey])
+        for tkey in self.temp_files:
+            _, tfname = self.temp_files[tkey]
+            with open(tfname, "wb") as tfp:
+                tfp.write("{}Changed\n".format(tkey).encode(ENCODING))
+        cls.update()
+        outdict = cls.get()
+        for tkey in self.temp_files:
+            self.assertEqual("{}Changed".format(tkey), outdict[tkey])
+    def test_filesThrottleSlow(self):
+        self.addCleanup(self.write_files)
+        slow_read_ns = machinestate.SLOW_READ_NS
+        machinestate.SLOW_READ_NS = -1
+        try:
+            cls = InfoGroup()
+            _, tfname = self.temp_files["File0"]
+            cls.addf("File0", tfname, keep_open=True, throttle=True)
+            _, tfname = self.temp_files["File1"]
+            cls.addf("File1", tfname, keep_open=True)
+            cls.update()
+            for tkey in ("File0", "File1"):
+                _, tfname = self.temp_files[tkey]
+                with open(tfname, "wb") as tfp:
+                    tfp.write("{}Changed\n".format(tkey).encode(ENCODING))
+            cls.update()
+            outdict = cls.get()
+        finally:
+            machinestate.SLOW_READ_NS = slow_read_ns
+        self.assertEqual("File0", outdict["File0"])
+        self.assertEqual("File1Changed", outdict["File1"])
     def test_filesNotExist(self):
         resdict = {"File{}".format(x) : x for x in range(4)}
-        match = r"File(\d+)"
+        match = FILE_PATTERN
         cls = InfoGroup()
         for tkey in self.temp_files:
             _, tfname = self.temp_files[tkey]
@@ -107,19 +184,12 @@ class TestInfoGroupFiles(unittest.TestCase):
             self.assertNotEqual(resdict[tkey], outdict[tkey])
             self.assertEqual(outdict[tkey], None)
 
-class TestInfoGroupCommands(unittest.TestCase):
+class TestInfoGroupCommands(TempFilesTestCase):
     def setUp(self):
-        # Create a temporary directory
-        self.temp_dir = tempfile.mkdtemp()
-        self.temp_files = {"File{}".format(x) : tempfile.mkstemp(prefix=str(x), dir=self.temp_dir) for x in range(4)}
-        for tkey in self.temp_files:
-            tfp, tfname = self.temp_files[tkey]
-            os.pwrite(tfp, bytes("{}\n".format(tkey), ENCODING), 0)
-            os.close(tfp)
-
-    def tearDown(self):
-        # Remove the directory after the test
-        shutil.rmtree(self.temp_dir)
+        # The command execution itself is tested by the run_cmd tests in test_helpers
+        patcher = mock.patch("machinestate.run_cmd", side_effect=fake_run_cmd)
+        self.run_cmd = patcher.start()
+        self.addCleanup(patcher.stop)
     def test_commands(self):
         resdict = {"File{}".format(x) : "File{}".format(x) for x in range(4)}
         cls = InfoGroup()
@@ -131,9 +201,10 @@ class TestInfoGroupCommands(unittest.TestCase):
         outdict = cls.get()
         for i,tkey in enumerate(resdict):
             self.assertEqual(resdict[tkey], outdict[tkey])
+        self.assertEqual(self.run_cmd.call_count, len(resdict))
     def test_commandsMatch(self):
         resdict = {"File{}".format(x) : "{}".format(x) for x in range(4)}
-        match = r"File(\d+)"
+        match = FILE_PATTERN
         cls = InfoGroup()
         for tkey in self.temp_files:
             _, tfname = self.temp_files[tkey]
@@ -145,7 +216,7 @@ class TestInfoGroupCommands(unittest.TestCase):
             self.assertEqual(resdict[tkey], outdict[tkey])
     def test_commandsMatchConvert(self):
         resdict = {"File{}".format(x) : x for x in range(4)}
-        match = r"File(\d+)"
+        match = FILE_PATTERN
         cls = InfoGroup()
         for tkey in self.temp_files:
             _, tfname = self.temp_files[tkey]
@@ -157,7 +228,7 @@ class TestInfoGroupCommands(unittest.TestCase):
             self.assertEqual(resdict[tkey], outdict[tkey])
     def test_commandsNotExist(self):
         resdict = {"File{}".format(x) : x for x in range(4)}
-        match = r"File(\d+)"
+        match = FILE_PATTERN
         cls = InfoGroup()
         for tkey in self.temp_files:
             _, tfname = self.temp_files[tkey]
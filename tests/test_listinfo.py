@@ -3,16 +3,16 @@
 High-level tests for the class ListInfoGroup
 """
 import os
-import sys
 import unittest
 import tempfile
-import shutil
-import stat
-import glob
 from machinestate import ListInfoGroup, InfoGroup
-from locale import getpreferredencoding
+from shared_state import PAYLOADS, list_dir
 
-ENCODING = getpreferredencoding()
+
+# Idents of the four temporary files and idents without a file. ListInfoGroup does not
+# change the list, so all tests share them
+USERLIST = list(range(4))
+INVALID_USERLIST = [x+100 for x in USERLIST]
 
 class TestClass:
     pass
@@ -23,9 +23,11 @@ class TestInfoGroup(InfoGroup):
         self.name = "File{}".format(ident)
         self.ident = ident
         self.basepath = basepath
-        path = os.path.join(basepath, "{}*".format(ident))
-        files = glob.glob(path)
-        self.addf("File{}".format(ident), files[0], r"(.+)")
+        prefix = str(ident)
+        fname = next((n for n in list_dir(basepath) if n.startswith(prefix)), None)
+        if fname is None:
+            raise IndexError(ident)
+        self.addf("File{}".format(ident), os.path.join(basepath, fname), r"(.+)")
 
 class TestListInfoGroupBase(unittest.TestCase):
     def test_empty(self):
@@ -41,143 +43,118 @@ class TestListInfoGroupBase(unittest.TestCase):
         self.assertEqual(cls.subclass, None)
         self.assertEqual(cls.subargs, {})
 
-    def test_named(self):
-        cls = ListInfoGroup(name="Testname")
-        self.assertEqual(cls.name, "Testname")
-    def test_extended(self):
-        cls = ListInfoGroup(extended=True)
-        self.assertEqual(cls.extended, True)
-    def test_anonymous(self):
-        cls = ListInfoGroup(anonymous=True)
-        self.assertEqual(cls.anonymous, True)
-    def test_userlistNone(self):
-        cls = ListInfoGroup(userlist=None)
-        self.assertEqual(cls.userlist, [])
-    def test_userlistEmpty(self):
-        cls = ListInfoGroup(userlist=[])
-        self.assertEqual(cls.userlist, [])
-    def test_userlistFilled(self):
-        testl = ["a", "b", "c"]
-        cls = ListInfoGroup(userlist=testl)
-        self.assertEqual(cls.userlist, testl)
-    def test_subclassString(self):
-        cls = ListInfoGroup(subclass="abc")
-        self.assertEqual(cls.subclass, None)
-    def test_subclassNone(self):
-        cls = ListInfoGroup(subclass=None)
-        self.assertEqual(cls.subclass, None)
-    def test_subclassClass(self):
-        cls = ListInfoGroup(subclass=TestClass)
-        self.assertEqual(cls.subclass, TestClass)
-    def test_subargsNone(self):
-        cls = ListInfoGroup(subargs=None)
-        self.assertEqual(cls.subargs, {})
-    def test_subargsDict(self):
-        cls = ListInfoGroup(subargs={})
-        self.assertEqual(cls.subargs, {})
-    def test_subargsBool(self):
-        cls = ListInfoGroup(subargs=True)
-        self.assertEqual(cls.subargs, {})
-    def test_subargsList(self):
-        cls = ListInfoGroup(subargs=[])
-        self.assertEqual(cls.subargs, {})
+    def test_arguments(self):
+        # Constructor arguments and the resulting attribute value
+        cases = [({"name" : "Testname"}, "name", "Testname"),
+                 ({"extended" : True}, "extended", True),
+                 ({"anonymous" : True}, "anonymous", True),
+                 ({"userlist" : None}, "userlist", []),
+                 ({"userlist" : []}, "userlist", []),
+                 ({"userlist" : ["a", "b", "c"]}, "userlist", ["a", "b", "c"]),
+                 ({"subclass" : "abc"}, "subclass", None),
+                 ({"subclass" : None}, "subclass", None),
+                 ({"subclass" : TestClass}, "subclass", TestClass),
+                 ({"subargs" : None}, "subargs", {}),
+                 ({"subargs" : {}}, "subargs", {}),
+                 ({"subargs" : True}, "subargs", {}),
+                 ({"subargs" : []}, "subargs", {}),
+                ]
+        for kwargs, attr, expected in cases:
+            with self.subTest(**kwargs):
+                cls = ListInfoGroup(**kwargs)
+                self.assertEqual(getattr(cls, attr), expected)
 
 class TestListInfoGroupFunction(unittest.TestCase):
-    def setUp(self):
-        # Create a temporary directory
-        self.temp_dir = tempfile.mkdtemp()
-        self.temp_files = {"File{}".format(x) : tempfile.mkstemp(prefix=str(x), dir=self.temp_dir) for x in range(4)}
-        for tkey in self.temp_files:
-            tfp, tfname = self.temp_files[tkey]
-            os.pwrite(tfp, bytes("{}\n".format(tkey), ENCODING), 0)
-            os.close(tfp)
+    @classmethod
+    def setUpClass(cls):
+        # Create a temporary directory shared by all tests of the class, they only read
+        # the files. The names start with the ident for the glob in TestInfoGroup
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.temp_files = {}
+        for tkey, payload in PAYLOADS.items():
+            tfname = os.path.join(cls.temp_dir, "{}{}".format(tkey[-1], tkey))
+            with open(tfname, "wb") as tfp:
+                tfp.write(payload)
+            cls.temp_files[tkey] = tfname
 
-    def tearDown(self):
-        # Remove the directory after the test
-        shutil.rmtree(self.temp_dir)
+    @classmethod
+    def tearDownClass(cls):
+        # Remove the known files and the directory after the last test
+        for tfname in cls.temp_files.values():
+            os.unlink(tfname)
+        os.rmdir(cls.temp_dir)
     def test_validCreate(self):
-        userlist = [x for x in range(len(self.temp_files))]
+        userlist = USERLIST
         cls = ListInfoGroup(userlist=userlist, subclass=TestInfoGroup, subargs={"basepath": self.temp_dir})
         self.assertEqual(cls._instances, [])
         self.assertEqual(cls.userlist, userlist)
         self.assertEqual(cls.subclass, TestInfoGroup)
         self.assertEqual(cls.subargs, {"basepath": self.temp_dir})
-    def test_validGenerate(self):
-        userlist = [x for x in range(len(self.temp_files))]
+    def test_validGenerateUpdateGet(self):
+        userlist = USERLIST
         cls = ListInfoGroup(userlist=userlist, subclass=TestInfoGroup, subargs={"basepath": self.temp_dir})
+        # Build the object once and check its state after each step
         cls.generate()
         self.assertEqual(len(cls._instances), 4)
         self.assertEqual(cls._data, {})
         for inst in cls._instances:
-            self.assertEqual(inst._instances, [])
-            self.assertEqual(inst._data, {})
-    def test_validUpdate(self):
-        userlist = [x for x in range(len(self.temp_files))]
-        cls = ListInfoGroup(userlist=userlist, subclass=TestInfoGroup, subargs={"basepath": self.temp_dir})
-        cls.generate()
+            with self.subTest(step="generate", ident=inst.ident):
+                self.assertEqual(inst._instances, [])
+                self.assertEqual(inst._data, {})
         cls.update()
         self.assertEqual(len(cls._instances), 4)
         self.assertEqual(cls._data, {})
         for inst in cls._instances:
-            self.assertEqual(inst._instances, [])
-            self.assertNotEqual(inst._data, {})
-    def test_validGet(self):
-        userlist = [x for x in range(len(self.temp_files))]
+            with self.subTest(step="update", ident=inst.ident):
+                self.assertEqual(inst._instances, [])
+                self.assertNotEqual(inst._data, {})
+        outdict = cls.get()
+        self.assertEqual(cls._data, {})
+        expected = {key : {key : key} for key in self.temp_files}
+        self.assertEqual(outdict, expected)
+    def test_validGetParallel(self):
+        userlist = USERLIST
         cls = ListInfoGroup(userlist=userlist, subclass=TestInfoGroup, subargs={"basepath": self.temp_dir})
+        cls.parallel_update = True
         cls.generate()
         cls.update()
         outdict = cls.get()
-        self.assertEqual(cls._data, {})
-        for inst in cls._instances:
-            self.assertEqual(inst._instances, [])
-            self.assertNotEqual(inst._data, {})
-        for i, key in enumerate(self.temp_files.keys()):
-            for subkey in outdict[key]:
-                self.assertEqual(key, subkey)
-                self.assertEqual(key, outdict[key][subkey])
+        self.assertEqual(list(outdict.keys()), list(self.temp_files.keys()))
+        expected = {key : {key : key} for key in self.temp_files}
+        self.assertEqual(outdict, expected)
     def test_invalidCreate(self):
-        userlist = [x+100 for x in range(len(self.temp_files))]
+        userlist = INVALID_USERLIST
         cls = ListInfoGroup(userlist=userlist, subclass=TestInfoGroup, subargs={"basepath": self.temp_dir})
         self.assertEqual(cls._instances, [])
         self.assertEqual(cls._data, {})
         self.assertEqual(cls.userlist, userlist)
     def test_invalidGenerate(self):
-        userlist = [x+100 for x in range(len(self.temp_files))]
-        cls = ListInfoGroup(userlist=userlist, subclass=TestInfoGroup, subargs={"basepath": self.temp_dir})
-        #cls.generate()
-        self.assertRaises(IndexError, cls.generate)
-        self.assertEqual(cls._instances, [])
-        self.assertEqual(cls._data, {})
-        self.assertEqual(cls.userlist, userlist)
-    def test_invalidUpdate(self):
-        userlist = [x+100 for x in range(len(self.temp_files))]
-        cls = ListInfoGroup(userlist=userlist, subclass=TestInfoGroup, subargs={"basepath": self.temp_dir})
-        self.assertRaises(IndexError, cls.generate)
-        cls.update()
-        self.assertEqual(cls._instances, [])
-        self.assertEqual(cls._data, {})
-        self.assertEqual(cls.userlist, userlist)
-    def test_invalidGet(self):
-        userlist = [x+100 for x in range(len(self.temp_files))]
-        cls = ListInfoGroup(userlist=userlist, subclass=TestInfoGroup, subargs={"basepath": self.temp_dir})
-        self.assertRaises(IndexError, cls.generate)
-        cls.update()
-        outdict = cls.get()
-        self.assertEqual(outdict, {})
-        self.assertEqual(cls._instances, [])
-        self.assertEqual(cls._data, {})
-        self.assertEqual(cls.userlist, userlist)
+        # Generation fails, later update() and get() calls must not change anything
+        for steps in ([], ["update"], ["update", "get"]):
+            with self.subTest(steps=steps):
+                userlist = INVALID_USERLIST
+                cls = ListInfoGroup(userlist=userlist, subclass=TestInfoGroup, subargs={"basepath": self.temp_dir})
+                with self.assertRaises(IndexError):
+                    cls.generate()
+                if "update" in steps:
+                    cls.update()
+                if "get" in steps:
+                    self.assertEqual(cls.get(), {})
+                self.assertEqual(cls._instances, [])
+                self.assertEqual(cls._data, {})
+                self.assertEqual(cls.userlist, userlist)
     def test_validCreateInvalidClass(self):
-        userlist = [x for x in range(len(self.temp_files))]
+        userlist = USERLIST
         cls = ListInfoGroup(userlist=userlist, subclass=unittest.TestCase, subargs={"basepath": self.temp_dir})
         self.assertEqual(cls._instances, [])
         self.assertEqual(cls.subclass, unittest.TestCase)
     def test_validGenerateInvalidClass(self):
-        userlist = [x for x in range(len(self.temp_files))]
+        userlist = USERLIST
         cls = ListInfoGroup(userlist=userlist, subclass=unittest.TestCase, subargs={"basepath": self.temp_dir})
-        self.assertRaises(TypeError, cls.generate)
+        with self.assertRaises(TypeError):
+            cls.generate()
     def test_validUpdateInvalidClass(self):
-        userlist = [x for x in range(len(self.temp_files))]
+        userlist = USERLIST
         cls = ListInfoGroup(userlist=userlist, subclass=unittest.TestCase, subargs={"basepath": self.temp_dir})
         try:
             cls.generate()
@@ -187,7 +164,7 @@ class TestListInfoGroupFunction(unittest.TestCase):
         self.assertEqual(cls._instances, [])
         self.assertEqual(cls._data, {})
     def test_validGetInvalidClass(self):
-        userlist = [x for x in range(len(self.temp_files))]
+        userlist = USERLIST
         cls = ListInfoGroup(userlist=userlist, subclass=unittest.TestCase, subargs={"basepath": self.temp_dir})
         try:
             cls.generate()
@@ -3,39 +3,32 @@
 High-level tests for the class PathMatchInfoGroup
 """
 import os, os.path
-import sys, glob
 import unittest
-import tempfile
-import shutil
-import stat
 from machinestate import MachineState
-from locale import getpreferredencoding
-
-ENCODING = getpreferredencoding()
+from machinestate import ENCODING
+from shared_state import machinestate_instance
 
 
 class TestMachineState(unittest.TestCase):
     def test_getJson(self):
-        cls = MachineState()
-        outstr = cls.get_json(meta=False)
-        self.assertEqual(outstr, "{}")
-    def test_getJsonMeta(self):
-        cls = MachineState()
-        outstr = cls.get_json(meta=True)
-        self.assertEqual(outstr, "{\n    \"_meta\": \"MachineState()\"\n}")
+        cases = [(False, "{}"),
+                 (True, "{\n    \"_meta\": \"MachineState()\"\n}")]
+        for meta, expected in cases:
+            with self.subTest(meta=meta):
+                cls = MachineState()
+                self.assertEqual(cls.get_json(meta=meta), expected)
     def test_CompareJson(self):
-        cls = MachineState()
-        cls.generate()
-        cls.update()
-        outstr = cls.get_json()
-        self.assertNotEqual(outstr, "{}")
-        self.assertTrue(cls.get_json() == outstr)
+        cls = machinestate_instance()
+        for meta in (False, True):
+            with self.subTest(meta=meta):
+                outstr = cls.get_json(meta=meta)
+                self.assertNotEqual(outstr, "{}")
+                self.assertTrue(cls.get_json(meta=meta) == outstr)
     def test_fromDictCompare(self):
-        ms = MachineState();
-        ms.generate();
-        ms.update()
+        ms = machinestate_instance()
         msdict = ms.get(meta=True)
         mscopy = MachineState.from_dict(msdict)
         self.assertEqual(ms, mscopy)
-        self.assertEqual(ms.get(meta=False), mscopy.get(meta=False))
-        self.assertEqual(ms.get(meta=True), mscopy.get(meta=True))
+        for meta in (False, True):
+            with self.subTest(meta=meta):
+                self.assertEqual(ms.get(meta=meta), mscopy.get(meta=meta))
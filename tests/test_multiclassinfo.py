@@ -3,16 +3,11 @@
 High-level tests for the class MultiClassInfoGroup
 """
 import os
-import sys
 import unittest
 import tempfile
-import shutil
-import stat
-import glob
 from machinestate import MultiClassInfoGroup, InfoGroup
-from locale import getpreferredencoding
+from shared_state import PAYLOADS, list_dir
 
-ENCODING = getpreferredencoding()
 
 class TestClass:
     pass
@@ -23,9 +18,11 @@ class TestInfoGroup(InfoGroup):
         self.name = "File{}".format(ident)
         self.basepath = basepath
         self.ident = ident
-        path = os.path.join(basepath, "{}*".format(ident))
-        files = glob.glob(path)
-        self.addf("File{}".format(ident), files[0], r"(.+)")
+        prefix = str(ident)
+        fname = next((n for n in list_dir(basepath) if n.startswith(prefix)), None)
+        if fname is None:
+            raise IndexError(ident)
+        self.addf("File{}".format(ident), os.path.join(basepath, fname), r"(.+)")
 
 
 class TestMultiClassInfoGroupBase(unittest.TestCase):
@@ -39,46 +36,54 @@ class TestMultiClassInfoGroupBase(unittest.TestCase):
         self.assertEqual(cls.constants, {})
         self.assertEqual(cls._instances, [])
 
-    def test_named(self):
-        cls = MultiClassInfoGroup(name="Testname")
-        self.assertEqual(cls.name, "Testname")
-    def test_extended(self):
-        cls = MultiClassInfoGroup(extended=True)
-        self.assertEqual(cls.extended, True)
-    def test_anonymous(self):
-        cls = MultiClassInfoGroup(anonymous=True)
-        self.assertEqual(cls.anonymous, True)
-    def test_listempty(self):
-        cls = MultiClassInfoGroup(classlist=[], classargs=[])
-        self.assertEqual(cls.classlist, [])
-        self.assertEqual(cls.classargs, [])
-    def test_listonlyclass(self):
-        cls = MultiClassInfoGroup(classlist=[TestClass], classargs=[])
-        self.assertEqual(cls.classlist, [])
-        self.assertEqual(cls.classargs, [])
-    def test_listvalid(self):
-        cls = MultiClassInfoGroup(classlist=[TestClass, TestClass], classargs=[{}, {}])
-        self.assertEqual(cls.classlist, [TestClass, TestClass])
-        self.assertEqual(cls.classargs, [{}, {}])
+    def test_arguments(self):
+        # Constructor arguments and the resulting attribute value
+        cases = [({"name" : "Testname"}, "name", "Testname"),
+                 ({"extended" : True}, "extended", True),
+                 ({"anonymous" : True}, "anonymous", True),
+                 ({"classlist" : [], "classargs" : []}, "classlist", []),
+                 ({"classlist" : [], "classargs" : []}, "classargs", []),
+                 ({"classlist" : [TestClass], "classargs" : []}, "classlist", []),
+                 ({"classlist" : [TestClass], "classargs" : []}, "classargs", []),
+                 ({"classlist" : [TestClass, TestClass], "classargs" : [{}, {}]}, "classlist", [TestClass, TestClass]),
+                 ({"classlist" : [TestClass, TestClass], "classargs" : [{}, {}]}, "classargs", [{}, {}]),
+                ]
+        for kwargs, attr, expected in cases:
+            with self.subTest(attr=attr, **kwargs):
+                cls = MultiClassInfoGroup(**kwargs)
+                self.assertEqual(getattr(cls, attr), expected)
 
 
 class TestMultiClassInfoGroupFunction(unittest.TestCase):
-    def setUp(self):
-        # Create a temporary directory
-        self.temp_dir = tempfile.mkdtemp()
-        self.temp_files = {"File{}".format(x) : tempfile.mkstemp(prefix=str(x), dir=self.temp_dir) for x in range(4)}
-        for tkey in self.temp_files:
-            tfp, tfname = self.temp_files[tkey]
-            os.pwrite(tfp, bytes("{}\n".format(tkey), ENCODING), 0)
-            os.close(tfp)
+    @classmethod
+    def setUpClass(cls):
+        # Create a temporary directory shared by all tests of the class, they only read
+        # the files. The names start with the ident for the glob in TestInfoGroup
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.temp_files = {}
+        for tkey, payload in PAYLOADS.items():
+            tfname = os.path.join(cls.temp_dir, "{}{}".format(tkey[-1], tkey))
+            with open(tfname, "wb") as tfp:
+                tfp.write(payload)
+            cls.temp_files[tkey] = tfname
+        # Arguments of the four instances with valid and invalid idents. MultiClassInfoGroup
+        # does not change them, so all tests share them
+        cls.classargs = {offset : [{"ident" : x+offset, "basepath" : cls.temp_dir} for x in range(4)]
+                         for offset in (0, 100)}
 
-    def tearDown(self):
-        # Remove the directory after the test
-        shutil.rmtree(self.temp_dir)
+    @classmethod
+    def tearDownClass(cls):
+        # Remove the known files and the directory after the last test
+        for tfname in cls.temp_files.values():
+            os.unlink(tfname)
+        os.rmdir(cls.temp_dir)
+
+    def classes(self, subclass=TestInfoGroup, offset=0):
+        '''Returns the class list and the class arguments for four instances of subclass'''
+        return [subclass] * 4, self.classargs[offset]
 
     def test_validCreate(self):
-        classlist = [TestInfoGroup for x in range(4)]
-        classargs = [{"ident" : x, "basepath" : self.temp_dir} for x in range(4)]
+        classlist, classargs = self.classes()
         cls = MultiClassInfoGroup(classlist=classlist, classargs=classargs)
         self.assertEqual(cls._instances, [])
         for i in range(4):
@@ -87,45 +92,30 @@ class TestMultiClassInfoGroupFunction(unittest.TestCase):
             self.assertEqual(cls.classargs[i]["basepath"], self.temp_dir)
         self.assertEqual(cls._data, {})
 
-    def test_validGenerate(self):
-        classlist = [TestInfoGroup for x in range(4)]
-        classargs = [{"ident" : x, "basepath" : self.temp_dir} for x in range(4)]
+    def test_validGenerateUpdateGet(self):
+        classlist, classargs = self.classes()
         cls = MultiClassInfoGroup(classlist=classlist, classargs=classargs)
+        # Build the object once and check its state after each step
         cls.generate()
-        self.assertNotEqual(cls._instances, [])
         self.assertEqual(len(cls._instances), 4)
         self.assertEqual(cls._data, {})
         for inst in cls._instances:
-            self.assertEqual(inst._instances, [])
-            self.assertEqual(inst._data, {})
-    def test_validUpdate(self):
-        classlist = [TestInfoGroup for x in range(4)]
-        classargs = [{"ident" : x, "basepath" : self.temp_dir} for x in range(4)]
-        cls = MultiClassInfoGroup(classlist=classlist, classargs=classargs)
-        cls.generate()
+            with self.subTest(step="generate", ident=inst.ident):
+                self.assertEqual(inst._instances, [])
+                self.assertEqual(inst._data, {})
         cls.update()
+        self.assertEqual(len(cls._instances), 4)
         self.assertEqual(cls._data, {})
         for inst in cls._instances:
-            self.assertEqual(inst._instances, [])
-            self.assertNotEqual(inst._data, {})
-    def test_validGet(self):
-        classlist = [TestInfoGroup for x in range(4)]
-        classargs = [{"ident" : x, "basepath" : self.temp_dir} for x in range(4)]
-        cls = MultiClassInfoGroup(classlist=classlist, classargs=classargs)
-        cls.generate()
-        cls.update()
+            with self.subTest(step="update", ident=inst.ident):
+                self.assertEqual(inst._instances, [])
+                self.assertNotEqual(inst._data, {})
         outdict = cls.get()
         self.assertEqual(cls._data, {})
-        for inst in cls._instances:
-            self.assertEqual(inst._instances, [])
-            self.assertNotEqual(inst._data, {})
-        for i, key in enumerate(self.temp_files.keys()):
-            for subkey in outdict[key]:
-                self.assertEqual(key, subkey)
-                self.assertEqual(key, outdict[key][subkey])
+        expected = {key : {key : key} for key in self.temp_files}
+        self.assertEqual(outdict, expected)
     def test_invalidCreate(self):
-        classlist = [TestInfoGroup for x in range(4)]
-        classargs = [{"ident" : x+100, "basepath" : self.temp_dir} for x in range(4)]
+        classlist, classargs = self.classes(offset=100)
         cls = MultiClassInfoGroup(classlist=classlist, classargs=classargs)
         self.assertEqual(cls._instances, [])
         self.assertEqual(cls._data, {})
@@ -134,53 +124,35 @@ class TestMultiClassInfoGroupFunction(unittest.TestCase):
             self.assertEqual(cls.classargs[i]["ident"], i+100)
             self.assertEqual(cls.classargs[i]["basepath"], self.temp_dir)
     def test_invalidGenerate(self):
-        classlist = [TestInfoGroup for x in range(4)]
-        classargs = [{"ident" : x+100, "basepath" : self.temp_dir} for x in range(4)]
-        cls = MultiClassInfoGroup(classlist=classlist, classargs=classargs)
-        #cls.generate()
-        self.assertRaises(IndexError, cls.generate)
-        self.assertEqual(cls._instances, [])
-        self.assertEqual(cls._data, {})
-        self.assertEqual(cls.classlist, classlist)
-        self.assertEqual(cls.classargs, classargs)
-    def test_invalidUpdate(self):
-        classlist = [TestInfoGroup for x in range(4)]
-        classargs = [{"ident" : x+100, "basepath" : self.temp_dir} for x in range(4)]
-        cls = MultiClassInfoGroup(classlist=classlist, classargs=classargs)
-        self.assertRaises(IndexError, cls.generate)
-        cls.update()
-        self.assertEqual(cls._instances, [])
-        self.assertEqual(cls._data, {})
-        self.assertEqual(cls.classlist, classlist)
-        self.assertEqual(cls.classargs, classargs)
-    def test_invalidGet(self):
-        classlist = [TestInfoGroup for x in range(4)]
-        classargs = [{"ident" : x+100, "basepath" : self.temp_dir} for x in range(4)]
-        cls = MultiClassInfoGroup(classlist=classlist, classargs=classargs)
-        self.assertRaises(IndexError, cls.generate)
-        cls.update()
-        outdict = cls.get()
-        self.assertEqual(outdict, {})
-        self.assertEqual(cls._instances, [])
-        self.assertEqual(cls._data, {})
-        self.assertEqual(cls.classlist, classlist)
-        self.assertEqual(cls.classargs, classargs)
+        # Generation fails, later update() and get() calls must not change anything
+        for steps in ([], ["update"], ["update", "get"]):
+            with self.subTest(steps=steps):
+                classlist, classargs = self.classes(offset=100)
+                cls = MultiClassInfoGroup(classlist=classlist, classargs=classargs)
+                with self.assertRaises(IndexError):
+                    cls.generate()
+                if "update" in steps:
+                    cls.update()
+                if "get" in steps:
+                    self.assertEqual(cls.get(), {})
+                self.assertEqual(cls._instances, [])
+                self.assertEqual(cls._data, {})
+                self.assertEqual(cls.classlist, classlist)
+                self.assertEqual(cls.classargs, classargs)
     def test_validCreateInvalidClass(self):
-        classlist = [unittest.TestCase for x in range(4)]
-        classargs = [{"ident" : x, "basepath" : self.temp_dir} for x in range(4)]
+        classlist, classargs = self.classes(subclass=unittest.TestCase)
         cls = MultiClassInfoGroup(classlist=classlist, classargs=classargs)
         for i in range(4):
             self.assertEqual(cls.classlist[i], unittest.TestCase)
             self.assertEqual(cls.classargs[i]["ident"], i)
             self.assertEqual(cls.classargs[i]["basepath"], self.temp_dir)
     def test_validGenerateInvalidClass(self):
-        classlist = [unittest.TestCase for x in range(4)]
-        classargs = [{"ident" : x, "basepath" : self.temp_dir} for x in range(4)]
+        classlist, classargs = self.classes(subclass=unittest.TestCase)
         cls = MultiClassInfoGroup(classlist=classlist, classargs=classargs)
-        self.assertRaises(TypeError, cls.generate)
+        with self.assertRaises(TypeError):
+            cls.generate()
     def test_validUpdateInvalidClass(self):
-        classlist = [unittest.TestCase for x in range(4)]
-        classargs = [{"ident" : x, "basepath" : self.temp_dir} for x in range(4)]
+        classlist, classargs = self.classes(subclass=unittest.TestCase)
         cls = MultiClassInfoGroup(classlist=classlist, classargs=classargs)
         try:
             cls.generate()
@@ -190,8 +162,7 @@ class TestMultiClassInfoGroupFunction(unittest.TestCase):
         self.assertEqual(cls._instances, [])
         self.assertEqual(cls._data, {})
     def test_validGetInvalidClass(self):
-        classlist = [unittest.TestCase for x in range(4)]
-        classargs = [{"ident" : x, "basepath" : self.temp_dir} for x in range(4)]
+        classlist, classargs = self.classes(subclass=unittest.TestCase)
         cls = MultiClassInfoGroup(classlist=classlist, classargs=classargs)
         try:
             cls.generate()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+High-level tests for the class NvidiaSmiInfo using a fake nvidia-smi command
+"""
+import os
+import unittest
+from unittest import mock
+import tempfile
+import shutil
+import stat
+import machinestate
+from machinestate import ENCODING
+
+
+NVIDIA_SMI_OUTPUT = """
+==============NVSMI LOG==============
+
+Driver Version                            : 535.104.05
+CUDA Version                              : 12.2
+
+Attached GPUs                             : 2
+GPU 00000000:3B:00.0
+    Product Name                          : Tesla V100-PCIE-32GB
+    VBIOS Version                         : 88.00.98.00.01
+    Compute Mode                          : Default
+    FB Memory Usage
+        Total                             : 32768 MiB
+        Reserved                          : 309 MiB
+        Used                              : 459 MiB
+        Free                              : 32000 MiB
+    BAR1 Memory Usage
+        Total                             : 256 MiB
+        Used                              : 2 MiB
+        Free                              : 254 MiB
+    Temperature
+        GPU Current Temp                  : 35 C
+
+GPU 00000000:D8:00.0
+    Product Name                          : Tesla V100-PCIE-16GB
+    VBIOS Version                         : 88.00.98.00.02
+    Compute Mode                          : Exclusive_Process
+    FB Memory Usage
+        Total                             : 16384 MiB
+        Reserved                          : 309 MiB
+        Used                              : 459 MiB
+        Free                              : 16000 MiB
+    BAR1 Memory Usage
+        Total                             : 128 MiB
+        Used                              : 2 MiB
+        Free                              : 126 MiB
+    Temperature
+        GPU Current Temp                  : 40 C
+"""
+
+# Result of nvml_query() for the same GPUs as NVIDIA_SMI_OUTPUT
+NVML_INFO = {"DriverVersion" : "535.104.05",
+             "CudaVersion" : "12.2",
+             "Devices" : [{"ProductName" : "Tesla V100-PCIE-32GB",
+                           "VBiosVersion" : "88.00.98.00.01",
+                           "ComputeMode" : "Default",
+                           "GPUCurrentTemp" : "35 C",
+                           "MemTotal" : "32768 MiB",
+                           "MemFree" : "32000 MiB",
+                           "PciDevice" : "00000000:3B:00",
+                           "PciLinkWidth" : "16x",
+                           "GPUMaxOpTemp" : "87 C"},
+                          {"ProductName" : "Tesla V100-PCIE-16GB",
+                           "VBiosVersion" : "88.00.98.00.02",
+                           "ComputeMode" : "Exclusive_Process",
+                           "GPUCurrentTemp" : "40 C",
+                           "MemTotal" : "16384 MiB",
+                           "MemFree" : "16000 MiB",
+                           "PciDevice" : "00000000:D8:00",
+                           "PciLinkWidth" : "16x",
+                           "GPUMaxOpTemp" : "87 C"}]}
+
+class TestNvidiaSmiInfo(unittest.TestCase):
+    def setUp(self):
+        # Create a temporary directory with a fake nvidia-smi printing NVIDIA_SMI_OUTPUT
+        # and counting its calls
+        self.temp_dir = tempfile.mkdtemp()
+        self.calls = os.path.join(self.temp_dir, "calls")
+        script = os.path.join(self.temp_dir, "nvidia-smi")
+        with open(script, "wb") as tfp:
+            tfp.write(bytes("#!/bin/sh\necho $@ >> {}\ncat <<'EOF'\n{}\nEOF\n".format(
+                      self.calls, NVIDIA_SMI_OUTPUT), ENCODING))
+        os.chmod(script, stat.S_IRWXU)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_splitgpus(self):
+        sections = machinestate.NvidiaSmiInfo.splitgpus(NVIDIA_SMI_OUTPUT)
+        self.assertEqual(len(sections), 2)
+        self.assertTrue(sections[0].startswith("GPU 00000000:3B:00.0"))
+        self.assertTrue(sections[1].startswith("GPU 00000000:D8:00.0"))
+    @mock.patch("machinestate.nvml_init", return_value=None)
+    def test_update(self, nvml_init):
+        # Without the NVIDIA management library, nvidia-smi is used
+        cls = machinestate.NvidiaSmiInfo(nvidia_path=self.temp_dir)
+        cls.generate()
+        with open(self.calls, "wb"):
+            pass
+        cls.update()
+        outdict = cls.get()
+        self.assertEqual(outdict["DriverVersion"], "535.104.05")
+        self.assertEqual(outdict["CudaVersion"], "12.2")
+        self.assertEqual(outdict["Card0"]["ProductName"], "Tesla V100-PCIE-32GB")
+        self.assertEqual(outdict["Card0"]["MemTotal"], "32768 MiB")
+        self.assertEqual(outdict["Card0"]["MemFree"], "32000 MiB")
+        self.assertEqual(outdict["Card1"]["MemTotal"], "16384 MiB")
+        self.assertEqual(outdict["Card1"]["ComputeMode"], "Exclusive_Process")
+        self.assertEqual(outdict["Card1"]["GPUCurrentTemp"], "40 C")
+        with open(self.calls, "rb") as tfp:
+            calls = tfp.read().decode(ENCODING).strip().split("\n")
+        self.assertEqual(calls, ["-q"])
+    @mock.patch("machinestate.nvml_shutdown")
+    @mock.patch("machinestate.nvml_query", return_value=NVML_INFO)
+    @mock.patch("machinestate.nvml_init")
+    def test_updateNvml(self, nvml_init, nvml_query, nvml_shutdown):
+        # With the NVIDIA management library, nvidia-smi is not called and the library
+        # is initialized once for all updates
+        cls = machinestate.NvidiaSmiInfo(nvidia_path=self.temp_dir)
+        cls.generate()
+        cls.update()
+        cls.update()
+        outdict = cls.get()
+        self.assertEqual(nvml_init.call_count, 1)
+        for call in nvml_query.call_args_list:
+            self.assertEqual(call, mock.call(nvml_init.return_value))
+        self.assertEqual(outdict["DriverVersion"], "535.104.05")
+        self.assertEqual(outdict["Card0"]["MemTotal"], "32768 MiB")
+        self.assertEqual(outdict["Card1"]["MemFree"], "16000 MiB")
+        self.assertNotIn("PciDevice", outdict["Card0"])
+        self.assertFalse(os.path.exists(self.calls))
@@ -2,16 +2,9 @@
 """
 High-level tests for the class InfoGroup
 """
-import os
-import sys
+import re
 import unittest
-import tempfile
-import shutil
-import stat
 import machinestate
-from locale import getpreferredencoding
-
-ENCODING = getpreferredencoding()
 
 
 class TestToStrList(unittest.TestCase):
@@ -31,6 +24,13 @@ class TestToStrList(unittest.TestCase):
     def test_tostrlistValidComma(self):
         out = machinestate.tostrlist("a,b,c")
         self.assertEqual(out, ["a", "b", "c"])
+    def test_tostrlistValidTrailing(self):
+        out = machinestate.tostrlist("a b c ")
+        self.assertEqual(out, ["a", "b", "c"])
+    def test_tostrlistEmpty(self):
+        for value in ["", " ", ", "]:
+            with self.subTest(value=value):
+                self.assertEqual(machinestate.tostrlist(value), [])
 
 class TestToIntList(unittest.TestCase):
     # Tests for tointlist
@@ -76,86 +76,51 @@ class TestToBytes(unittest.TestCase):
     def test_tobytesInt(self):
         out = machinestate.tobytes(1)
         self.assertEqual(out, 1)
-    def test_tobytesValidStrPlain(self):
-        out = machinestate.tobytes("1234")
-        self.assertEqual(out, 1234)
-    def test_tobytesValidStrB(self):
-        out = machinestate.tobytes("1234 B")
-        self.assertEqual(out, 1234)
-    def test_tobytesValidStrBNoSpace(self):
-        out = machinestate.tobytes("1234B")
-    def test_tobytesValidStrkB(self):
-        out = machinestate.tobytes("1234 kB")
-        self.assertEqual(out, 1234*1024)
-    def test_tobytesValidStrkBNoSpace(self):
-        out = machinestate.tobytes("1234kB")
-        self.assertEqual(out, 1234*1024)
-    def test_tobytesValidStrKB(self):
-        out = machinestate.tobytes("1234 KB")
-        self.assertEqual(out, 1234*1024)
-    def test_tobytesValidStrKBNoSpace(self):
-        out = machinestate.tobytes("1234KB")
-        self.assertEqual(out, 1234*1024)
-    def test_tobytesValidStrmB(self):
-        out = machinestate.tobytes("1234 mB")
-        self.assertEqual(out, 1234*1024*1024)
-    def test_tobytesValidStrmBNoSpace(self):
-        out = machinestate.tobytes("1234mB")
-        self.assertEqual(out, 1234*1024*1024)
-    def test_tobytesValidStrMB(self):
-        out = machinestate.tobytes("1234 MB")
-        self.assertEqual(out, 1234*1024*1024)
-    def test_tobytesValidStrMBNoSpace(self):
-        out = machinestate.tobytes("1234MB")
-        self.assertEqual(out, 1234*1024*1024)
-    def test_tobytesValidStrgB(self):
-        out = machinestate.tobytes("1234 gB")
-        self.assertEqual(out, 1234*1024*1024*1024)
-    def test_tobytesValidStrgBNoSpace(self):
-        out = machinestate.tobytes("1234gB")
-        self.assertEqual(out, 1234*1024*1024*1024)
-    def test_tobytesValidStrGB(self):
-        out = machinestate.tobytes("1234 GB")
-        self.assertEqual(out, 1234*1024*1024*1024)
-    def test_tobytesValidStrGBNoSpace(self):
-        out = machinestate.tobytes("1234GB")
-        self.assertEqual(out, 1234*1024*1024*1024)
-    def test_tobytesValidStrkiB(self):
-        out = machinestate.tobytes("1234 kiB")
-        self.assertEqual(out, 1234*1000)
-    def test_tobytesValidStrkiBNoSpace(self):
-        out = machinestate.tobytes("1234kiB")
-        self.assertEqual(out, 1234*1000)
-    def test_tobytesValidStrKiB(self):
-        out = machinestate.tobytes("1234 KiB")
-        self.assertEqual(out, 1234*1000)
-    def test_tobytesValidStrKiBNoSpace(self):
-        out = machinestate.tobytes("1234KiB")
-        self.assertEqual(out, 1234*1000)
-    def test_tobytesValidStrmiB(self):
-        out = machinestate.tobytes("1234 miB")
-        self.assertEqual(out, 1234*1000*1000)
-    def test_tobytesValidStrmiBNoSpace(self):
-        out = machinestate.tobytes("1234miB")
-        self.assertEqual(out, 1234*1000*1000)
-    def test_tobytesValidStrMiB(self):
-        out = machinestate.tobytes("1234 MiB")
-        self.assertEqual(out, 1234*1000*1000)
-    def test_tobytesValidStrMiBNoSpace(self):
-        out = machinestate.tobytes("1234MiB")
-        self.assertEqual(out, 1234*1000*1000)
-    def test_tobytesValidStrgiB(self):
-        out = machinestate.tobytes("1234 giB")
-        self.assertEqual(out, 1234*1000*1000*1000)
-    def test_tobytesValidStrgiBNoSpace(self):
-        out = machinestate.tobytes("1234giB")
-        self.assertEqual(out, 1234*1000*1000*1000)
-    def test_tobytesValidStrGiB(self):
-        out = machinestate.tobytes("1234 GiB")
-        self.assertEqual(out, 1234*1000*1000*1000)
-    def test_tobytesValidStrGiBNoSpace(self):
-        out = machinestate.tobytes("1234GiB")
-        self.assertEqual(out, 1234*1000*1000*1000)
+    def test_tobytesValidStr(self):
+        # Size strings and the resulting number of bytes
+        cases = [("1234", 1234),
+                 ("1234 B", 1234),
+                 ("1234B", 1234),
+                 ("1234 kB", 1234*1024),
+                 ("1234kB", 1234*1024),
+                 ("1234 KB", 1234*1024),
+                 ("1234KB", 1234*1024),
+                 ("1234 mB", 1234*1024*1024),
+                 ("1234mB", 1234*1024*1024),
+                 ("1234 MB", 1234*1024*1024),
+                 ("1234MB", 1234*1024*1024),
+                 ("1234 gB", 1234*1024*1024*1024),
+                 ("1234gB", 1234*1024*1024*1024),
+                 ("1234 GB", 1234*1024*1024*1024),
+                 ("1234GB", 1234*1024*1024*1024),
+                 ("1234 kiB", 1234*1000),
+                 ("1234kiB", 1234*1000),
+                 ("1234 KiB", 1234*1000),
+                 ("1234KiB", 1234*1000),
+                 ("1234 miB", 1234*1000*1000),
+                 ("1234miB", 1234*1000*1000),
+                 ("1234 MiB", 1234*1000*1000),
+                 ("1234MiB", 1234*1000*1000),
+                 ("1234 giB", 1234*1000*1000*1000),
+                 ("1234giB", 1234*1000*1000*1000),
+                 ("1234 GiB", 1234*1000*1000*1000),
+                 ("1234GiB", 1234*1000*1000*1000),
+                 ("1.5 kB", 1536),
+                 ("0.5GiB", 500*1000*1000),
+                ]
+        for value, expected in cases:
+            with self.subTest(value=value):
+                self.assertEqual(machinestate.tobytes(value), expected)
+    def test_tobytesUnitTrailingText(self):
+        # Only the leading unit token counts
+        cases = [("10 kBytes", 10*1024),
+                 ("1 Mi", 1024*1024),
+                 ("2 GiB total", 2*1000*1000*1000),
+                 ("3 B free", 3),
+                ]
+        for value, expected in cases:
+            with self.subTest(value=value):
+                self.assertEqual(machinestate.tobytes(value), expected)
     def test_tobytesValidInvalidSuffix(self):
         out = machinestate.tobytes("1234abc")
     def test_tobytesNotValid(self):
@@ -174,19 +139,25 @@ class TestMaskToList(unittest.TestCase):
         self.assertEqual(out, [0])
     def test_masktolistIntMask(self):
         out = machinestate.masktolist(0xff)
-        self.assertEqual(out, [x for x in range(8)])
+        self.assertEqual(out, list(range(8)))
     def test_masktolistIntValue(self):
         out = machinestate.masktolist(11)
         self.assertEqual(out, [0, 1, 3])
     def test_masktolistStrMask(self):
         out = machinestate.masktolist("ff")
-        self.assertEqual(out, [x for x in range(8)])
+        self.assertEqual(out, list(range(8)))
     def test_masktolistStrMaskHex(self):
         out = machinestate.masktolist("0xff")
-        self.assertEqual(out, [x for x in range(8)])
+        self.assertEqual(out, list(range(8)))
     def test_masktolistStrMaskComma(self):
         out = machinestate.masktolist("ff,FF")
-        self.assertEqual(out, [x for x in range(16)])
+        self.assertEqual(out, list(range(16)))
+    def test_masktolistIntNegative(self):
+        out = machinestate.masktolist(-1)
+        self.assertEqual(out, [])
+    def test_masktolistStrEmpty(self):
+        out = machinestate.masktolist("")
+        self.assertEqual(out, [])
 
 class TestToHertz(unittest.TestCase):
     # Tests for tohertz
@@ -200,30 +171,20 @@ class TestToHertz(unittest.TestCase):
         # string without unit are seen as kHz
         out = machinestate.tohertz("10000")
         self.assertEqual(out, 10000000)
-    def test_tohertzStrHz(self):
-        out = machinestate.tohertz("1234 Hz")
-        self.assertEqual(out, 1234)
-    def test_tohertzStrhz(self):
-        out = machinestate.tohertz("1234hz")
-        self.assertEqual(out, 1234)
-    def test_tohertzStrkHz(self):
-        out = machinestate.tohertz("1234 kHz")
-        self.assertEqual(out, 1234*1000)
-    def test_tohertzStrKHz(self):
-        out = machinestate.tohertz("1234KHz")
-        self.assertEqual(out, 1234*1000)
-    def test_tohertzStrmHz(self):
-        out = machinestate.tohertz("1234 mHz")
-        self.assertEqual(out, 1234000000)
-    def test_tohertzStrMHz(self):
-        out = machinestate.tohertz("1234 MHz")
-        self.assertEqual(out, 1234000000)
-    def test_tohertzStrGHz(self):
-        out = machinestate.tohertz("1234 GHz")
-        self.assertEqual(out, 1234000000000)
-    def test_tohertzStrgHz(self):
-        out = machinestate.tohertz("1234gHz")
-        self.assertEqual(out, 1234000000000)
+    def test_tohertzStr(self):
+        # Frequency strings and the resulting frequency in Hz
+        cases = [("1234 Hz", 1234),
+                 ("1234hz", 1234),
+                 ("1234 kHz", 1234*1000),
+                 ("1234KHz", 1234*1000),
+                 ("1234 mHz", 1234000000),
+                 ("1234 MHz", 1234000000),
+                 ("1234 GHz", 1234000000000),
+                 ("1234gHz", 1234000000000),
+                ]
+        for value, expected in cases:
+            with self.subTest(value=value):
+                self.assertEqual(machinestate.tohertz(value), expected)
     def test_tohertzFloat(self):
         out = machinestate.tohertz(1000.00)
         self.assertEqual(out, 1000)
@@ -231,30 +192,31 @@ class TestToHertz(unittest.TestCase):
         # string without unit are seen as kHz
         out = machinestate.tohertz("10000.00")
         self.assertEqual(out, 10000000)
-    def test_tohertzStrfHz(self):
-        out = machinestate.tohertz("1234.00 Hz")
-        self.assertEqual(out, 1234)
-    def test_tohertzStrfhz(self):
-        out = machinestate.tohertz("1234.00hz")
-        self.assertEqual(out, 1234)
-    def test_tohertzStrfkHz(self):
-        out = machinestate.tohertz("1234.00 kHz")
-        self.assertEqual(out, 1234*1000)
-    def test_tohertzStrfKHz(self):
-        out = machinestate.tohertz("1234.00KHz")
-        self.assertEqual(out, 1234*1000)
-    def test_tohertzStrfmHz(self):
-        out = machinestate.tohertz("1234.00 mHz")
-        self.assertEqual(out, 1234000000)
-    def test_tohertzStrfMHz(self):
-        out = machinestate.tohertz("1234.00 MHz")
-        self.assertEqual(out, 1234000000)
-    def test_tohertzStrfGHz(self):
-        out = machinestate.tohertz("1234.00 GHz")
-        self.assertEqual(out, 1234000000000)
-    def test_tohertzStrfgHz(self):
-        out = machinestate.tohertz("1234.00gHz")
-        self.assertEqual(out, 1234000000000)
+    def test_tohertzStrFloat(self):
+        # Frequency strings with floats and the resulting frequency in Hz
+        cases = [("1234.00 Hz", 1234),
+                 ("1234.00hz", 1234),
+                 ("1234.00 kHz", 1234*1000),
+                 ("1234.00KHz", 1234*1000),
+                 ("1234.00 mHz", 1234000000),
+                 ("1234.00 MHz", 1234000000),
+                 ("1234.00 GHz", 1234000000000),
+                 ("1234.00gHz", 1234000000000),
+                ]
+        for value, expected in cases:
+            with self.subTest(value=value):
+                self.assertEqual(machinestate.tohertz(value), expected)
+    def test_tohertzUnitTrailingText(self):
+        # Only the leading unit token counts
+        cases = [("1 hz x", 1),
+                 ("2 MHz (max)", 2000000),
+                 ("3 GHzTurbo", 3000000000),
+                 ("4 kHz x", 4000),
+                 ("5 x", 5000),
+                ]
+        for value, expected in cases:
+            with self.subTest(value=value):
+                self.assertEqual(machinestate.tohertz(value), expected)
     def test_tohertzStrAlmostValid(self):
         self.assertRaises(ValueError, machinestate.tohertz, ".ghz")
     def test_tohertzStrNotValid(self):
@@ -269,38 +231,25 @@ class TestToHertzList(unittest.TestCase):
     def test_tohertzlistInt(self):
         out = machinestate.tohertzlist(1000)
         self.assertEqual(out, [1000])
-    def test_tohertzlistFloatStrSpace(self):
-        # string without unit are seen as kHz
-        out = machinestate.tohertzlist("10000.00 20000.00 30000.00")
-        self.assertEqual(out, [10000000, 20000000, 30000000])
-    def test_tohertzlistFloatStrComma(self):
-        # string without unit are seen as kHz
-        out = machinestate.tohertzlist("10000.00,20000.00,30000.00")
-        self.assertEqual(out, [10000000, 20000000, 30000000])
-    def test_tohertzlistIntStrSpace(self):
-        # string without unit are seen as kHz
-        out = machinestate.tohertzlist("10000 20000 30000")
-        self.assertEqual(out, [10000000, 20000000, 30000000])
-    def test_tohertzlistIntStrComma(self):
-        # string without unit are seen as kHz
-        out = machinestate.tohertzlist("10000,20000,30000")
-        self.assertEqual(out, [10000000, 20000000, 30000000])
-    def test_tohertzlistFloatStrSpacekHz(self):
-        # string without unit are seen as kHz
-        out = machinestate.tohertzlist("10000.00kHz 20000.00kHz 30000.00KHz")
-        self.assertEqual(out, [10000000, 20000000, 30000000])
-    def test_tohertzlistFloatStrCommakHz(self):
-        # string without unit are seen as kHz
-        out = machinestate.tohertzlist("10000.00kHz, 20000.00kHz, 30000.00KHz")
-        self.assertEqual(out, [10000000, 20000000, 30000000])
-    def test_tohertzlistIntStrSpacekHz(self):
-        # string without unit are seen as kHz
-        out = machinestate.tohertzlist("10000khz 20000.00kHz 30000.00KHz")
-        self.assertEqual(out, [10000000, 20000000, 30000000])
-    def test_tohertzlistIntStrCommakHz(self):
-        # string without unit are seen as kHz
-        out = machinestate.tohertzlist("10000kHz,20000KHz,30000khz")
-        self.assertEqual(out, [10000000, 20000000, 30000000])
+    def test_tohertzlistNotValid(self):
+        out = machinestate.tohertzlist("abc")
+        self.assertEqual(out, None)
+    def test_tohertzlistStr(self):
+        # Lists without unit or in kHz and the resulting frequencies in Hz
+        cases = [("10000.00 20000.00 30000.00", [10000000, 20000000, 30000000]),
+                 ("10000.00,20000.00,30000.00", [10000000, 20000000, 30000000]),
+                 ("10000 20000 30000", [10000000, 20000000, 30000000]),
+                 ("10000,20000,30000", [10000000, 20000000, 30000000]),
+                 ("10000.00kHz 20000.00kHz 30000.00KHz", [10000000, 20000000, 30000000]),
+                 ("10000.00kHz, 20000.00kHz, 30000.00KHz", [10000000, 20000000, 30000000]),
+                 ("10000khz 20000.00kHz 30000.00KHz", [10000000, 20000000, 30000000]),
+                 ("10000kHz,20000KHz,30000khz", [10000000, 20000000, 30000000]),
+                 ("10000 kHz 20000 kHz 30000 kHz", [10000000, 20000000, 30000000]),
+                 ("1.2 GHz, 2000 MHz 800000", [1200000000, 2000000000, 800000000]),
+                ]
+        for value, expected in cases:
+            with self.subTest(value=value):
+                self.assertEqual(machinestate.tohertzlist(value), expected)
 
 class TestToTitle(unittest.TestCase):
     def test_totitleNone(self):
@@ -411,3 +360,25 @@ class TestToBool(unittest.TestCase):
         self.assertEqual(out, False)
         out = machinestate.tobool("o")
         self.assertEqual(out, False)
+
+class TestCountUsers(unittest.TestCase):
+    # Tests for UsersInfo.countusers
+    def test_countusersEmpty(self):
+        self.assertEqual(machinestate.UsersInfo.countusers(""), 0)
+        self.assertEqual(machinestate.UsersInfo.countusers(None), 0)
+    def test_countusersUnique(self):
+        out = machinestate.UsersInfo.countusers("alice bob alice  carol,bob\n")
+        self.assertEqual(out, 3)
+
+class TestRegexLiteral(unittest.TestCase):
+    # Tests for regex_literal
+    def test_regexLiteralPrefix(self):
+        out = machinestate.regex_literal(re.compile(r"\s+Product Name\s+:\s+(.+)"))
+        self.assertEqual(out, "Product Name")
+    def test_regexLiteralNone(self):
+        self.assertEqual(machinestate.regex_literal(re.compile(r"(\d+)")), None)
+        self.assertEqual(machinestate.regex_literal(re.compile(r"abc|def")), None)
+        self.assertEqual(machinestate.regex_literal(re.compile(r"abc", re.IGNORECASE)), None)
+    def test_regexLiteralOptional(self):
+        out = machinestate.regex_literal(re.compile(r"Cores?\s+(\d+)"))
+        self.assertEqual(out, "Core")
@@ -3,15 +3,12 @@
 High-level tests for the class PathMatchInfoGroup
 """
 import os, os.path
-import sys, glob
 import unittest
 import tempfile
 import shutil
-import stat
 from machinestate import PathMatchInfoGroup, InfoGroup
-from locale import getpreferredencoding
+from shared_state import PAYLOADS, list_dir
 
-ENCODING = getpreferredencoding()
 
 class TestPathMatchInfoGroup(InfoGroup):
     def __init__(self, ident, extended=False, anonymous=False, searchpath=""):
@@ -19,9 +16,11 @@ class TestPathMatchInfoGroup(InfoGroup):
             anonymous=anonymous, extended=extended, name="File{}".format(ident))
         self.ident = ident
         self.searchpath = searchpath
-        path = os.path.join(searchpath, "{}*".format(ident))
-        files = glob.glob(path)
-        self.addf("File{}".format(ident), files[0], r"(.+)")
+        prefix = str(ident)
+        fname = next((n for n in list_dir(searchpath) if n.startswith(prefix)), None)
+        if fname is None:
+            raise IndexError(ident)
+        self.addf("File{}".format(ident), os.path.join(searchpath, fname), r"(.+)")
 
 
 class TestPathMatchInfoGroupBase(unittest.TestCase):
@@ -86,18 +85,22 @@ class TestPathMatchInfoGroupBase(unittest.TestCase):
         self.assertEqual(cls.subargs, {})
 
 class TestPathMatchInfoGroupFunction(unittest.TestCase):
-    def setUp(self):
-        # Create a temporary directory
-        self.temp_dir = tempfile.mkdtemp()
-        self.temp_files = {"File{}".format(x) : tempfile.mkstemp(prefix=str(x), dir=self.temp_dir) for x in range(4)}
-        for tkey in self.temp_files:
-            tfp, tfname = self.temp_files[tkey]
-            os.pwrite(tfp, bytes("{}\n".format(tkey), ENCODING), 0)
-            os.close(tfp)
+    @classmethod
+    def setUpClass(cls):
+        # Create a temporary directory with files starting with their ident. The tests
+        # only read the files, so all tests of the class share them
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.temp_files = {}
+        for tkey, payload in PAYLOADS.items():
+            tfname = os.path.join(cls.temp_dir, "{}{}".format(tkey[-1], tkey))
+            with open(tfname, "wb") as tfp:
+                tfp.write(payload)
+            cls.temp_files[tkey] = tfname
 
-    def tearDown(self):
-        # Remove the directory after the test
-        shutil.rmtree(self.temp_dir)
+    @classmethod
+    def tearDownClass(cls):
+        # Remove the directory after the last test
+        shutil.rmtree(cls.temp_dir)
 
     def test_validCreate(self):
         searchpath = os.path.join(self.temp_dir, "*")
@@ -105,70 +108,45 @@ class TestPathMatchInfoGroupFunction(unittest.TestCase):
         self.assertEqual(cls._instances, [])
         self.assertEqual(cls._data, {})
 
-    def test_validGenerate(self):
+    def test_validGenerateUpdateGet(self):
         searchpath = os.path.join(self.temp_dir, "*")
         cls = PathMatchInfoGroup(searchpath=searchpath, match=r".*/(\d).*", subclass=TestPathMatchInfoGroup, subargs={"searchpath": self.temp_dir})
+        # Build the object once and check its state after each step
         cls.generate()
-        self.assertNotEqual(cls._instances, [])
         self.assertEqual(len(cls._instances), 4)
         self.assertEqual(cls._data, {})
         for inst in cls._instances:
-            self.assertEqual(inst._instances, [])
-            self.assertEqual(inst._data, {})
-    def test_validUpdate(self):
-        searchpath = os.path.join(self.temp_dir, "*")
-        cls = PathMatchInfoGroup(searchpath=searchpath, match=r".*/(\d).*", subclass=TestPathMatchInfoGroup, subargs={"searchpath": self.temp_dir})
-        cls.generate()
+            with self.subTest(step="generate", ident=inst.ident):
+                self.assertEqual(inst._instances, [])
+                self.assertEqual(inst._data, {})
         cls.update()
         self.assertEqual(cls._data, {})
         for inst in cls._instances:
-            self.assertEqual(inst._instances, [])
-            self.assertNotEqual(inst._data, {})
-    def test_validGet(self):
-        searchpath = os.path.join(self.temp_dir, "*")
-        cls = PathMatchInfoGroup(searchpath=searchpath, match=r".*/(\d).*", subclass=TestPathMatchInfoGroup, subargs={"searchpath": self.temp_dir})
-        cls.generate()
-        cls.update()
+            with self.subTest(step="update", ident=inst.ident):
+                self.assertEqual(inst._instances, [])
+                self.assertNotEqual(inst._data, {})
         outdict = cls.get()
         self.assertEqual(cls._data, {})
-        for inst in cls._instances:
-            self.assertEqual(inst._instances, [])
-            self.assertNotEqual(inst._data, {})
-        for i, key in enumerate(self.temp_files.keys()):
-            for subkey in outdict[key]:
-                self.assertEqual(key, subkey)
-                self.assertEqual(key, outdict[key][subkey])
+        expected = {key : {key : key} for key in self.temp_files}
+        self.assertEqual(outdict, expected)
     def test_invalidCreate(self):
         searchpath = os.path.join(self.temp_dir, "*abc")
         cls = PathMatchInfoGroup(searchpath=searchpath, match=r".*/(\d).*", subclass=TestPathMatchInfoGroup, subargs={"searchpath": self.temp_dir})
         self.assertEqual(cls._instances, [])
         self.assertEqual(cls._data, {})
         self.assertEqual(cls.searchpath, searchpath)
-    def test_invalidGenerate(self):
-        searchpath = os.path.join(self.temp_dir, "*abc")
-        cls = PathMatchInfoGroup(searchpath=searchpath, match=r".*/(\d).*", subclass=TestPathMatchInfoGroup, subargs={"searchpath": self.temp_dir})
-        cls.generate()
-        self.assertEqual(cls._instances, [])
-        self.assertEqual(cls._data, {})
-        self.assertEqual(cls.searchpath, searchpath)
-    def test_invalidUpdate(self):
-        searchpath = os.path.join(self.temp_dir, "*abc")
-        cls = PathMatchInfoGroup(searchpath=searchpath, match=r".*/(\d).*", subclass=TestPathMatchInfoGroup, subargs={"searchpath": self.temp_dir})
-        cls.generate()
-        cls.update()
-        self.assertEqual(cls._instances, [])
-        self.assertEqual(cls._data, {})
-        self.assertEqual(cls.searchpath, searchpath)
-    def test_invalidGet(self):
+    def test_invalidGenerateUpdateGet(self):
+        # Nothing matches, so no step may add instances or data
         searchpath = os.path.join(self.temp_dir, "*abc")
         cls = PathMatchInfoGroup(searchpath=searchpath, match=r".*/(\d).*", subclass=TestPathMatchInfoGroup, subargs={"searchpath": self.temp_dir})
-        cls.generate()
-        cls.update()
-        outdict = cls.get()
-        self.assertEqual(outdict, {})
-        self.assertEqual(cls._instances, [])
-        self.assertEqual(cls._data, {})
-        self.assertEqual(cls.searchpath, searchpath)
+        for step in ("generate", "update", "get"):
+            with self.subTest(step=step):
+                out = getattr(cls, step)()
+                if step == "get":
+                    self.assertEqual(out, {})
+                self.assertEqual(cls._instances, [])
+                self.assertEqual(cls._data, {})
+                self.assertEqual(cls.searchpath, searchpath)
     def test_validCreateInvalidClass(self):
         searchpath = os.path.join(self.temp_dir, "*")
         cls = PathMatchInfoGroup(searchpath=searchpath, match=r".*/(\d).*", subclass=unittest.TestCase, subargs={"searchpath": self.temp_dir})
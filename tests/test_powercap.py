@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+High-level tests for the class PowercapInfo using a fake powercap tree
+"""
+import os
+import unittest
+import tempfile
+import shutil
+import platform
+from unittest import mock
+import machinestate
+
+
+# Files of each powercap zone, the constraint files are added by write_zone()
+ZONES = {"intel-rapl:0" : "package-0",
+         "intel-rapl:0/intel-rapl:0:0" : "core",
+         "intel-rapl:0/intel-rapl:0:1" : "dram",
+         "intel-rapl:1" : "package-1"}
+
+@unittest.skipUnless(platform.machine() in ["x86_64", "i386"], "Powercap tree only read on X86")
+class TestPowercapInfo(unittest.TestCase):
+    def setUp(self):
+        # Create a temporary directory with two packages, the first with two domains
+        self.temp_dir = tempfile.mkdtemp()
+        for zone, name in ZONES.items():
+            self.write_zone(os.path.join(self.temp_dir, zone), name)
+        patcher = mock.patch("machinestate.POWERCAP_BASE", self.temp_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(machinestate.cached_powercap_tree.cache_clear)
+        self.addCleanup(machinestate.cached_glob.cache_clear)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    @staticmethod
+    def write_zone(path, name):
+        os.makedirs(path)
+        files = {"name" : name, "enabled" : "1",
+                 "constraint_0_name" : "long_term",
+                 "constraint_0_power_limit_uw" : "150000000",
+                 "constraint_0_time_window_us" : "999424"}
+        for fname, content in files.items():
+            with open(os.path.join(path, fname), "w") as tfp:
+                tfp.write(content + "\n")
+
+    def test_tree(self):
+        tree = machinestate.cached_powercap_tree(self.temp_dir)
+        self.assertEqual(list(tree), [0, 1])
+        self.assertEqual(tree[0]["name"], "package-0")
+        self.assertEqual(tree[0]["constraints"], {0 : "long_term"})
+        self.assertEqual({d : v["name"] for d, v in tree[0]["domains"].items()},
+                         {0 : "core", 1 : "dram"})
+        self.assertEqual(tree[1]["domains"], {})
+
+    def test_generate(self):
+        cls = machinestate.PowercapInfo()
+        cls.generate()
+        cls.update()
+        outdict = cls.get()
+        self.assertEqual(sorted(outdict), ["Package-0", "Package-1"])
+        package = outdict["Package-0"]
+        self.assertEqual(package["Core"]["Enabled"], True)
+        self.assertEqual(package["Dram"]["LongTerm"]["PowerLimitUw"], 150000000)
+        self.assertEqual(package["Package"]["LongTerm"]["TimeWindowUs"], 999424)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+High-level tests for the class PrefetcherInfo using a fake likwid-features command
+"""
+import os
+import unittest
+import tempfile
+import shutil
+import stat
+import machinestate
+from machinestate import ENCODING
+
+
+# Fake likwid-features printing the feature table for the HW threads given with -c.
+# The DCU prefetcher is off for odd HW threads.
+LIKWID_FEATURES = """#!/bin/sh
+echo $@ >> {calls}
+cpus=$(echo "$3" | tr ',' ' ')
+printf "Feature"
+for c in $cpus; do printf "    HWThread %s" $c; done
+echo
+for f in HW_PREFETCHER CL_PREFETCHER DCU_PREFETCHER IP_PREFETCHER; do
+    printf "%s" $f
+    for c in $cpus; do
+        if [ $f = DCU_PREFETCHER ] && [ $((c % 2)) -eq 1 ]; then printf "    off"; else printf "    on"; fi
+    done
+    echo
+done
+"""
+
+FEATURES_OUTPUT = """Feature                HWThread 0    HWThread 1
+HW_PREFETCHER          on            on
+DCU_PREFETCHER         on            off
+"""
+
+class TestPrefetcherInfo(unittest.TestCase):
+    def setUp(self):
+        # Create a temporary directory with a fake likwid-features counting its calls
+        self.temp_dir = tempfile.mkdtemp()
+        self.calls = os.path.join(self.temp_dir, "calls")
+        script = os.path.join(self.temp_dir, "likwid-features")
+        with open(script, "wb") as tfp:
+            tfp.write(LIKWID_FEATURES.format(calls=self.calls).encode(ENCODING))
+        os.chmod(script, stat.S_IRWXU)
+        self.addCleanup(machinestate.cached_exists.cache_clear)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_splitoutput(self):
+        outputs = machinestate.PrefetcherInfo.splitoutput(FEATURES_OUTPUT)
+        self.assertEqual(sorted(outputs), [0, 1])
+        self.assertEqual(outputs[1].split("\n"),
+                         ["Feature HWThread 1", "HW_PREFETCHER on", "DCU_PREFETCHER off"])
+        self.assertEqual(machinestate.PrefetcherInfo.splitoutput(""), {})
+    def test_update(self):
+        cls = machinestate.PrefetcherInfo(likwid_base=self.temp_dir)
+        cls.generate()
+        self.assertTrue(len(cls._instances) > 0)
+        with open(self.calls, "wb"):
+            pass
+        cls.update()
+        outdict = cls.get()
+        for inst in cls._instances:
+            cpu = outdict["Cpu{}".format(inst.ident)]
+            self.assertEqual(cpu["HW_PREFETCHER"], True)
+            self.assertEqual(cpu["DCU_PREFETCHER"], inst.ident % 2 == 0)
+        with open(self.calls, "rb") as tfp:
+            calls = tfp.read().decode(ENCODING).strip().split("\n")
+        self.assertEqual(len(calls), 1)